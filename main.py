@@ -10,7 +10,12 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 
 from jira_client import JiraClient
-from data_processor import DataProcessor
+from issue_store import IssueStore
+from response_cache import ResponseCache
+from server_info import ServerInfoStore
+from fetch_journal import FetchJournal
+from data_processor import DataProcessor, MetricsEngine
+from issue_frame import IssueFrame
 from visualizer import Visualizer
 
 
@@ -20,6 +25,12 @@ def parse_args():
     parser.add_argument('-p', '--project', type=str, help='Project key (e.g., KAFKA, HDFS)')
     parser.add_argument('-n', '--max-results', type=int, help='Maximum number of issues to fetch')
     parser.add_argument('-c', '--config', type=str, help='Path to config file')
+    parser.add_argument('--api-version', type=str, choices=['2', '3'],
+                        help='Pin JIRA REST API version and skip detection')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted fetch from the checkpoint journal')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Processes for computing metrics (streaming mode)')
     return parser.parse_args()
 
 
@@ -38,6 +49,22 @@ def load_config(config_path=None):
             default_config = """jira:
   base_url: "https://issues.apache.org/jira"
   auth_required: false
+  max_workers: 4
+  api_version: null
+  pagination: "offset"
+  shards: 1
+  rate_limit:
+    requests_per_second: 10
+    burst: 10
+  response_cache:
+    enabled: false
+    path: "cache/responses.db"
+    ttl: 3600
+    max_size_mb: 256
+  checkpoints:
+    enabled: false
+    path: "cache/journal.db"
+  server_info_path: "cache/server_info.db"
 
 query:
   project_key: "KAFKA"
@@ -47,9 +74,17 @@ query:
 output:
   output_dir: "output"
   top_users: 30
+  daily_period: "day"
+  render_workers: 1
+  histogram_bins: null
 
 features:
   fetch_changelog: true
+  incremental_sync: false
+  store_path: "cache/issues.db"
+  analyses: [open_time, status_durations, daily_stats, user_stats, time_in_progress, priority_distribution]
+  processing: "streaming"
+  workers: 1
 """
             with open(config_path, 'w', encoding='utf-8') as f:
                 f.write(default_config)
@@ -69,7 +104,8 @@ features:
                 'base_url': cfg.get('JIRA', 'url'),
                 'email': cfg.get('JIRA', 'email', fallback=None),
                 'api_token': cfg.get('JIRA', 'api_token', fallback=None),
-                'auth_required': True
+                'auth_required': True,
+                'max_workers': cfg.getint('JIRA', 'max_workers', fallback=4)
             },
             'query': {
                 'jql': cfg.get('QUERY', 'jql'),
@@ -80,7 +116,9 @@ features:
                 'top_users': cfg.getint('OUTPUT', 'top_users')
             },
             'features': {
-                'fetch_changelog': cfg.getboolean('FEATURES', 'fetch_changelog', fallback=True)
+                'fetch_changelog': cfg.getboolean('FEATURES', 'fetch_changelog', fallback=True),
+                'incremental_sync': cfg.getboolean('FEATURES', 'incremental_sync', fallback=False),
+                'store_path': cfg.get('FEATURES', 'store_path', fallback='cache/issues.db')
             }
         }
 
@@ -118,7 +156,40 @@ def main():
         
         output_dir = os.path.join(PROJECT_ROOT, output_cfg.get('output_dir', 'output'))
         top_users = output_cfg.get('top_users', 30)
+        daily_period = output_cfg.get('daily_period', 'day')
+        render_workers = output_cfg.get('render_workers', 1)
+        histogram_bins = output_cfg.get('histogram_bins')
         fetch_changelog = features_cfg.get('fetch_changelog', True)
+        incremental_sync = features_cfg.get('incremental_sync', False)
+        analyses = features_cfg.get('analyses') or list(DataProcessor.ANALYSIS_FIELDS)
+        processing = features_cfg.get('processing', 'streaming')
+        workers = args.workers or features_cfg.get('workers', 1)
+        # Явный список полей из конфига (например, ['*all']) переопределяет вычисленный
+        fields = query_cfg.get('fields') or DataProcessor.required_fields(analyses)
+        store_path = os.path.join(PROJECT_ROOT, features_cfg.get('store_path', 'cache/issues.db'))
+        # Версия API из аргументов или конфига фиксируется; serverInfo проверяется только для типа развертывания
+        api_version = args.api_version or jira_cfg.get('api_version')
+        api_version = str(api_version) if api_version else None
+        cache_cfg = jira_cfg.get('response_cache') or {}
+        response_cache = None
+        if cache_cfg.get('enabled'):
+            response_cache = ResponseCache(
+                os.path.join(PROJECT_ROOT, cache_cfg.get('path', 'cache/responses.db')),
+                ttl=cache_cfg.get('ttl', 3600),
+                max_bytes=int(cache_cfg.get('max_size_mb', 256) * 1024 * 1024)
+            )
+        # Версия, тип развертывания и сборка сервера сохраняются независимо от кэша страниц
+        server_info = ServerInfoStore(
+            os.path.join(PROJECT_ROOT, jira_cfg.get('server_info_path', 'cache/server_info.db'))
+        )
+        # --resume включает журнал, даже если checkpoints выключены в конфиге
+        journal_cfg = jira_cfg.get('checkpoints') or {}
+        journal = None
+        if journal_cfg.get('enabled') or args.resume:
+            journal = FetchJournal(
+                os.path.join(PROJECT_ROOT, journal_cfg.get('path', 'cache/journal.db')),
+                resume=args.resume
+            )
         
         print(f"   URL: {jira_cfg['base_url']}")
         print(f"   Project: {project_key}")
@@ -130,36 +201,58 @@ def main():
         client = JiraClient(
             jira_cfg['base_url'],
             jira_cfg.get('email'),
-            jira_cfg.get('api_token')
+            jira_cfg.get('api_token'),
+            max_workers=jira_cfg.get('max_workers', 4),
+            rate_limit=jira_cfg.get('rate_limit'),
+            response_cache=response_cache,
+            api_version=api_version,
+            pagination=jira_cfg.get('pagination', 'offset'),
+            shards=jira_cfg.get('shards', 1),
+            journal=journal,
+            server_info=server_info
         )
         print("   ✓ Connected")
         print()
         
         print("📥 Fetching issues...")
-        issues = client.fetch_issues(jql, max_results, 'changelog' if fetch_changelog else None)
+        expand = 'changelog' if fetch_changelog else None
+        with client:
+            if incremental_sync:
+                with IssueStore(store_path) as store:
+                    issues = store.sync(client, jql, max_results, expand, fields)
+            else:
+                issues = client.iter_issues(jql, max_results, expand, fields)
+            
+            if processing == 'columnar':
+                # Задачи сразу сворачиваются в колонки, метрики считаются векторно
+                frame = IssueFrame.from_issues(issues)
+                issue_count = len(frame)
+            else:
+                # Все метрики считаются за один проход по мере загрузки страниц
+                engine = MetricsEngine.for_analyses(analyses, top_users=top_users, daily_period=daily_period,
+                                                    histogram_bins=histogram_bins).consume(issues, workers)
+                issue_count = engine.issue_count
         print()
         
-        if not issues:
+        if not issue_count:
             print("⚠️  No issues found")
             return 1
         
         print("⚙️  Processing...")
-        open_times = DataProcessor.calculate_open_time(issues)
-        status_durations = DataProcessor.get_status_durations(issues)
-        daily_stats = DataProcessor.get_daily_stats(issues)
-        user_stats = DataProcessor.get_user_stats(issues, top_users)
-        time_in_progress = DataProcessor.get_time_in_progress_distribution(issues)
-        priority_dist = DataProcessor.get_priority_distribution(issues)
+        if processing == 'columnar':
+            results = frame.compute(analyses, top_users, daily_period, histogram_bins)
+        else:
+            results = engine.results()
+        
+        percentiles = DataProcessor.duration_percentiles(results)
+        for row in percentiles.itertuples(index=False):
+            name = f"{row.metric} [{row.status}]" if isinstance(row.status, str) else row.metric
+            print(f"   {name}: p50={row.p50:.1f} p90={row.p90:.1f} p99={row.p99:.1f} (n={row.count})")
         print()
         
         print("📊 Creating charts...")
         viz = Visualizer(output_dir)
-        viz.plot_open_time_histogram(open_times)
-        viz.plot_status_durations(status_durations)
-        viz.plot_daily_stats(daily_stats)
-        viz.plot_user_stats(user_stats)
-        viz.plot_time_in_progress_histogram(time_in_progress)
-        viz.plot_priority_distribution(priority_dist)
+        viz.render_all(results, workers=render_workers)
         print()
         
         print("=" * 60)
@@ -167,7 +260,7 @@ def main():
         print("=" * 60)
         print(f"📁 Results: {output_dir}/")
         print()
-        
+    
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
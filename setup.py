@@ -25,6 +25,10 @@ setup(
         'matplotlib>=3.7.0',
         'PyYAML>=6.0',
     ],
+    extras_require={
+        # Быстрый разбор ответов JIRA (см. src/fast_json.py)
+        'fast': ['msgspec>=0.18', 'orjson>=3.9'],
+    },
     entry_points={
         'console_scripts': [
             'jira-analyzer=jira_analyzer.cli:main',
@@ -1,171 +1,540 @@
+import multiprocessing
+from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict
+from typing import Any, Iterable, List, Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 
+try:
+    from .dimensions import NO_CODE, Dimension, Dimensions
+    from .histogram import Durations, Histogram, new_collection
+    from .sketch import TDigest
+except ImportError:
+    from dimensions import NO_CODE, Dimension, Dimensions
+    from histogram import Durations, Histogram, new_collection
+    from sketch import TDigest
 
-class DataProcessor:
+JIRA_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+# Шаг непрерывного ряда для каждой гранулярности дневной статистики
+PERIOD_FREQUENCIES = {'day': 'D', 'week': '7D', 'month': 'MS'}
+
+# Задач в одной порции для процесса-воркера
+CHUNK_SIZE = 1000
+
+_UNSET = object()
+
+
+def parse_jira_datetime(value: str) -> datetime:
+    # fromisoformat в разы быстрее strptime; до Python 3.11 он требует смещение вида +03:00, а JIRA отдает +0300
+    if len(value) > 5 and value[-5] in '+-':
+        try:
+            return datetime.fromisoformat(f'{value[:-2]}:{value[-2:]}')
+        except ValueError:
+            pass
+    return datetime.strptime(value, JIRA_DATETIME_FORMAT)
+
+
+class JiraDateParser:
+    # Мемо на один прогон: одинаковые метки времени (changelog, массовые операции) парсятся один раз
     
-    @staticmethod
-    def calculate_open_time(issues: List[Dict]) -> List[int]:
-        open_times = []
-        for issue in issues:
-            created = issue['fields']['created']
-            resolved = issue['fields'].get('resolutiondate')
-            if resolved:
-                created_dt = datetime.strptime(created, '%Y-%m-%dT%H:%M:%S.%f%z')
-                resolved_dt = datetime.strptime(resolved, '%Y-%m-%dT%H:%M:%S.%f%z')
-                open_times.append((resolved_dt - created_dt).days)
-        return open_times
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max_size
+        self._cache = {}
     
-    @staticmethod
-    def get_status_durations(issues: List[Dict]) -> Dict[str, List[int]]:
-        status_durations = defaultdict(list)
+    def parse(self, value: str) -> datetime:
+        parsed = self._cache.get(value)
+        if parsed is None:
+            if len(self._cache) >= self.max_size:
+                self._cache.clear()
+            parsed = self._cache[value] = parse_jira_datetime(value)
+        return parsed
+
+
+class ParsedIssue:
+    # Задача с лениво разобранными датами и changelog: каждое значение парсится один раз на все метрики
+    __slots__ = ('raw', 'fields', '_parse', '_created', '_resolved', '_status_histories')
+    
+    def __init__(self, issue: Dict, parser: Optional[JiraDateParser] = None):
+        self.raw = issue
+        self.fields = issue['fields']
+        self._parse = parser.parse if parser else parse_jira_datetime
+        self._created = _UNSET
+        self._resolved = _UNSET
+        self._status_histories = _UNSET
+    
+    @property
+    def created(self) -> datetime:
+        if self._created is _UNSET:
+            self._created = self._parse(self.fields['created'])
+        return self._created
+    
+    @property
+    def resolved(self) -> Optional[datetime]:
+        if self._resolved is _UNSET:
+            resolved = self.fields.get('resolutiondate')
+            self._resolved = self._parse(resolved) if resolved else None
+        return self._resolved
+    
+    @property
+    def has_histories(self) -> bool:
+        return bool(self.raw.get('changelog', {}).get('histories', []))
+    
+    @property
+    def status_histories(self) -> List[Tuple[datetime, List[Dict]]]:
+        if self._status_histories is _UNSET:
+            self._status_histories = [
+                (
+                    self._parse(history['created']),
+                    [item for item in history.get('items', []) if item['field'] == 'status']
+                )
+                for history in self.raw.get('changelog', {}).get('histories', [])
+            ]
+        return self._status_histories
+
+
+def build_period_stats(created: pd.Series, closed: pd.Series, period: str = 'day') -> pd.DataFrame:
+    # created/closed — число задач по датам (индекс datetime64); пустые периоды заполняются нулями
+    if period not in PERIOD_FREQUENCIES:
+        raise ValueError(f"Unknown period: {period}")
+    created = _bucket_dates(created, period)
+    closed = _bucket_dates(closed, period)
+    
+    dates = created.index.union(closed.index)
+    if len(dates):
+        dates = pd.date_range(dates.min(), dates.max(), freq=PERIOD_FREQUENCIES[period])
+    
+    df = pd.DataFrame({
+        'date': dates,
+        'created': created.reindex(dates, fill_value=0).to_numpy(dtype=np.int64),
+        'closed': closed.reindex(dates, fill_value=0).to_numpy(dtype=np.int64),
+    })
+    df['created_cumsum'] = df['created'].cumsum()
+    df['closed_cumsum'] = df['closed'].cumsum()
+    df.attrs['period'] = period
+    return df
+
+
+def _bucket_dates(counts: pd.Series, period: str) -> pd.Series:
+    dates = pd.DatetimeIndex(counts.index)
+    if period == 'week':
+        dates = dates - pd.to_timedelta(dates.weekday, unit='D')
+    elif period == 'month':
+        dates = dates.to_period('M').to_timestamp()
+    return counts.groupby(dates).sum()
+
+
+def _date_counts(counts: Dict[str, int]) -> pd.Series:
+    return pd.Series(list(counts.values()), index=pd.to_datetime(list(counts), format='%Y-%m-%d'), dtype=np.int64)
+
+
+class Accumulator(ABC):
+    # Без add/result аккумулятор не создается: ошибка при сборке движка, а не посреди прохода
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'Accumulator':
+        return cls()
+    
+    @abstractmethod
+    def add(self, issue: ParsedIssue):
+        ...
+    
+    @abstractmethod
+    def result(self) -> Any:
+        ...
+    
+    def merge(self, other: 'Accumulator'):
+        # Дописывает результат следующей порции задач; нужен только для параллельного расчета.
+        # Списки (Durations) и счетчики дают тот же итог, что последовательный проход; у гистограмм
+        # корзины, count, min и max те же, а перцентили приблизительные — дайджесты порций сливаются
+        raise NotImplementedError(f"{type(self).__name__} does not support merging partial results")
+
+
+class OpenTimeAccumulator(Accumulator):
+    
+    def __init__(self, histogram_bins: Optional[str] = None):
+        self.open_times = new_collection(histogram_bins)
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'OpenTimeAccumulator':
+        return cls(options.get('histogram_bins'))
+    
+    def add(self, issue: ParsedIssue):
+        if issue.resolved:
+            self.open_times.append((issue.resolved - issue.created).days)
+    
+    def result(self) -> Union[List[int], Histogram]:
+        return self.open_times
+    
+    def merge(self, other: 'OpenTimeAccumulator'):
+        self.open_times.merge(other.open_times)
+
+
+class StatusDurationsAccumulator(Accumulator):
+    
+    def __init__(self, histogram_bins: Optional[str] = None):
+        self.status_durations = defaultdict(partial(new_collection, histogram_bins))
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'StatusDurationsAccumulator':
+        return cls(options.get('histogram_bins'))
+    
+    def add(self, issue: ParsedIssue):
+        if not issue.has_histories:
+            status = issue.fields['status']['name']
+            if issue.resolved:
+                self.status_durations[status].append((issue.resolved - issue.created).days)
+            return
         
-        for issue in issues:
-            changelog = issue.get('changelog', {})
-            histories = changelog.get('histories', [])
-            
-            if not histories:
-                status = issue['fields']['status']['name']
-                created = issue['fields']['created']
-                resolved = issue['fields'].get('resolutiondate')
-                if resolved:
-                    created_dt = datetime.strptime(created, '%Y-%m-%dT%H:%M:%S.%f%z')
-                    resolved_dt = datetime.strptime(resolved, '%Y-%m-%dT%H:%M:%S.%f%z')
-                    status_durations[status].append((resolved_dt - created_dt).days)
-                continue
-            
-            status_timeline = []
-            created = datetime.strptime(issue['fields']['created'], '%Y-%m-%dT%H:%M:%S.%f%z')
-            
-            first_status = None
-            for history in histories:
-                for item in history.get('items', []):
-                    if item['field'] == 'status':
-                        first_status = item.get('fromString', 'Open')
-                        break
+        first_status = None
+        for _, items in issue.status_histories:
+            if items:
+                first_status = items[0].get('fromString', 'Open')
                 if first_status:
                     break
-            
-            if first_status:
-                status_timeline.append({'status': first_status, 'date': created})
-            
-            for history in histories:
-                changed_date = datetime.strptime(history['created'], '%Y-%m-%dT%H:%M:%S.%f%z')
-                for item in history.get('items', []):
-                    if item['field'] == 'status':
-                        status_timeline.append({'status': item['toString'], 'date': changed_date})
-            
-            for i in range(len(status_timeline) - 1):
-                status = status_timeline[i]['status']
-                days = (status_timeline[i + 1]['date'] - status_timeline[i]['date']).days
-                if days >= 0:
-                    status_durations[status].append(days)
-            
-            if status_timeline:
-                last_status = status_timeline[-1]['status']
-                last_date = status_timeline[-1]['date']
-                resolved = issue['fields'].get('resolutiondate')
-                if resolved:
-                    resolved_dt = datetime.strptime(resolved, '%Y-%m-%dT%H:%M:%S.%f%z')
-                    days = (resolved_dt - last_date).days
-                    if days >= 0:
-                        status_durations[last_status].append(days)
         
-        return dict(status_durations)
+        status_timeline = []
+        if first_status:
+            status_timeline.append((first_status, issue.created))
+        for changed_date, items in issue.status_histories:
+            for item in items:
+                status_timeline.append((item['toString'], changed_date))
+        
+        for (status, start), (_, end) in zip(status_timeline, status_timeline[1:]):
+            days = (end - start).days
+            if days >= 0:
+                self.status_durations[status].append(days)
+        
+        if status_timeline and issue.resolved:
+            last_status, last_date = status_timeline[-1]
+            days = (issue.resolved - last_date).days
+            if days >= 0:
+                self.status_durations[last_status].append(days)
     
-    @staticmethod
-    def get_daily_stats(issues: List[Dict]) -> pd.DataFrame:
-        daily_data = defaultdict(lambda: {'created': 0, 'closed': 0})
+    def result(self) -> Dict[str, Union[List[int], Histogram]]:
+        return dict(self.status_durations)
+    
+    def merge(self, other: 'StatusDurationsAccumulator'):
+        for status, days in other.status_durations.items():
+            self.status_durations[status].merge(days)
+
+
+class DailyStatsAccumulator(Accumulator):
+    
+    def __init__(self, period: str = 'day'):
+        self.period = period
+        self.created = defaultdict(int)
+        self.closed = defaultdict(int)
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'DailyStatsAccumulator':
+        return cls(options.get('daily_period', 'day'))
+    
+    def add(self, issue: ParsedIssue):
+        # Первые 10 символов метки JIRA — дата в часовом поясе сервера, без разбора времени
+        self.created[issue.fields['created'][:10]] += 1
+        resolved = issue.fields.get('resolutiondate')
+        if resolved:
+            self.closed[resolved[:10]] += 1
+    
+    def result(self) -> pd.DataFrame:
+        return build_period_stats(_date_counts(self.created), _date_counts(self.closed), self.period)
+    
+    def merge(self, other: 'DailyStatsAccumulator'):
+        for date, count in other.created.items():
+            self.created[date] += count
+        for date, count in other.closed.items():
+            self.closed[date] += count
+
+
+class UserStatsAccumulator(Accumulator):
+    
+    def __init__(self, top_n: int = 30):
+        self.top_n = top_n
+        # Счетчики по кодам пользователей (accountId/key), отображаемое имя подставляется в result
+        self.dimensions = Dimensions()
+        self.user_counts = defaultdict(int)
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'UserStatsAccumulator':
+        return cls(options.get('top_users', 30))
+    
+    def add(self, issue: ParsedIssue):
+        for role in ('assignee', 'reporter'):
+            code = self.dimensions.user(issue.fields.get(role))
+            if code != NO_CODE:
+                self.user_counts[code] += 1
+    
+    def result(self) -> pd.DataFrame:
+        sorted_users = sorted(self.user_counts.items(), key=lambda x: x[1], reverse=True)[:self.top_n]
+        users = self.dimensions.users
+        return pd.DataFrame([(users.label(code), count) for code, count in sorted_users], columns=['user', 'count'])
+    
+    def merge(self, other: 'UserStatsAccumulator'):
+        # Коды порции переводятся в общий словарь; новые пользователи встают в конец, как при построчном подсчете
+        codes = self.dimensions.users.remap(other.dimensions.users)
+        for code, count in other.user_counts.items():
+            self.user_counts[int(codes[code])] += count
+
+
+class TimeInProgressAccumulator(Accumulator):
+    
+    def __init__(self, histogram_bins: Optional[str] = None):
+        self.time_in_progress = new_collection(histogram_bins)
+    
+    @classmethod
+    def from_options(cls, options: Dict) -> 'TimeInProgressAccumulator':
+        return cls(options.get('histogram_bins'))
+    
+    def add(self, issue: ParsedIssue):
+        if not issue.resolved or not issue.has_histories:
+            return
         
-        for issue in issues:
-            created = datetime.strptime(issue['fields']['created'], '%Y-%m-%dT%H:%M:%S.%f%z').date()
-            daily_data[created]['created'] += 1
-            
-            resolved = issue['fields'].get('resolutiondate')
-            if resolved:
-                resolved_date = datetime.strptime(resolved, '%Y-%m-%dT%H:%M:%S.%f%z').date()
-                daily_data[resolved_date]['closed'] += 1
+        status_times = {}
+        current_status = None
+        status_start = None
         
-        df = pd.DataFrame([
-            {'date': date, 'created': stats['created'], 'closed': stats['closed']}
-            for date, stats in sorted(daily_data.items())
-        ])
+        for _, items in issue.status_histories:
+            if items:
+                current_status = items[0].get('fromString')
+                status_start = issue.created
+                if current_status:
+                    break
         
-        df['created_cumsum'] = df['created'].cumsum()
-        df['closed_cumsum'] = df['closed'].cumsum()
-        return df
-    
-    @staticmethod
-    def get_user_stats(issues: List[Dict], top_n: int = 30) -> pd.DataFrame:
-        user_counts = defaultdict(int)
+        for changed_date, items in issue.status_histories:
+            for item in items:
+                if current_status and status_start:
+                    duration_hours = (changed_date - status_start).total_seconds() / 3600
+                    status_times[current_status] = status_times.get(current_status, 0) + duration_hours
+                current_status = item['toString']
+                status_start = changed_date
         
-        for issue in issues:
-            assignee = issue['fields'].get('assignee')
-            reporter = issue['fields'].get('reporter')
-            if assignee:
-                user_counts[assignee['displayName']] += 1
-            if reporter:
-                user_counts[reporter['displayName']] += 1
+        if current_status and status_start:
+            duration_hours = (issue.resolved - status_start).total_seconds() / 3600
+            status_times[current_status] = status_times.get(current_status, 0) + duration_hours
         
-        sorted_users = sorted(user_counts.items(), key=lambda x: x[1], reverse=True)[:top_n]
-        return pd.DataFrame(sorted_users, columns=['user', 'count'])
+        for status, hours in status_times.items():
+            if 'progress' in status.lower():
+                self.time_in_progress.append(hours)
+                break
+    
+    def result(self) -> Union[List[float], Histogram]:
+        return self.time_in_progress
+    
+    def merge(self, other: 'TimeInProgressAccumulator'):
+        self.time_in_progress.merge(other.time_in_progress)
+
+
+class PriorityDistributionAccumulator(Accumulator):
+    
+    def __init__(self):
+        self.priorities = Dimension()
+        self.priority_counts = defaultdict(int)
+    
+    def add(self, issue: ParsedIssue):
+        priority = issue.fields.get('priority')
+        if priority:
+            self.priority_counts[self.priorities.code(priority['name'])] += 1
+    
+    def result(self) -> Dict[str, int]:
+        return {self.priorities.label(code): count for code, count in self.priority_counts.items()}
+    
+    def merge(self, other: 'PriorityDistributionAccumulator'):
+        codes = self.priorities.remap(other.priorities)
+        for code, count in other.priority_counts.items():
+            self.priority_counts[int(codes[code])] += count
+
+
+ACCUMULATORS = {
+    'open_time': OpenTimeAccumulator,
+    'status_durations': StatusDurationsAccumulator,
+    'daily_stats': DailyStatsAccumulator,
+    'user_stats': UserStatsAccumulator,
+    'time_in_progress': TimeInProgressAccumulator,
+    'priority_distribution': PriorityDistributionAccumulator,
+}
+
+
+class MetricsEngine:
+    
+    def __init__(self, accumulators: Dict[str, Accumulator]):
+        self.accumulators = accumulators
+        self.issue_count = 0
+        self.date_parser = JiraDateParser()
+        # Анализы и опции, по которым воркеры собирают такие же движки для своих порций
+        self.analyses: Optional[List[str]] = None
+        self.options: Dict = {}
+    
+    @classmethod
+    def for_analyses(cls, analyses: Optional[List[str]] = None, **options) -> 'MetricsEngine':
+        accumulators = {}
+        for name in analyses or ACCUMULATORS:
+            if name not in ACCUMULATORS:
+                raise ValueError(f"Unknown analysis: {name}")
+            accumulators[name] = ACCUMULATORS[name].from_options(options)
+        engine = cls(accumulators)
+        engine.analyses = list(accumulators)
+        engine.options = options
+        return engine
+    
+    def add(self, issue: Dict):
+        parsed = ParsedIssue(issue, self.date_parser)
+        for accumulator in self.accumulators.values():
+            accumulator.add(parsed)
+        self.issue_count += 1
+    
+    def consume(self, issues: Iterable[Dict], workers: int = 1, chunk_size: int = CHUNK_SIZE) -> 'MetricsEngine':
+        if workers > 1:
+            return self._consume_parallel(issues, workers, chunk_size)
+        for issue in issues:
+            self.add(issue)
+        return self
+    
+    def merge(self, other: 'MetricsEngine') -> 'MetricsEngine':
+        for name, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[name])
+        self.issue_count += other.issue_count
+        return self
+    
+    def _consume_parallel(self, issues: Iterable[Dict], workers: int, chunk_size: int) -> 'MetricsEngine':
+        # Порции считаются в процессах, частичные результаты сливаются строго в порядке порций (см. Accumulator.merge).
+        # Задачи уходят в воркеры как есть: клиент уже запрашивает только нужные поля (required_fields),
+        # а с msgspec и разбирает только читаемые ключи; повторная обрезка в родителе съедала выигрыш от воркеров
+        if self.analyses is None:
+            raise ValueError("Parallel processing requires MetricsEngine.for_analyses")
+        issues = iter(issues)
+        chunks = iter(lambda: list(islice(issues, chunk_size)), [])
+        # Без fork: воркеры не наследуют память родителя (загруженные страницы, пулы потоков клиента)
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            # numpy и pandas импортируются один раз в forkserver, а не в каждом воркере
+            context.set_forkserver_preload(['numpy', 'pandas'])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # Окно ограничивает число порций в памяти, пока их не слили
+            pending = deque(
+                executor.submit(_consume_chunk, self.analyses, self.options, chunk)
+                for chunk in islice(chunks, workers * 2)
+            )
+            try:
+                while pending:
+                    partial_engine = pending.popleft().result()
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(executor.submit(_consume_chunk, self.analyses, self.options, chunk))
+                    self.merge(partial_engine)
+            finally:
+                for future in pending:
+                    future.cancel()
+        return self
+    
+    def results(self) -> Dict[str, Any]:
+        return {name: accumulator.result() for name, accumulator in self.accumulators.items()}
+
+
+def _consume_chunk(analyses: List[str], options: Dict, issues: List[Dict]) -> MetricsEngine:
+    # Воркер собирает те же коллекции, что и родитель (гистограммы или Durations), родитель их сливает
+    engine = MetricsEngine.for_analyses(analyses, **options).consume(issues)
+    # Мемо дат в родителя не возвращается
+    engine.date_parser = None
+    return engine
+
+
+class DataProcessor:
+    
+    # Поля JIRA, которые читает каждый анализ; по ним строится список fields для /search
+    ANALYSIS_FIELDS = {
+        'open_time': ['created', 'resolutiondate'],
+        'status_durations': ['created', 'resolutiondate', 'status'],
+        'daily_stats': ['created', 'resolutiondate'],
+        'user_stats': ['assignee', 'reporter'],
+        'time_in_progress': ['created', 'resolutiondate'],
+        'priority_distribution': ['priority'],
+    }
+    
+    @staticmethod
+    def required_fields(analyses: Optional[List[str]] = None) -> List[str]:
+        fields = []
+        for name in analyses or DataProcessor.ANALYSIS_FIELDS:
+            if name not in DataProcessor.ANALYSIS_FIELDS:
+                raise ValueError(f"Unknown analysis: {name}")
+            fields.extend(f for f in DataProcessor.ANALYSIS_FIELDS[name] if f not in fields)
+        return fields
     
     @staticmethod
-    def get_time_in_progress_distribution(issues: List[Dict]) -> List[float]:
-        time_in_progress = []
+    def compute_all(issues: Iterable[Dict], analyses: Optional[List[str]] = None, top_users: int = 30,
+                    daily_period: str = 'day', histogram_bins: Optional[str] = None, workers: int = 1) -> Dict[str, Any]:
+        engine = MetricsEngine.for_analyses(analyses, top_users=top_users, daily_period=daily_period,
+                                            histogram_bins=histogram_bins)
+        return engine.consume(issues, workers).results()
+    
+    @staticmethod
+    def duration_percentiles(results: Dict[str, Any]) -> pd.DataFrame:
+        # p50/p90/p99 по t-digest: аккумуляторы наполняют его потоково (Histogram и Durations),
+        # в дайджест сворачиваются только простые списки (колоночный режим)
+        rows = []
+        durations = [('open_time', None, results.get('open_time'))]
+        durations += [('status_durations', status, values)
+                      for status, values in results.get('status_durations', {}).items()]
+        durations.append(('time_in_progress', None, results.get('time_in_progress')))
         
-        for issue in issues:
-            if not issue['fields'].get('resolutiondate'):
+        for metric, status, values in durations:
+            if values is None or not len(values):
                 continue
-            
-            changelog = issue.get('changelog', {})
-            histories = changelog.get('histories', [])
-            if not histories:
-                continue
-            
-            status_times = {}
-            current_status = None
-            status_start = None
-            created = datetime.strptime(issue['fields']['created'], '%Y-%m-%dT%H:%M:%S.%f%z')
-            
-            for history in histories:
-                for item in history.get('items', []):
-                    if item['field'] == 'status':
-                        current_status = item.get('fromString')
-                        status_start = created
-                        break
-                if current_status:
-                    break
-            
-            for history in histories:
-                changed_date = datetime.strptime(history['created'], '%Y-%m-%dT%H:%M:%S.%f%z')
-                for item in history.get('items', []):
-                    if item['field'] == 'status':
-                        if current_status and status_start:
-                            duration_hours = (changed_date - status_start).total_seconds() / 3600
-                            status_times[current_status] = status_times.get(current_status, 0) + duration_hours
-                        current_status = item['toString']
-                        status_start = changed_date
-            
-            if current_status and status_start:
-                resolved = datetime.strptime(issue['fields']['resolutiondate'], '%Y-%m-%dT%H:%M:%S.%f%z')
-                duration_hours = (resolved - status_start).total_seconds() / 3600
-                status_times[current_status] = status_times.get(current_status, 0) + duration_hours
-            
-            for status, hours in status_times.items():
-                if 'progress' in status.lower():
-                    time_in_progress.append(hours)
-                    break
-        
-        return time_in_progress
+            sketch = values.sketch if isinstance(values, (Histogram, Durations)) else TDigest().update(values)
+            rows.append({'metric': metric, 'status': status, 'count': sketch.count, **sketch.percentiles()})
+        return pd.DataFrame(rows, columns=['metric', 'status', 'count', 'p50', 'p90', 'p99'])
     
     @staticmethod
-    def get_priority_distribution(issues: List[Dict]) -> Dict[str, int]:
-        priority_counts = defaultdict(int)
+    def _accumulate(accumulator: Accumulator, issues: Iterable[Dict]) -> Any:
+        return MetricsEngine({'metric': accumulator}).consume(issues).results()['metric']
+    
+    @staticmethod
+    def calculate_open_time(issues: Iterable[Dict]) -> List[int]:
+        return DataProcessor._accumulate(OpenTimeAccumulator(), issues)
+    
+    @staticmethod
+    def get_status_durations(issues: Iterable[Dict]) -> Dict[str, List[int]]:
+        # Векторно по плоской таблице переходов; результат совпадает с потоковым StatusDurationsAccumulator
+        return _transition_table(issues).status_durations()
+    
+    @staticmethod
+    def get_daily_stats(issues: Iterable[Dict], period: str = 'day') -> pd.DataFrame:
+        created = []
+        closed = []
         for issue in issues:
-            priority = issue['fields'].get('priority')
-            if priority:
-                priority_counts[priority['name']] += 1
-        return dict(priority_counts)
+            created.append(issue['fields']['created'][:10])
+            resolved = issue['fields'].get('resolutiondate')
+            if resolved:
+                closed.append(resolved[:10])
+        
+        return build_period_stats(
+            pd.to_datetime(pd.Series(created, dtype=object), format='%Y-%m-%d').value_counts(),
+            pd.to_datetime(pd.Series(closed, dtype=object), format='%Y-%m-%d').value_counts(),
+            period
+        )
+    
+    @staticmethod
+    def get_user_stats(issues: Iterable[Dict], top_n: int = 30) -> pd.DataFrame:
+        return DataProcessor._accumulate(UserStatsAccumulator(top_n), issues)
+    
+    @staticmethod
+    def get_time_in_progress_distribution(issues: Iterable[Dict]) -> List[float]:
+        return _transition_table(issues).time_in_progress()
+    
+    @staticmethod
+    def get_priority_distribution(issues: Iterable[Dict]) -> Dict[str, int]:
+        return DataProcessor._accumulate(PriorityDistributionAccumulator(), issues)
+
+
+def _transition_table(issues: Iterable[Dict]):
+    # transitions сам импортирует этот модуль, поэтому импорт откладывается до вызова
+    try:
+        from .transitions import TransitionTable
+    except ImportError:
+        from transitions import TransitionTable
+    return TransitionTable.from_issues(issues)
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import Dict, Hashable, List, Optional
+import numpy as np
+
+# Код пустого значения (нет исполнителя, приоритета или исходного статуса)
+NO_CODE = -1
+
+
+class Dimension:
+    # Словарь одного измерения: ключ -> небольшой целый код в порядке первого появления.
+    # Подпись для отчетов хранится один раз на код и подставляется только при выводе результатов
+    
+    def __init__(self):
+        self.codes: Dict[Hashable, int] = {}
+        self.keys: List[Hashable] = []
+        self.labels: List[Optional[str]] = []
+    
+    def code(self, key: Hashable, label: Optional[str] = None) -> int:
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.keys)
+            self.keys.append(key)
+            self.labels.append(label if label is not None else key)
+        return code
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def label(self, code: int) -> Optional[str]:
+        return self.labels[code] if code != NO_CODE else None
+    
+    def resolve(self, codes: np.ndarray) -> np.ndarray:
+        # NO_CODE (-1) попадает на последний элемент — None
+        return np.asarray(self.labels + [None], dtype=object)[np.asarray(codes, dtype=np.int64)]
+    
+    def remap(self, other: 'Dimension') -> np.ndarray:
+        # Коды другого словаря в этом: новые ключи дописываются в конец, последний элемент — для NO_CODE
+        return np.array([self.code(key, label) for key, label in zip(other.keys, other.labels)] + [NO_CODE],
+                        dtype=np.int64)
+
+
+class Dimensions:
+    # Общие словари пользователей, статусов и приоритетов для всех задач прогона
+    
+    def __init__(self):
+        self.users = Dimension()
+        self.statuses = Dimension()
+        self.priorities = Dimension()
+    
+    def user(self, user: Optional[Dict]) -> int:
+        # Пользователь определяется по accountId (Cloud) или key/name (Server), а не по отображаемому имени
+        if not user:
+            return NO_CODE
+        key = user.get('accountId') or user.get('key') or user.get('name') or user.get('displayName')
+        return self.users.code(key, user.get('displayName'))
+    
+    def status(self, name: Optional[str]) -> int:
+        return self.statuses.code(name)
+    
+    def priority(self, priority: Optional[Dict]) -> int:
+        return self.priorities.code(priority['name']) if priority else NO_CODE
\ No newline at end of file
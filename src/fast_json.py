@@ -0,0 +1,99 @@
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
+
+# Необязательные ускорители: msgspec разбирает ответ сразу по схеме и пропускает ненужные ключи,
+# orjson разбирает ответ целиком, но быстрее stdlib json. Без обоих используется json
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'msgspec' if msgspec is not None else 'orjson' if orjson is not None else 'json'
+
+# Схема ответа: объект — словарь ключ -> схема значения (прочие ключи отбрасываются),
+# [схема] — список таких значений, None — значение сохраняется целиком
+Schema = Optional[Union[Dict[str, Any], list]]
+
+NAMED = {'name': None}
+# Пользователь определяется по accountId/key/name, в отчетах — displayName (см. Dimensions.user)
+USER = {'accountId': None, 'key': None, 'name': None, 'displayName': None}
+# Читаемые части известных полей задачи; аватары, ссылки self, statusCategory и т.п. не сохраняются
+FIELD_SCHEMAS = {'status': NAMED, 'priority': NAMED, 'assignee': USER, 'reporter': USER}
+# Автор записи истории (author) не сохраняется: ни один анализ его не читает.
+# Это касается и CHANGELOG_DECODER, и BULK_CHANGELOG_DECODER — история, догруженная отдельно, тоже без author
+HISTORY = {
+    'id': None,
+    'created': None,
+    'items': [{'field': None, 'fromString': None, 'toString': None}],
+}
+CHANGELOG_PAGE = {'startAt': None, 'maxResults': None, 'total': None, 'isLast': None, 'values': [HISTORY]}
+BULK_CHANGELOG_PAGE = {
+    'nextPageToken': None,
+    'issueChangeLogs': [{'issueId': None, 'changeHistories': [HISTORY]}],
+}
+
+
+def fields_schema(fields: Optional[List[str]]) -> Schema:
+    # Сервер и так отдает только запрошенные поля; *all, *navigable и исключения (-field) сохраняются как есть
+    if not fields or any(name.startswith(('*', '-')) for name in fields):
+        return None
+    return {name: FIELD_SCHEMAS.get(name) for name in fields}
+
+
+def search_page_schema(fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    issue = {
+        'id': None,
+        'key': None,
+        'fields': fields_schema(fields),
+        'changelog': {'startAt': None, 'maxResults': None, 'total': None, 'histories': [HISTORY]},
+    }
+    return {'startAt': None, 'maxResults': None, 'total': None, 'isLast': None, 'nextPageToken': None,
+            'issues': [issue]}
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _typed(schema: Schema) -> Any:
+    # Схема -> тип msgspec; любое значение может прийти как null
+    if schema is None:
+        return Any
+    if isinstance(schema, list):
+        return Optional[List[_typed(schema[0])]]
+    return Optional[TypedDict('Object', {key: _typed(value) for key, value in schema.items()}, total=False)]
+
+
+class Decoder:
+    # Декодер ответов одной схемы. С msgspec объекты сразу собираются из нужных ключей (TypedDict дает обычные dict),
+    # остальное не материализуется. Обрезка уже разобранного ответа на Python стоит дороже, чем экономит orjson,
+    # поэтому без msgspec ответ разбирается целиком
+    
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self._decoder = msgspec.json.Decoder(_typed(schema)) if msgspec is not None else None
+    
+    def decode(self, data: Union[bytes, str]) -> Any:
+        if self._decoder is not None:
+            try:
+                return self._decoder.decode(data)
+            except msgspec.ValidationError:
+                # Неожиданный тип значения (например, строка вместо объекта) — разбор без схемы
+                pass
+        return loads(data)
+
+
+@lru_cache(maxsize=32)
+def search_page_decoder(fields: Optional[Tuple[str, ...]] = None) -> Decoder:
+    return Decoder(search_page_schema(list(fields) if fields else None))
+
+
+CHANGELOG_DECODER = Decoder(CHANGELOG_PAGE)
+BULK_CHANGELOG_DECODER = Decoder(BULK_CHANGELOG_PAGE)
\ No newline at end of file
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+try:
+    from .fast_json import loads
+except ImportError:
+    from fast_json import loads
+
+
+class FetchJournal:
+    # Журнал загруженных страниц текущей выгрузки: прерванный прогон с resume=True продолжает
+    # с последней сохраненной страницы (или шарда), а не с startAt=0. После успешной выгрузки журнал очищается
+    
+    def __init__(self, path: str, resume: bool = False):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.resume = resume
+        self.run_key: Optional[str] = None
+        self.restored = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                run_key TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                body BLOB NOT NULL,
+                PRIMARY KEY (run_key, unit)
+            );
+        """)
+    
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+    
+    def begin(self, run_key: str):
+        # Без resume старые страницы того же запроса отбрасываются: выгрузка начинается заново
+        self.run_key = run_key
+        self.restored = 0
+        if not self.resume:
+            with self._lock, self.conn:
+                self.conn.execute('DELETE FROM pages WHERE run_key = ?', (run_key,))
+    
+    def get(self, unit: str) -> Optional[Dict]:
+        if self.run_key is None:
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT body FROM pages WHERE run_key = ? AND unit = ?', (self.run_key, unit)
+            ).fetchone()
+            if row is None:
+                return None
+            self.restored += 1
+        return loads(zlib.decompress(row[0]))
+    
+    def put(self, unit: str, payload: Dict):
+        if self.run_key is None:
+            return
+        body = zlib.compress(json.dumps(payload).encode('utf-8'), 6)
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (run_key, unit, body) VALUES (?, ?, ?)', (self.run_key, unit, body)
+            )
+    
+    def finish(self):
+        if self.run_key is None:
+            return
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM pages WHERE run_key = ?', (self.run_key,))
+        self.run_key = None
+    
+    def units(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.conn.execute('SELECT unit FROM pages WHERE run_key = ?', (self.run_key,))]
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+try:
+    from .sketch import TDigest
+except ImportError:
+    from sketch import TDigest
+
+# Значение output.histogram_bins -> шкала корзин
+HISTOGRAM_SCALES = ('fixed', 'log')
+
+
+class Histogram:
+    # Разреженные счетчики по корзинам фиксированной ширины или логарифмической шкалы + сводная статистика.
+    # Память зависит от числа занятых корзин, а не от числа задач; гистограммы одной шкалы складываются через merge
+    
+    def __init__(self, width: float = 1.0, log: bool = False, bins_per_decade: float = 10):
+        self.width = width
+        self.log = log
+        self.bins_per_decade = bins_per_decade
+        self.counts: Dict[int, int] = {}
+        # На логарифмической шкале значения <= 0 не попадают ни в одну корзину и считаются отдельно
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        # Перцентили считаются по t-digest: корзины дают форму распределения, дайджест — точные хвосты
+        self.sketch = TDigest()
+    
+    @classmethod
+    def fixed(cls, width: float = 1.0) -> 'Histogram':
+        return cls(width=width)
+    
+    @classmethod
+    def log_spaced(cls, bins_per_decade: float = 10) -> 'Histogram':
+        return cls(log=True, bins_per_decade=bins_per_decade)
+    
+    @classmethod
+    def for_scale(cls, scale: str) -> 'Histogram':
+        if scale not in HISTOGRAM_SCALES:
+            raise ValueError(f"Unknown histogram bins: {scale}")
+        return cls.log_spaced() if scale == 'log' else cls.fixed()
+    
+    @classmethod
+    def from_values(cls, values: Iterable[float], scale: str = 'fixed') -> 'Histogram':
+        histogram = cls.for_scale(scale)
+        histogram.update(values)
+        return histogram
+    
+    def _index(self, value: float) -> int:
+        if self.log:
+            return math.floor(math.log10(value) * self.bins_per_decade)
+        return math.floor(value / self.width)
+    
+    def add(self, value: float):
+        if self.log and value <= 0:
+            self.zeros += 1
+        else:
+            index = self._index(value)
+            self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+    
+    # Аккумуляторы наполняют гистограмму так же, как список сырых значений
+    append = add
+    
+    def update(self, values: Iterable[float]) -> 'Histogram':
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float)
+        if not len(values):
+            return self
+        
+        binned = values
+        if self.log:
+            positive = values > 0
+            self.zeros += int((~positive).sum())
+            binned = values[positive]
+            indices = np.floor(np.log10(binned) * self.bins_per_decade)
+        else:
+            indices = np.floor(binned / self.width)
+        for index, count in zip(*np.unique(indices.astype(np.int64), return_counts=True)):
+            self.counts[int(index)] = self.counts.get(int(index), 0) + int(count)
+        
+        self.count += len(values)
+        self.total += float(values.sum())
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.sketch.update(values)
+        return self
+    
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        if (self.log, self.width, self.bins_per_decade) != (other.log, other.width, other.bins_per_decade):
+            raise ValueError("Cannot merge histograms with different bins")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+    
+    def _edge(self, index: int) -> float:
+        if self.log:
+            return 10 ** (index / self.bins_per_decade)
+        return index * self.width
+    
+    def bins(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Непрерывный ряд корзин от первой до последней занятой: edges на одну длиннее counts
+        if not self.counts:
+            return np.array([], dtype=float), np.array([], dtype=np.int64)
+        low, high = min(self.counts), max(self.counts)
+        indices = np.arange(low, high + 2)
+        edges = np.array([self._edge(int(index)) for index in indices], dtype=float)
+        counts = np.array([self.counts.get(int(index), 0) for index in indices[:-1]], dtype=np.int64)
+        return edges, counts
+    
+    def coarsen(self, max_bins: int) -> 'Histogram':
+        # Объединяет соседние корзины в целое число раз: floor(floor(x / w) / k) == floor(x / (w * k))
+        if not self.counts:
+            return self
+        factor = math.ceil((max(self.counts) - min(self.counts) + 1) / max_bins)
+        if factor <= 1:
+            return self
+        
+        coarse = Histogram(self.width * factor, self.log, self.bins_per_decade / factor)
+        for index, count in self.counts.items():
+            coarse.counts[index // factor] = coarse.counts.get(index // factor, 0) + count
+        coarse.zeros, coarse.count, coarse.total = self.zeros, self.count, self.total
+        coarse.min, coarse.max = self.min, self.max
+        coarse.sketch = self.sketch
+        return coarse
+    
+    def quantile(self, q: float) -> Optional[float]:
+        return self.sketch.quantile(q)
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            **self.sketch.percentiles(),
+        }
+
+
+class Durations(list):
+    # Сырые значения для графиков и t-digest, который пополняется по мере добавления:
+    # перцентили не требуют повторного прохода по списку
+    
+    def __init__(self, values: Iterable[float] = ()):
+        super().__init__()
+        self.sketch = TDigest()
+        self.extend(values)
+    
+    def append(self, value: float):
+        super().append(value)
+        self.sketch.add(value)
+    
+    def extend(self, values: Iterable[float]):
+        values = list(values)
+        super().extend(values)
+        self.sketch.extend(values)
+    
+    def merge(self, other: 'Durations') -> 'Durations':
+        # Значения порции дописываются в дайджест по порядку, а не сливаются дайджестами:
+        # перцентили после параллельного расчета те же, что после последовательного
+        self.extend(other)
+        return self
+    
+    def __reduce__(self):
+        # Иначе pickle восстанавливает элементы через append и добавляет их в дайджест повторно
+        return _restore_durations, (list(self), self.sketch)
+
+
+def _restore_durations(values: List[float], sketch: TDigest) -> Durations:
+    durations = Durations()
+    list.extend(durations, values)
+    durations.sketch = sketch
+    return durations
+
+
+def new_collection(histogram_bins: Optional[str] = None):
+    # Без histogram_bins метрики копят сырые списки значений (с потоковым дайджестом для перцентилей)
+    return Histogram.for_scale(histogram_bins) if histogram_bins else Durations()
\ No newline at end of file
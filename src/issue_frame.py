@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+try:
+    from .data_processor import JIRA_DATETIME_FORMAT, build_period_stats
+    from .dimensions import NO_CODE, Dimensions
+    from .histogram import Histogram
+    from .transitions import NS_PER_DAY, TransitionTable
+except ImportError:
+    from data_processor import JIRA_DATETIME_FORMAT, build_period_stats
+    from dimensions import NO_CODE, Dimensions
+    from histogram import Histogram
+    from transitions import NS_PER_DAY, TransitionTable
+
+
+class IssueFrame:
+    # Колоночное представление задач: таблица задач и компактная таблица переходов статусов из changelog.
+    # Статусы, приоритеты и пользователи хранятся целыми кодами общего словаря, имена подставляются в результатах
+    
+    def __init__(self, issues: pd.DataFrame, transitions: TransitionTable, dimensions: Dimensions):
+        self.issues = issues
+        self.transitions = transitions
+        self.dimensions = dimensions
+    
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict]) -> 'IssueFrame':
+        columns = {name: [] for name in ('key', 'created', 'resolved', 'priority', 'assignee', 'reporter', 'has_histories')}
+        dimensions = Dimensions()
+        transitions = TransitionTable(statuses=dimensions.statuses)
+        
+        # Сырой JSON не сохраняется: из каждой задачи забираются только нужные значения
+        for issue in issues:
+            fields = issue['fields']
+            columns['key'].append(issue.get('key'))
+            columns['created'].append(fields.get('created'))
+            columns['resolved'].append(fields.get('resolutiondate'))
+            columns['priority'].append(dimensions.priority(fields.get('priority')))
+            # Исполнитель кодируется раньше автора: коды идут в порядке первого появления, как при построчном подсчете
+            columns['assignee'].append(dimensions.user(fields.get('assignee')))
+            columns['reporter'].append(dimensions.user(fields.get('reporter')))
+            columns['has_histories'].append(bool(issue.get('changelog', {}).get('histories', [])))
+            transitions.add(issue)
+        
+        issues_df = pd.DataFrame({
+            'key': pd.Series(columns['key'], dtype=object),
+            'created': _to_utc(columns['created']),
+            'resolved': _to_utc(columns['resolved']),
+            # Дата по часам самой JIRA (смещение из строки), как у datetime.date()
+            'created_date': _to_local_date(columns['created']),
+            'resolved_date': _to_local_date(columns['resolved']),
+            'status': transitions.current,
+            'priority': np.array(columns['priority'], dtype=np.int32),
+            'assignee': np.array(columns['assignee'], dtype=np.int32),
+            'reporter': np.array(columns['reporter'], dtype=np.int32),
+            'has_histories': np.array(columns['has_histories'], dtype=bool),
+        })
+        return cls(issues_df, transitions, dimensions)
+    
+    def __len__(self) -> int:
+        return len(self.issues)
+    
+    def open_time(self) -> List[int]:
+        created = _ns(self.issues['created'])
+        resolved = _ns(self.issues['resolved'])
+        mask = self.issues['resolved'].notna().to_numpy()
+        return np.floor_divide(resolved[mask] - created[mask], NS_PER_DAY).tolist()
+    
+    def status_durations(self) -> Dict[str, List[int]]:
+        return self.transitions.status_durations()
+    
+    def status_hours(self) -> pd.DataFrame:
+        # Часы по статусам для каждой задачи (строки — ключи задач, столбцы — статусы)
+        return pd.DataFrame(self.transitions.status_hours(), index=self.issues['key'],
+                            columns=self.transitions.statuses.labels)
+    
+    def daily_stats(self, period: str = 'day') -> pd.DataFrame:
+        return build_period_stats(
+            self.issues['created_date'].value_counts(),
+            self.issues['resolved_date'].dropna().value_counts(),
+            period
+        )
+    
+    def user_stats(self, top_n: int = 30) -> pd.DataFrame:
+        # Коды пользователей выданы в порядке первого появления, поэтому стабильная сортировка разрешает ничьи
+        # так же, как построчный подсчет
+        users = np.concatenate([self.issues['assignee'].to_numpy(), self.issues['reporter'].to_numpy()])
+        counts = np.bincount(users[users != NO_CODE], minlength=len(self.dimensions.users))
+        order = np.argsort(-counts, kind='stable')[:top_n]
+        order = order[counts[order] > 0]
+        return pd.DataFrame({'user': self.dimensions.users.resolve(order), 'count': counts[order]})
+    
+    def time_in_progress(self) -> List[float]:
+        return self.transitions.time_in_progress()
+    
+    def priority_distribution(self) -> Dict[str, int]:
+        priorities = self.issues['priority'].to_numpy()
+        counts = np.bincount(priorities[priorities != NO_CODE], minlength=len(self.dimensions.priorities))
+        return {self.dimensions.priorities.label(code): int(count) for code, count in enumerate(counts) if count}
+    
+    def compute(self, analyses: Optional[List[str]] = None, top_users: int = 30,
+                daily_period: str = 'day', histogram_bins: Optional[str] = None) -> Dict[str, Any]:
+        def binned(values):
+            return Histogram.from_values(values, histogram_bins) if histogram_bins else values
+        
+        metrics = {
+            'open_time': lambda: binned(self.open_time()),
+            'status_durations': lambda: {status: binned(days) for status, days in self.status_durations().items()},
+            'daily_stats': lambda: self.daily_stats(daily_period),
+            'user_stats': lambda: self.user_stats(top_users),
+            'time_in_progress': lambda: binned(self.time_in_progress()),
+            'priority_distribution': self.priority_distribution,
+        }
+        for name in analyses or metrics:
+            if name not in metrics:
+                raise ValueError(f"Unknown analysis: {name}")
+        return {name: metrics[name]() for name in analyses or metrics}
+
+
+def _to_utc(values: List[Optional[str]]) -> pd.Series:
+    return pd.Series(pd.to_datetime(pd.Series(values, dtype=object), format=JIRA_DATETIME_FORMAT, utc=True))
+
+
+def _to_local_date(values: List[Optional[str]]) -> pd.Series:
+    return pd.Series(pd.to_datetime(pd.Series(values, dtype=object).str[:10], format='%Y-%m-%d'))
+
+
+def _ns(series: pd.Series) -> np.ndarray:
+    return series.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]').view(np.int64).copy()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterator, List, Dict, Optional
+
+try:
+    from .data_processor import parse_jira_datetime
+    from .jira_client import ORDER_BY_RE
+except ImportError:
+    from data_processor import parse_jira_datetime
+    from jira_client import ORDER_BY_RE
+
+# Сколько id в одном запросе догрузки задач, которых нет в хранилище
+MISSING_BATCH = 100
+
+
+class IssueStore:
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                query_key TEXT NOT NULL,
+                issue_id TEXT NOT NULL,
+                issue_key TEXT,
+                updated TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (query_key, issue_id)
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                query_key TEXT PRIMARY KEY,
+                watermark TEXT,
+                synced_at TEXT
+            );
+        """)
+    
+    @staticmethod
+    def query_key(base_url: str, jql: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> str:
+        # Один и тот же JQL на разных серверах — разные наборы задач и разные watermark
+        return f"{base_url.rstrip('/')}|{jql.strip()}|{expand or ''}|{','.join(sorted(fields)) if fields else '*all'}"
+    
+    def get_watermark(self, query_key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT watermark FROM sync_state WHERE query_key = ?', (query_key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_watermark(self, query_key: str, watermark: Optional[str]):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO sync_state (query_key, watermark, synced_at) VALUES (?, ?, ?)',
+                (query_key, watermark, datetime.now().isoformat(timespec='seconds'))
+            )
+    
+    def upsert(self, query_key: str, issues: List[Dict], advance_watermark: bool = True) -> int:
+        # sync передает advance_watermark=False и сдвигает watermark сам, когда дельта загружена целиком
+        rows = [
+            (query_key, str(issue.get('id') or issue['key']), issue.get('key'), issue.get('fields', {}).get('updated'),
+             json.dumps(issue))
+            for issue in issues
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO issues (query_key, issue_id, issue_key, updated, data) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+        if advance_watermark:
+            self.set_watermark(query_key, latest_updated(self.get_watermark(query_key), issues))
+        return len(rows)
+    
+    def iter_issues(self, query_key: str) -> Iterator[Dict]:
+        cursor = self.conn.execute(
+            'SELECT data FROM issues WHERE query_key = ? ORDER BY CAST(issue_id AS INTEGER), issue_id',
+            (query_key,)
+        )
+        for row in cursor:
+            yield json.loads(row[0])
+    
+    def load(self, query_key: str, ids: Optional[List[str]] = None) -> List[Dict]:
+        if ids is None:
+            return list(self.iter_issues(query_key))
+        # Задачи в порядке переданных id; id, которых еще нет в хранилище, пропускаются
+        stored = {}
+        for issue_id, data in self.conn.execute('SELECT issue_id, data FROM issues WHERE query_key = ?', (query_key,)):
+            stored[issue_id] = data
+        return [json.loads(stored[issue_id]) for issue_id in ids if issue_id in stored]
+    
+    def missing(self, query_key: str, ids: List[str]) -> List[str]:
+        stored = {issue_id for issue_id, in self.conn.execute('SELECT issue_id FROM issues WHERE query_key = ?',
+                                                               (query_key,))}
+        return [issue_id for issue_id in ids if issue_id not in stored]
+    
+    def prune(self, query_key: str, ids: List[str]) -> int:
+        # Удаляет задачи, которые больше не попадают под запрос (окно created >= -365d сдвинулось, задачу перенесли)
+        members = set(ids)
+        stale = [
+            (query_key, issue_id)
+            for issue_id, in self.conn.execute('SELECT issue_id FROM issues WHERE query_key = ?', (query_key,))
+            if issue_id not in members
+        ]
+        with self.conn:
+            self.conn.executemany('DELETE FROM issues WHERE query_key = ? AND issue_id = ?', stale)
+        return len(stale)
+    
+    def sync(self, client, jql: str, max_results: Optional[int] = None, expand: Optional[str] = None,
+             fields: Optional[List[str]] = None) -> List[Dict]:
+        if fields and 'updated' not in fields:
+            fields = list(fields) + ['updated']
+        key = self.query_key(client.base_url, jql, expand, fields)
+        watermark = self.get_watermark(key)
+        delta_jql = build_delta_jql(jql, watermark)
+        
+        # Страницы пишутся по мере поступления, а watermark сдвигается только в конце: страницы могут прийти
+        # не по порядку updated (шарды по created), и прерванная синхронизация не должна перепрыгнуть задачи
+        fetched = 0
+        for page in client.iter_pages(delta_jql, None, expand, fields):
+            fetched += self.upsert(key, page, advance_watermark=False)
+            watermark = latest_updated(watermark, page)
+        
+        # Состав и порядок — по исходному JQL (с его ORDER BY): запрос только id дешевле полной выгрузки
+        ids = [str(issue.get('id') or issue['key']) for page in client.iter_pages(jql, None, None, ['id'])
+               for issue in page]
+        removed = self.prune(key, ids)
+        
+        # Задачи запроса, которых нет в хранилище (попали под запрос без изменения updated), догружаются по id
+        missing = self.missing(key, ids)
+        for start in range(0, len(missing), MISSING_BATCH):
+            batch_jql = f"id in ({', '.join(missing[start:start + MISSING_BATCH])})"
+            for page in client.iter_pages(batch_jql, None, expand, fields):
+                fetched += self.upsert(key, page, advance_watermark=False)
+        self.set_watermark(key, watermark)
+        
+        issues = self.load(key, ids[:max_results] if max_results else ids)
+        print(f"   ✓ Store: {fetched} updated, {removed} removed, {len(issues)} total")
+        return issues
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def latest_updated(watermark: Optional[str], issues: List[Dict]) -> Optional[str]:
+    for issue in issues:
+        updated = issue.get('fields', {}).get('updated')
+        if updated and (watermark is None or parse_jira_datetime(updated) > parse_jira_datetime(watermark)):
+            watermark = updated
+    return watermark
+
+
+def build_delta_jql(jql: str, watermark: Optional[str]) -> str:
+    # Дельта идет по возрастанию updated (без шардов): самые старые изменения приходят первыми
+    base = ORDER_BY_RE.sub('', jql.strip())
+    if watermark:
+        # JQL понимает даты в часовом поясе пользователя — в нем же JIRA отдает поле updated
+        since = parse_jira_datetime(watermark).strftime('%Y/%m/%d %H:%M')
+        base = f'({base}) AND updated >= "{since}"'
+    return f'{base} ORDER BY updated ASC'
\ No newline at end of file
@@ -1,79 +1,646 @@
-import requests
+import json
+import random
+import re
+import threading
 import time
-from typing import List, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from itertools import islice
+from queue import Full, Queue
+from typing import Iterator, List, Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    from .data_processor import parse_jira_datetime
+    from .fast_json import BULK_CHANGELOG_DECODER, CHANGELOG_DECODER, search_page_decoder
+    from .fetch_journal import FetchJournal
+    from .rate_limiter import RateLimiter
+    from .response_cache import ResponseCache
+    from .server_info import ServerInfoStore
+except ImportError:
+    from data_processor import parse_jira_datetime
+    from fast_json import BULK_CHANGELOG_DECODER, CHANGELOG_DECODER, search_page_decoder
+    from fetch_journal import FetchJournal
+    from rate_limiter import RateLimiter
+    from response_cache import ResponseCache
+    from server_info import ServerInfoStore
+
+# Сколько секунд доверять сохраненному результату проверки serverInfo
+API_VERSION_TTL = 24 * 3600
+# Максимальный размер страницы /issue/{key}/changelog
+CHANGELOG_PAGE_SIZE = 100
+# Лимит задач в одном запросе Jira Cloud /changelog/bulkfetch
+BULK_CHANGELOG_ISSUES = 1000
+# offset — параллельные страницы по startAt; cursor — nextPageToken (Cloud) или keyset по id (Server)
+PAGINATION_MODES = ('offset', 'cursor')
+# Повторов упавшего шарда до отказа всей загрузки; шард продолжается с последней полученной страницы
+SHARD_RETRIES = 2
+# Страниц шарда, которые ждут потребителя; следующий запрос шарда ждет, пока очередь не освободится
+SHARD_QUEUE_PAGES = 2
+# Повторов одной страницы при сетевой ошибке или 5xx, прежде чем ошибка дойдет до шарда или вызывающего
+PAGE_RETRIES = 3
+# 503 уже повторяет _send вместе с 429
+RETRYABLE_STATUSES = (500, 502, 504)
+
+ORDER_BY_RE = re.compile(r'\s+ORDER\s+BY\s+.*$', re.IGNORECASE | re.DOTALL)
 
 
 class JiraClient:
-    def __init__(self, base_url: str, email: Optional[str] = None, api_token: Optional[str] = None):
+    def __init__(self, base_url: str, email: Optional[str] = None, api_token: Optional[str] = None,
+                 max_workers: int = 4, rate_limit: Optional[Dict] = None,
+                 response_cache: Optional[ResponseCache] = None, api_version: Optional[str] = None,
+                 pagination: str = 'offset', shards: int = 1, journal: Optional[FetchJournal] = None,
+                 server_info: Optional[ServerInfoStore] = None):
+        if pagination not in PAGINATION_MODES:
+            raise ValueError(f"Unknown pagination: {pagination}")
         self.base_url = base_url.rstrip('/')
         self.auth = (email, api_token) if email and api_token else None
-        self.headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-        self.api_version = self._detect_api_version()
+        self.headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        }
+        self.max_workers = max(1, max_workers)
+        self.pagination = pagination
+        # Число окон по created, на которые делится запрос (1 — без разбиения)
+        self.shards = max(1, shards)
+        self.rate_limiter = RateLimiter.for_url(self.base_url, **(rate_limit or {}))
+        self.response_cache = response_cache
+        # Журнал загруженных страниц для продолжения прерванной выгрузки
+        self.journal = journal
+        self.session = self._create_session()
+        # Версия API определяется лениво при первом запросе; явно заданная версия отключает ее проверку
+        self._api_version = api_version
+        # Запись serverInfo (версия, тип развертывания, сборка) сохраняется между запусками
+        self.server_info = server_info
+        self._server_record: Optional[Dict] = None
+        self._server_checked = False
+        self._server_lock = threading.Lock()
+        # Сбрасывается, если сервер не поддерживает /changelog/bulkfetch
+        self._bulk_changelogs = True
+    
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.auth = self.auth
+        session.headers.update(self.headers)
+        # Пул соединений рассчитан на все параллельные воркеры + служебные запросы
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers + 2)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def close(self):
+        self.session.close()
+        if self.response_cache:
+            self.response_cache.close()
+        if self.journal:
+            self.journal.close()
+        if self.server_info:
+            self.server_info.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    @property
+    def api_version(self) -> str:
+        if self._api_version is None:
+            record = self._server_info()
+            # Сервер не ответил ни по одной версии: используем v2, результат не запоминается
+            self._api_version = record['version'] if record else "2"
+        return self._api_version
+    
+    @property
+    def is_cloud(self) -> bool:
+        # Тип развертывания из serverInfo (сохраненного или проверенного); по домену — только если сервер не ответил
+        record = self._server_info()
+        if record and record.get('deployment_type'):
+            return record['deployment_type'] == 'Cloud'
+        return (urlparse(self.base_url).hostname or '').endswith('.atlassian.net')
+    
+    def _server_info(self) -> Optional[Dict]:
+        # Запись из хранилища, не старше API_VERSION_TTL, иначе одна проверка serverInfo.
+        # При заданной версии проверяется только она и только когда нужен тип развертывания
+        with self._server_lock:
+            if not self._server_checked:
+                self._server_checked = True
+                store = self.server_info
+                record = store.get(self.base_url, API_VERSION_TTL) if store else None
+                if record is None:
+                    record = self._detect_server_info([self._api_version] if self._api_version else ["2", "3"])
+                    if record and store:
+                        store.put(self.base_url, record['version'], record['deployment_type'], record['build'])
+                self._server_record = record
+            return self._server_record
+    
+    def _detect_server_info(self, versions: List[str]) -> Optional[Dict]:
+        # Версии проверяются одновременно: недоступный сервер стоит один таймаут, а не по таймауту на версию
+        with ThreadPoolExecutor(max_workers=len(versions)) as executor:
+            records = list(executor.map(self._probe_server_info, versions))
+        return next((record for record in records if record), None)
+    
+    def _probe_server_info(self, version: str) -> Optional[Dict]:
+        try:
+            response = self._get(f"{self.base_url}/rest/api/{version}/serverInfo", timeout=5)
+            if response.status_code != 200:
+                return None
+            info = response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+        if not isinstance(info, dict):
+            info = {}
+        deployment_type = info.get('deploymentType')
+        build = info.get('version')
+        return {
+            'version': version,
+            'deployment_type': deployment_type if isinstance(deployment_type, str) else None,
+            'build': build if isinstance(build, str) else None,
+        }
+    
+    def _get(self, url: str, params: Optional[Dict] = None, timeout: int = 30,
+             headers: Optional[Dict] = None) -> requests.Response:
+        return self._send(self.session.get, url, params=params, timeout=timeout, headers=headers)
+    
+    def _post(self, url: str, payload: Dict, timeout: int = 30) -> requests.Response:
+        return self._send(self.session.post, url, json=payload, timeout=timeout)
+    
+    def _send(self, method, url: str, **kwargs) -> requests.Response:
+        limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            limiter.acquire()
+            response = method(url, **kwargs)
+            limiter.update_from_headers(response.headers)
+            
+            if response.status_code not in (429, 503):
+                limiter.on_success()
+                return response
+            if attempt >= limiter.max_retries:
+                return response
+            
+            limiter.on_throttled(attempt, response.headers.get('Retry-After'))
+            attempt += 1
+    
+    def _get_page(self, url: str, params: Dict, headers: Optional[Dict] = None) -> requests.Response:
+        return self._retry_page(lambda: self._get(url, params=params, timeout=30, headers=headers))
+    
+    def _post_page(self, url: str, payload: Dict) -> requests.Response:
+        return self._retry_page(lambda: self._post(url, payload))
     
-    def _detect_api_version(self) -> str:
-        for version in ["2", "3"]:
+    def _retry_page(self, request) -> requests.Response:
+        # Обрыв соединения или 5xx на одной странице повторяется с экспоненциальной паузой,
+        # уже загруженные страницы при этом не перезапрашиваются
+        limiter = self.rate_limiter
+        attempt = 0
+        while True:
             try:
-                url = f"{self.base_url}/rest/api/{version}/serverInfo"
-                if requests.get(url, auth=self.auth, headers=self.headers, timeout=5).status_code == 200:
-                    return version
-            except:
-                continue
-        return "2"
+                response = request()
+                if response.status_code not in RETRYABLE_STATUSES or attempt >= PAGE_RETRIES:
+                    return response
+            except requests.exceptions.RequestException as e:
+                if attempt >= PAGE_RETRIES:
+                    raise Exception(f"Network error: {e}")
+            time.sleep(random.uniform(0, min(limiter.backoff_max, limiter.backoff_base * 2 ** attempt)))
+            attempt += 1
     
-    def fetch_issues(self, jql_query: str, max_results: Optional[int] = None, expand: Optional[str] = None) -> List[Dict]:
-        all_issues = []
-        start_at = 0
-        batch_size = 50
+    def _fetch_page(self, jql_query: str, start_at: int, batch_size: int, expand: Optional[str] = None,
+                    fields: Optional[List[str]] = None) -> Dict:
+        url = f"{self.base_url}/rest/api/{self.api_version}/search"
+        params = {
+            'jql': jql_query,
+            'startAt': start_at,
+            'maxResults': batch_size,
+            'fields': ','.join(fields) if fields else '*all'
+        }
+        if expand:
+            params['expand'] = expand
         
-        print(f"   JQL: {jql_query}")
-        print(f"   API: v{self.api_version}")
+        journal = self.journal
+        unit = json.dumps(['search', jql_query, start_at, batch_size, expand, fields])
+        if journal:
+            saved = journal.get(unit)
+            if saved is not None:
+                return saved
+        
+        # Из страницы сохраняются только поля, которые читают анализы (при установленном msgspec)
+        decoder = search_page_decoder(tuple(fields) if fields else None)
+        cache = self.response_cache
+        cached = None
+        validators = None
+        if cache:
+            key = cache.key(self.base_url, self.api_version, jql_query, start_at, batch_size, fields, expand)
+            cached = cache.get(key, decoder.decode)
+            if cached:
+                payload, validators, fresh = cached
+                if fresh:
+                    return self._journal_page(unit, payload)
+        
+        response = self._get_page(url, params, validators or None)
+        
+        # 304: страница не изменилась с прошлой загрузки, берем ее из кэша
+        if cached and response.status_code == 304:
+            cache.touch(key)
+            return self._journal_page(unit, cached[0])
+        
+        if response.status_code != 200:
+            raise Exception(f"JIRA API error {response.status_code}: {response.text[:200]}")
+        
+        if cache:
+            cache.put(key, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return self._journal_page(unit, decoder.decode(response.content))
+    
+    def _fetch_jql_page(self, jql_query: str, token: Optional[str], batch_size: int, expand: Optional[str] = None,
+                        fields: Optional[List[str]] = None) -> Dict:
+        url = f"{self.base_url}/rest/api/3/search/jql"
+        params = {
+            'jql': jql_query,
+            'maxResults': batch_size,
+            'fields': ','.join(fields) if fields else '*all'
+        }
+        if token:
+            params['nextPageToken'] = token
+        if expand:
+            params['expand'] = expand
+        
+        unit = json.dumps(['search/jql', jql_query, token, batch_size, expand, fields])
+        if self.journal:
+            saved = self.journal.get(unit)
+            if saved is not None:
+                return saved
         
+        response = self._get_page(url, params)
+        
+        if response.status_code != 200:
+            raise Exception(f"JIRA API error {response.status_code}: {response.text[:200]}")
+        
+        decoder = search_page_decoder(tuple(fields) if fields else None)
+        return self._journal_page(unit, decoder.decode(response.content))
+    
+    def _journal_page(self, unit: str, payload: Dict) -> Dict:
+        if self.journal:
+            self.journal.put(unit, payload)
+        return payload
+    
+    def _fetch_page_issues(self, jql_query: str, start_at: int, batch_size: int, expand: Optional[str],
+                           fields: Optional[List[str]]) -> List[Dict]:
+        return self._fetch_page(jql_query, start_at, batch_size, expand, fields).get('issues', [])
+    
+    def _fetch_changelog(self, issue_key: str) -> Optional[List[Dict]]:
+        url = f"{self.base_url}/rest/api/{self.api_version}/issue/{issue_key}/changelog"
+        histories = []
         while True:
-            url = f"{self.base_url}/rest/api/{self.api_version}/search"
-            params = {
-                'jql': jql_query,
-                'startAt': start_at,
-                'maxResults': batch_size,
-                'fields': '*all'
-            }
-            if expand:
-                params['expand'] = expand
+            # Сбой на странице истории повторяется так же, как на странице поиска
+            response = self._get_page(url, {'startAt': len(histories), 'maxResults': CHANGELOG_PAGE_SIZE})
             
-            try:
-                response = requests.get(url, auth=self.auth, headers=self.headers, params=params, timeout=30)
-                
+            # Нет эндпоинта (старый JIRA Server) или задача удалена — остается встроенный changelog
+            if response.status_code == 404:
+                return None
+            if response.status_code != 200:
+                raise Exception(f"JIRA API error {response.status_code}: {response.text[:200]}")
+            
+            data = CHANGELOG_DECODER.decode(response.content)
+            values = data.get('values', [])
+            histories.extend(values)
+            if not values or data.get('isLast') or len(histories) >= data.get('total', 0):
+                return histories
+    
+    @staticmethod
+    def _changelog_truncated(issue: Dict) -> bool:
+        # /search встраивает не больше maxResults записей истории, total — их полное число
+        changelog = issue.get('changelog')
+        return bool(changelog) and changelog.get('total', 0) > len(changelog.get('histories', []))
+    
+    def _bulk_fetch_changelogs(self, issues: List[Dict]) -> Optional[Dict[str, List[Dict]]]:
+        # Jira Cloud отдает историю сразу для многих задач, страницы связаны курсором nextPageToken
+        url = f"{self.base_url}/rest/api/3/changelog/bulkfetch"
+        histories = {}
+        for start in range(0, len(issues), BULK_CHANGELOG_ISSUES):
+            payload = {
+                'issueIdsOrKeys': [issue['key'] for issue in issues[start:start + BULK_CHANGELOG_ISSUES]],
+                'maxResults': BULK_CHANGELOG_ISSUES
+            }
+            while True:
+                response = self._post_page(url, payload)
+                if response.status_code in (400, 404, 405):
+                    return None
                 if response.status_code != 200:
                     raise Exception(f"JIRA API error {response.status_code}: {response.text[:200]}")
                 
-                data = response.json()
-                issues = data.get('issues', [])
-                total = data.get('total', 0)
-                
-                if not issues:
-                    break
-                
-                all_issues.extend(issues)
-                print(f"   → {len(all_issues)}/{total}", end='\r')
-                
-                if max_results and len(all_issues) >= max_results:
-                    all_issues = all_issues[:max_results]
-                    break
-                
-                if len(all_issues) >= total:
+                data = BULK_CHANGELOG_DECODER.decode(response.content)
+                for changelog in data.get('issueChangeLogs', []):
+                    histories.setdefault(str(changelog['issueId']), []).extend(changelog.get('changeHistories', []))
+                if not data.get('nextPageToken'):
                     break
+                payload['nextPageToken'] = data['nextPageToken']
+        return histories
+    
+    def complete_changelogs(self, issues: List[Dict], executor: Optional[ThreadPoolExecutor] = None) -> List[Dict]:
+        truncated = [issue for issue in issues if self._changelog_truncated(issue)]
+        if not truncated:
+            return issues
+        
+        if self._bulk_changelogs and self.is_cloud:
+            histories = self._bulk_fetch_changelogs(truncated)
+            if histories is not None:
+                for issue in truncated:
+                    if str(issue.get('id')) in histories:
+                        self._set_histories(issue, histories[str(issue['id'])])
+                return issues
+            # bulkfetch недоступен: дальше по одной задаче
+            self._bulk_changelogs = False
+        
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return self.complete_changelogs(issues, executor)
+        
+        full = executor.map(self._fetch_changelog, [issue['key'] for issue in truncated])
+        for issue, histories in zip(truncated, full):
+            if histories is not None:
+                self._set_histories(issue, histories)
+        return issues
+    
+    @staticmethod
+    def _set_histories(issue: Dict, histories: List[Dict]):
+        issue['changelog'] = {
+            'startAt': 0,
+            'maxResults': len(histories),
+            'total': len(histories),
+            'histories': histories
+        }
+    
+    def iter_pages(self, jql_query: str, max_results: Optional[int] = None, expand: Optional[str] = None,
+                   fields: Optional[List[str]] = None) -> Iterator[List[Dict]]:
+        print(f"   JQL: {jql_query}")
+        print(f"   API: v{self.api_version}")
+        print(f"   Fields: {', '.join(fields) if fields else '*all'}")
+        
+        journal = self.journal
+        if journal:
+            journal.begin(journal.key(self.base_url, jql_query.strip(), max_results, expand, fields,
+                                      self.pagination, self.shards))
+        
+        if self.shards > 1:
+            pages = self._iter_sharded_pages(jql_query, max_results, expand, fields)
+        else:
+            pages = self._iter_query_pages(jql_query, max_results, expand, fields)
+        
+        loaded = 0
+        for page in pages:
+            loaded += len(page)
+            yield page
+        print(f"   ✓ Loaded {loaded} issues")
+        if journal:
+            if journal.restored:
+                print(f"   ✓ Resumed {journal.restored} pages from journal")
+            # Выгрузка завершена: следующий запуск начнет с начала
+            journal.finish()
+    
+    def _iter_query_pages(self, jql_query: str, max_results: Optional[int], expand: Optional[str],
+                          fields: Optional[List[str]], workers: Optional[int] = None,
+                          position: Optional[Dict] = None) -> Iterator[List[Dict]]:
+        # position — где остановилась прошлая попытка (loaded, token, last_id); обновляется перед выдачей страницы
+        position = position if position is not None else {}
+        if self.pagination == 'cursor':
+            return self._iter_cursor_pages(jql_query, max_results, expand, fields, position)
+        return self._iter_offset_pages(jql_query, max_results, expand, fields, workers or self.max_workers, position)
+    
+    def _iter_offset_pages(self, jql_query: str, max_results: Optional[int], expand: Optional[str],
+                           fields: Optional[List[str]], workers: int, position: Dict) -> Iterator[List[Dict]]:
+        batch_size = min(50, max_results) if max_results else 50
+        start = position.get('loaded', 0)
+        
+        # Первая страница сообщает total и реальный размер страницы на сервере
+        data = self._fetch_page(jql_query, start, batch_size, expand, fields)
+        first_page = data.get('issues', [])[:max_results]
+        total = max(0, data.get('total', 0) - start)
+        with_changelog = bool(expand) and 'changelog' in expand
+        if max_results:
+            total = min(total, max_results)
+        
+        loaded = len(first_page)
+        page_size = loaded
+        offsets = iter(range(start + page_size, start + total, page_size) if first_page else ())
+        # Окно ограничивает число страниц в памяти, пока потребитель их не забрал
+        window = workers * 2
+        
+        # Страницы и полные changelog грузит один пул: параллельных запросов не больше workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(
+                executor.submit(self._fetch_page_issues, jql_query, offset, page_size, expand, fields)
+                for offset in islice(offsets, window)
+            )
+            try:
+                if first_page:
+                    first_page = self.complete_changelogs(first_page, executor) if with_changelog else first_page
+                    position['loaded'] = start + loaded
+                    yield first_page
                 
-                start_at += batch_size
-                time.sleep(0.5)
-                
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"Network error: {e}")
+                while pending:
+                    page = pending.popleft().result()
+                    next_offset = next(offsets, None)
+                    if next_offset is not None:
+                        pending.append(executor.submit(
+                            self._fetch_page_issues, jql_query, next_offset, page_size, expand, fields
+                        ))
+                    
+                    page = page[:total - loaded]
+                    if not page:
+                        continue
+                    page = self.complete_changelogs(page, executor) if with_changelog else page
+                    loaded += len(page)
+                    position['loaded'] = start + loaded
+                    if self.shards <= 1:
+                        print(f"   → {loaded}/{total}", end='\r')
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def _shard_queries(self, jql_query: str, max_results: Optional[int]) -> List[str]:
+        # Границы окон делят диапазон created поровну; крайние окна открыты, чтобы не потерять задачи на краях
+        base = ORDER_BY_RE.sub('', jql_query.strip())
+        data = self._fetch_page(f'{base} ORDER BY created ASC', 0, 1, None, ['created'])
+        if max_results and data.get('total', 0) > max_results:
+            # Первые max_results задач по сортировке запроса окнами по created не собрать — один запрос
+            print(f"   Shards: off, {data.get('total', 0)} issues above max_results")
+            return [jql_query]
+        oldest = data.get('issues', [])
+        newest = self._fetch_page_issues(f'{base} ORDER BY created DESC', 0, 1, None, ['created'])
+        if not oldest or not newest:
+            return [jql_query]
+        
+        first = parse_jira_datetime(oldest[0]['fields']['created'])
+        last = parse_jira_datetime(newest[0]['fields']['created'])
+        if last <= first:
+            return [jql_query]
+        step = (last - first) / self.shards
+        boundaries = []
+        for i in range(1, self.shards):
+            # Границы всегда в UTC. JIRA читает дату в JQL в часовом поясе профиля пользователя:
+            # окна сдвигаются на его смещение, но по-прежнему не пересекаются и покрывают весь диапазон
+            boundary = (first + step * i).astimezone(timezone.utc).strftime('%Y/%m/%d %H:%M')
+            if boundary not in boundaries:
+                boundaries.append(boundary)
+        return build_shard_jql(jql_query, boundaries)
+    
+    @staticmethod
+    def _put_page(pages: Queue, page: Optional[List[Dict]], stop: threading.Event) -> bool:
+        # Ждет места в очереди, пока потребитель не остановил выгрузку
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def _fetch_shard(self, jql_query: str, max_results: Optional[int], expand: Optional[str],
+                     fields: Optional[List[str]], pages: Queue, stop: threading.Event):
+        # Страницы шарда сразу уходят в очередь; упавший шард продолжается с последней полученной страницы,
+        # остальные шарды при этом не трогаются. None в очереди — шард закончен (или упал, см. future)
+        limiter = self.rate_limiter
+        position = {}
+        attempt = 0
+        try:
+            while True:
+                remaining = max_results - position.get('loaded', 0) if max_results else None
+                if remaining is not None and remaining <= 0:
+                    return
+                try:
+                    for page in self._iter_query_pages(jql_query, remaining, expand, fields, workers=1,
+                                                       position=position):
+                        if not self._put_page(pages, page, stop):
+                            return
+                    return
+                except Exception:
+                    if attempt >= SHARD_RETRIES or stop.is_set():
+                        raise
+                    time.sleep(random.uniform(0, min(limiter.backoff_max, limiter.backoff_base * 2 ** attempt)))
+                    attempt += 1
+        finally:
+            self._put_page(pages, None, stop)
+    
+    def _iter_sharded_pages(self, jql_query: str, max_results: Optional[int], expand: Optional[str],
+                            fields: Optional[List[str]]) -> Iterator[List[Dict]]:
+        queries = self._shard_queries(jql_query, max_results)
+        if len(queries) == 1:
+            yield from self._iter_query_pages(queries[0], max_results, expand, fields)
+            return
+        print(f"   Shards: {len(queries)}")
         
-        print(f"   ✓ Loaded {len(all_issues)} issues")
-        return all_issues
+        seen = set()
+        loaded = 0
+        stop = threading.Event()
+        queues = [Queue(maxsize=SHARD_QUEUE_PAGES) for _ in queries]
+        # Внутри шарда страницы идут по одной: параллельность — между шардами, не больше max_workers.
+        # Страницы выдаются в порядке шардов; следующие шарды держат в памяти не больше SHARD_QUEUE_PAGES страниц
+        with ThreadPoolExecutor(max_workers=min(len(queries), self.max_workers)) as executor:
+            futures = [
+                executor.submit(self._fetch_shard, query, max_results, expand, fields, pages, stop)
+                for query, pages in zip(queries, queues)
+            ]
+            try:
+                for done, (future, pages) in enumerate(zip(futures, queues), 1):
+                    for shard_page in iter(pages.get, None):
+                        page = []
+                        for issue in shard_page:
+                            issue_id = issue.get('id') or issue['key']
+                            if issue_id not in seen:
+                                seen.add(issue_id)
+                                page.append(issue)
+                        if max_results:
+                            page = page[:max_results - loaded]
+                        
+                        loaded += len(page)
+                        print(f"   → shard {done}/{len(queries)}: {loaded}", end='\r')
+                        if page:
+                            yield page
+                        # Лимит набран: остальные шарды останавливаются
+                        if max_results and loaded >= max_results:
+                            return
+                    future.result()
+            finally:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+    
+    def _iter_cursor_pages(self, jql_query: str, max_results: Optional[int], expand: Optional[str],
+                           fields: Optional[List[str]], position: Dict) -> Iterator[List[Dict]]:
+        # Страницы идут строго по очереди, зато сервер не пересчитывает глубокий startAt на каждой
+        batch_size = min(50, max_results) if max_results else 50
+        with_changelog = bool(expand) and 'changelog' in expand
+        keyset = not self.is_cloud
+        loaded = 0
+        token = position.get('token')
+        last_id = position.get('last_id')
+        
+        while not max_results or loaded < max_results:
+            size = min(batch_size, max_results - loaded) if max_results else batch_size
+            if keyset:
+                data = self._fetch_page(build_keyset_jql(jql_query, last_id), 0, size, expand, fields)
+            else:
+                data = self._fetch_jql_page(jql_query, token, size, expand, fields)
+            page = data.get('issues', [])[:size]
+            if not page:
+                return
+            
+            page = self.complete_changelogs(page) if with_changelog else page
+            if keyset:
+                # total в keyset-запросе — сколько задач осталось после last_id
+                last = len(page) >= data.get('total', 0)
+                last_id = page[-1]['id']
+            else:
+                token = data.get('nextPageToken')
+                last = not token or data.get('isLast')
+            
+            loaded += len(page)
+            position.update(loaded=position.get('loaded', 0) + len(page), token=token, last_id=last_id)
+            if self.shards <= 1:
+                print(f"   → {loaded}", end='\r')
+            yield page
+            if last:
+                return
+    
+    def iter_issues(self, jql_query: str, max_results: Optional[int] = None, expand: Optional[str] = None,
+                    fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        for page in self.iter_pages(jql_query, max_results, expand, fields):
+            yield from page
+    
+    def fetch_issues(self, jql_query: str, max_results: Optional[int] = None, expand: Optional[str] = None,
+                     fields: Optional[List[str]] = None) -> List[Dict]:
+        return list(self.iter_issues(jql_query, max_results, expand, fields))
     
     def test_connection(self) -> bool:
         try:
             url = f"{self.base_url}/rest/api/{self.api_version}/serverInfo"
-            return requests.get(url, auth=self.auth, headers=self.headers, timeout=10).status_code == 200
+            return self._get(url, timeout=10).status_code == 200
         except:
             return False
+
+
+def build_keyset_jql(jql: str, last_id: Optional[str] = None) -> str:
+    # Keyset-пагинация для JIRA Server: сортировка по id и продолжение после последней полученной задачи
+    base = ORDER_BY_RE.sub('', jql.strip())
+    if last_id is not None:
+        base = f'({base}) AND id > {int(last_id)}'
+    return f'{base} ORDER BY id ASC'
+
+
+def build_shard_jql(jql: str, boundaries: List[str]) -> List[str]:
+    # Непересекающиеся окна [b_i, b_i+1) по created; исходная сортировка сохраняется внутри каждого окна
+    order = ORDER_BY_RE.search(jql.strip())
+    base = ORDER_BY_RE.sub('', jql.strip())
+    suffix = order.group(0) if order else ''
+    if not boundaries:
+        return [jql.strip()]
+    
+    windows = [f'created < "{boundaries[0]}"']
+    windows += [f'created >= "{low}" AND created < "{high}"' for low, high in zip(boundaries, boundaries[1:])]
+    windows.append(f'created >= "{boundaries[-1]}"')
+    return [f'({base}) AND {window}{suffix}' for window in windows]
\ No newline at end of file
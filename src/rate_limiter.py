@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    _registry: Dict[str, 'RateLimiter'] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, requests_per_second: float = 10.0, burst: int = 10, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self._lock = threading.Lock()
+        self._tokens = float(max(1, burst))
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.configure(requests_per_second, burst, max_retries, backoff_base, backoff_max)
+    
+    def configure(self, requests_per_second: float = 10.0, burst: int = 10, max_retries: int = 5,
+                  backoff_base: float = 1.0, backoff_max: float = 60.0):
+        # Новые настройки применяются к уже работающему бакету: накопленные токены и блокировка сохраняются
+        with self._lock:
+            self.settings = {'requests_per_second': requests_per_second, 'burst': burst, 'max_retries': max_retries,
+                             'backoff_base': backoff_base, 'backoff_max': backoff_max}
+            self.max_rate = float(requests_per_second)
+            self.rate = self.max_rate
+            self.capacity = max(1, burst)
+            self.max_retries = max_retries
+            self.backoff_base = backoff_base
+            self.backoff_max = backoff_max
+            self._tokens = min(self._tokens, float(self.capacity))
+    
+    @classmethod
+    def for_url(cls, base_url: str, **settings) -> 'RateLimiter':
+        # Один лимитер на сервер: все клиенты и воркеры к одному хосту делят бюджет запросов.
+        # Клиент с другими настройками перенастраивает общий лимитер — действуют последние заданные
+        host = urlparse(base_url).netloc or base_url
+        with cls._registry_lock:
+            limiter = cls._registry.get(host)
+            if limiter is None:
+                limiter = cls._registry[host] = cls(**settings)
+            else:
+                requested = dict(cls().settings, **settings)
+                if requested != limiter.settings:
+                    print(f"⚠️  Rate limit for {host} changed: {limiter.settings} -> {requested}")
+                    limiter.configure(**requested)
+            return limiter
+    
+    @classmethod
+    def reset_registry(cls):
+        # Забыть лимитеры всех серверов (тесты, повторный запуск в том же процессе)
+        with cls._registry_lock:
+            cls._registry.clear()
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def update_from_headers(self, headers):
+        remaining = _to_float(headers.get('X-RateLimit-Remaining'))
+        fill_rate = _to_float(headers.get('X-RateLimit-FillRate'))
+        interval = _to_float(headers.get('X-RateLimit-Interval-Seconds'))
+        reset = _parse_reset(headers.get('X-RateLimit-Reset'))
+        
+        with self._lock:
+            if fill_rate and interval:
+                self.max_rate = fill_rate / interval
+                self.rate = min(self.rate, self.max_rate)
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+                if remaining <= 0 and reset:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + reset)
+    
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+    
+    def on_throttled(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        with self._lock:
+            self.rate = max(self.max_rate * 0.05, self.rate / 2)
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    if isinstance(value, str):
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _parse_reset(value) -> Optional[float]:
+    # Jira Cloud отдает X-RateLimit-Reset как ISO-время, другие прокси — как секунды
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    if isinstance(value, str):
+        try:
+            reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _to_float(value) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
\ No newline at end of file
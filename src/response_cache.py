@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ResponseCache:
+    # Дисковый кэш страниц /search: тело хранится сжатым, устаревшие записи перепроверяются по ETag,
+    # при превышении лимита размера вытесняются давно не читавшиеся (LRU)
+    
+    def __init__(self, path: str, ttl: float = 3600, max_bytes: int = 256 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Страницы читаются и пишутся из потоков iter_pages, доступ к соединению сериализуется локом
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+        """)
+    
+    @staticmethod
+    def key(base_url: str, api_version: str, jql: str, start_at: int, max_results: int,
+            fields: Optional[List[str]] = None, expand: Optional[str] = None) -> str:
+        # maxResults тоже в ключе: от него зависит состав страницы с тем же startAt
+        parts = [base_url.rstrip('/'), api_version, jql.strip(), start_at, max_results,
+                 ','.join(fields) if fields else '*all', expand or '']
+        return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str, decode: Callable[[bytes], Dict] = json.loads) -> Optional[Tuple[Dict, Dict[str, str], bool]]:
+        # Возвращает (payload, заголовки для условного запроса, свежая ли запись); тело хранится как пришло от сервера
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT etag, last_modified, stored_at, body FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        
+        etag, last_modified, stored_at, body = row
+        validators = {}
+        if etag:
+            validators['If-None-Match'] = etag
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+        fresh = time.time() - stored_at < self.ttl
+        return decode(zlib.decompress(body)), validators, fresh
+    
+    def put(self, key: str, content: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        body = zlib.compress(content, 6)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, stored_at, accessed_at, size, body) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, now, now, len(body), body)
+            )
+            self._evict()
+    
+    def touch(self, key: str):
+        # Ответ 304: содержимое не изменилось, срок жизни записи начинается заново
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?', (now, now, key))
+    
+    def _evict(self):
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self.conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.conn.executemany('DELETE FROM responses WHERE key = ?', stale)
+    
+    def size(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+    
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM responses')
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ServerInfoStore:
+    # Результат проверки serverInfo по base_url: версия REST API, тип развертывания (Server/Cloud) и сборка.
+    # Хранится отдельно от кэша страниц: тип развертывания известен и при выключенном кэше, и при заданной версии
+    
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS server_info (
+                base_url TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                deployment_type TEXT,
+                build TEXT,
+                checked_at REAL NOT NULL
+            );
+        """)
+    
+    def get(self, base_url: str, max_age: float) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT version, deployment_type, build, checked_at FROM server_info WHERE base_url = ?',
+                (base_url.rstrip('/'),)
+            ).fetchone()
+        if row is None or time.time() - row[3] >= max_age:
+            return None
+        return {'version': row[0], 'deployment_type': row[1], 'build': row[2], 'checked_at': row[3]}
+    
+    def put(self, base_url: str, version: str, deployment_type: Optional[str] = None, build: Optional[str] = None):
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO server_info (base_url, version, deployment_type, build, checked_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (base_url.rstrip('/'), version, deployment_type, build, time.time())
+            )
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
\ No newline at end of file
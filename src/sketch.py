@@ -0,0 +1,129 @@
+import math
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class TDigest:
+    # Сливающий t-digest: отсортированные центроиды (среднее, вес), мелкие на хвостах и крупные в середине.
+    # Память O(compression) независимо от числа значений; дайджесты с шардов и прошлых прогонов складываются через merge
+    
+    def __init__(self, compression: float = 500, buffer_size: Optional[int] = None):
+        self.compression = compression
+        self.buffer_size = buffer_size or int(compression * 5)
+        self.means = np.empty(0, dtype=float)
+        self.weights = np.empty(0, dtype=float)
+        self._buffer: List[float] = []
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def add(self, value: float):
+        self._buffer.append(value)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._buffer) >= self.buffer_size:
+            self._compress()
+    
+    def extend(self, values: Iterable[float]) -> 'TDigest':
+        # То же, что add по одному значению (сжатие в тех же точках, тот же дайджест), но без вызова на значение
+        values = list(values)
+        start = 0
+        while start < len(values):
+            part = values[start:start + self.buffer_size - len(self._buffer)]
+            start += len(part)
+            self._buffer.extend(part)
+            self.count += len(part)
+            low, high = min(part), max(part)
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+            if len(self._buffer) >= self.buffer_size:
+                self._compress()
+        return self
+    
+    def update(self, values: Iterable[float]) -> 'TDigest':
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float)
+        if not len(values):
+            return self
+        self.count += len(values)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self._compress(values, np.ones(len(values)))
+        return self
+    
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        other._compress()
+        if not other.count:
+            return self
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress(other.means, other.weights)
+        return self
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _compress(self, means: Optional[np.ndarray] = None, weights: Optional[np.ndarray] = None):
+        parts_means = [self.means, np.asarray(self._buffer, dtype=float)]
+        parts_weights = [self.weights, np.ones(len(self._buffer))]
+        if means is not None:
+            parts_means.append(means)
+            parts_weights.append(weights)
+        self._buffer = []
+        
+        means = np.concatenate(parts_means)
+        weights = np.concatenate(parts_weights)
+        if not len(means):
+            return
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        
+        # Шкала k2: k(q) = δ / (4·ln(n/δ) + 24) · ln(q / (1 - q)); точки с одной целой частью k сливаются в центроид.
+        # На хвостах она мельче k1 (asin): на длинном хвосте длительностей p99.9 держится в пределах ~1%
+        total = weights.sum()
+        q = np.clip((np.cumsum(weights) - weights / 2) / total, 1e-15, 1 - 1e-15)
+        normalizer = 4 * math.log(max(total, self.compression) / self.compression) + 24
+        k = self.compression / normalizer * np.log(q / (1 - q))
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+        
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+    
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if not self.count:
+            return None
+        # Центр центроида лежит на накопленном весе до него + половина собственного веса; между центрами — линейно
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centers, float(self.count)]
+        values = np.r_[self.min, self.means, self.max]
+        return float(np.interp(q * self.count, positions, values))
+    
+    def percentiles(self, quantiles: Iterable[float] = PERCENTILES) -> Dict[str, Optional[float]]:
+        return {f'p{q * 100:g}': self.quantile(q) for q in quantiles}
+    
+    def to_dict(self) -> Dict:
+        self._compress()
+        return {
+            'compression': self.compression,
+            'means': self.means.tolist(),
+            'weights': self.weights.tolist(),
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TDigest':
+        digest = cls(data['compression'])
+        digest.means = np.asarray(data['means'], dtype=float)
+        digest.weights = np.asarray(data['weights'], dtype=float)
+        digest.count = data['count']
+        digest.min = data['min']
+        digest.max = data['max']
+        return digest
\ No newline at end of file
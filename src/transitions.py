@@ -0,0 +1,263 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+try:
+    from .data_processor import JiraDateParser
+    from .dimensions import NO_CODE, Dimension
+except ImportError:
+    from data_processor import JiraDateParser
+    from dimensions import NO_CODE, Dimension
+
+# Нет даты (задача не закрыта) в int64-колонке времени
+NO_TIME = np.iinfo(np.int64).min
+# Нет исходного статуса у задачи
+NO_STATUS = NO_CODE
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+NS_PER_DAY = 86400 * 10 ** 9
+
+# Колонка -> (тип элемента буфера array, dtype numpy)
+COLUMNS = {
+    'status': ('i', np.int32), 'time': ('q', np.int64), 'offsets': ('q', np.int64),
+    'created': ('q', np.int64), 'resolved': ('q', np.int64), 'current': ('i', np.int32),
+    'initial': ('i', np.int32), 'initial_open': ('i', np.int32), 'has_histories': ('b', np.int8),
+}
+
+
+def epoch_ns(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10 ** 9 + delta.microseconds * 1000
+
+
+class TransitionTable:
+    # Переходы статусов всех задач в плоских буферах: коды статусов int32 и время int64 (нс от эпохи, UTC).
+    # Переходы задачи i лежат в [offsets[i], offsets[i + 1]); от changelog остаются только переходы статусов
+    
+    def __init__(self, parser: Optional[JiraDateParser] = None, statuses: Optional[Dimension] = None):
+        self._parse = (parser or JiraDateParser()).parse
+        # Словарь статусов может быть общим с таблицей задач
+        self.statuses = statuses if statuses is not None else Dimension()
+        self._status = array('i')
+        self._time = array('q')
+        self._offsets = array('q', [0])
+        self._created = array('q')
+        self._resolved = array('q')
+        # Текущий статус — для задач без changelog
+        self._current = array('i')
+        # Исходный статус — первый непустой fromString; initial_open считает отсутствующий fromString статусом 'Open'
+        self._initial = array('i')
+        self._initial_open = array('i')
+        self._has_histories = array('b')
+    
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict], parser: Optional[JiraDateParser] = None,
+                    statuses: Optional[Dimension] = None) -> 'TransitionTable':
+        table = cls(parser, statuses)
+        for issue in issues:
+            table.add(issue)
+        return table
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], statuses: Dimension) -> 'TransitionTable':
+        # Таблица из готовых колонок (все из COLUMNS), коды статусов — из statuses
+        table = cls(statuses=statuses)
+        for name, (typecode, dtype) in COLUMNS.items():
+            buffer = array(typecode)
+            buffer.frombytes(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            setattr(table, f'_{name}', buffer)
+        return table
+    
+    def code(self, status: Optional[str]) -> int:
+        return self.statuses.code(status)
+    
+    def _epoch(self, value: Optional[str]) -> int:
+        return epoch_ns(self._parse(value)) if value else NO_TIME
+    
+    def add(self, issue: Dict):
+        fields = issue['fields']
+        self._created.append(self._epoch(fields.get('created')))
+        self._resolved.append(self._epoch(fields.get('resolutiondate')))
+        status = fields.get('status')
+        self._current.append(self.code(status['name']) if status else NO_STATUS)
+        
+        histories = issue.get('changelog', {}).get('histories', [])
+        self._has_histories.append(bool(histories))
+        initial = initial_open = NO_STATUS
+        for history in histories:
+            items = [item for item in history.get('items', []) if item['field'] == 'status']
+            if not items:
+                continue
+            if initial_open == NO_STATUS and ('fromString' not in items[0] or items[0]['fromString']):
+                initial_open = self.code(items[0].get('fromString', 'Open'))
+            if initial == NO_STATUS and items[0].get('fromString'):
+                initial = self.code(items[0]['fromString'])
+            changed = self._epoch(history['created'])
+            for item in items:
+                self._status.append(self.code(item['toString']))
+                self._time.append(changed)
+        self._initial.append(initial)
+        self._initial_open.append(initial_open)
+        self._offsets.append(len(self._status))
+    
+    def __len__(self) -> int:
+        return len(self._status)
+    
+    @property
+    def issue_count(self) -> int:
+        return len(self._created)
+    
+    @property
+    def nbytes(self) -> int:
+        buffers = (self._status, self._time, self._offsets, self._created, self._resolved,
+                   self._current, self._initial, self._initial_open, self._has_histories)
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
+    
+    @property
+    def status(self) -> np.ndarray:
+        return _column(self._status, np.int32)
+    
+    @property
+    def time(self) -> np.ndarray:
+        return _column(self._time, np.int64)
+    
+    @property
+    def offsets(self) -> np.ndarray:
+        return _column(self._offsets, np.int64)
+    
+    @property
+    def issue(self) -> np.ndarray:
+        # Номер задачи для каждого перехода
+        return np.repeat(np.arange(self.issue_count, dtype=np.int64), np.diff(self.offsets))
+    
+    @property
+    def created(self) -> np.ndarray:
+        return _column(self._created, np.int64)
+    
+    @property
+    def resolved(self) -> np.ndarray:
+        return _column(self._resolved, np.int64)
+    
+    @property
+    def current(self) -> np.ndarray:
+        return _column(self._current, np.int32)
+    
+    @property
+    def initial(self) -> np.ndarray:
+        return _column(self._initial, np.int32)
+    
+    @property
+    def initial_open(self) -> np.ndarray:
+        return _column(self._initial_open, np.int32)
+    
+    @property
+    def has_histories(self) -> np.ndarray:
+        return _column(self._has_histories, np.int8).astype(bool)
+    
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: _column(getattr(self, f'_{name}'), dtype) for name, (_, dtype) in COLUMNS.items()}
+    
+    def names(self, codes: np.ndarray) -> np.ndarray:
+        return self.statuses.resolve(codes)
+    
+    def _segments(self, lead: np.ndarray, plain: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Плоская лента записей (задача, статус, начало): lead-статус на дату создания, затем переходы в порядке changelog.
+        # Отрезок длится до следующей записи той же задачи (np.diff), последний — до даты закрытия.
+        # Буфер уже упорядочен по задачам, поэтому пересортировка не нужна
+        has_histories = self.has_histories
+        if plain:
+            # Задачи без changelog — один отрезок в текущем статусе
+            lead = np.where(has_histories, lead, self.current)
+            has_lead = ~has_histories | (lead != NO_STATUS)
+        else:
+            has_lead = has_histories & (lead != NO_STATUS)
+        
+        offsets = self.offsets
+        sizes = np.diff(offsets) + has_lead
+        starts = np.cumsum(sizes) - sizes
+        issue = np.repeat(np.arange(self.issue_count, dtype=np.int64), sizes)
+        status = np.empty(len(issue), dtype=np.int32)
+        time = np.empty(len(issue), dtype=np.int64)
+        
+        lead_issue = np.flatnonzero(has_lead)
+        status[starts[lead_issue]] = lead[lead_issue]
+        time[starts[lead_issue]] = self.created[lead_issue]
+        moved = self.issue
+        position = starts[moved] + has_lead[moved] + np.arange(len(moved)) - offsets[moved]
+        status[position] = self.status
+        time[position] = self.time
+        
+        length = np.zeros(len(issue), dtype=np.int64)
+        same = issue[1:] == issue[:-1]
+        length[:-1][same] = np.diff(time)[same]
+        last = np.ones(len(issue), dtype=bool)
+        last[:-1] = ~same
+        resolved = self.resolved[issue]
+        closed = last & (resolved != NO_TIME)
+        length[closed] = resolved[closed] - time[closed]
+        
+        keep = ~last | closed
+        issue = issue[keep]
+        return issue, status[keep], length[keep], has_histories[issue]
+    
+    def _status_segments(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Отрицательные отрезки (changelog не по порядку) отбрасываются, у задач без changelog — остаются
+        issue, status, length, checked = self._segments(self.initial_open, plain=True)
+        keep = ~checked | (length >= 0)
+        return issue[keep], status[keep], length[keep]
+    
+    def status_durations(self) -> Dict[Optional[str], List[int]]:
+        # Дни по каждому статусу; статусы и значения в порядке построчного подсчета
+        _, status, length = self._status_segments()
+        return _group_lists(self.statuses.resolve, status, np.floor_divide(length, NS_PER_DAY))
+    
+    def status_hours(self) -> np.ndarray:
+        # Матрица задача x код статуса: суммарные часы с точностью до наносекунды
+        issue, status, length = self._status_segments()
+        width = len(self.statuses) + 1
+        # Задачи без статуса попадают в последний столбец
+        cells = issue * width + np.where(status == NO_STATUS, width - 1, status)
+        hours = np.bincount(cells, weights=_hours(length), minlength=self.issue_count * width)
+        return hours.reshape(self.issue_count, width)[:, :-1]
+    
+    def time_in_progress(self) -> List[float]:
+        # Часы в первом встреченном статусе с 'progress' в названии, по закрытым задачам с changelog
+        eligible = self.has_histories & (self.resolved != NO_TIME)
+        issue, status, length, _ = self._segments(np.where(eligible, self.initial, NO_STATUS), plain=False)
+        progress = np.array([bool(label) and 'progress' in label.lower() for label in self.statuses.labels] + [False])
+        keep = eligible[issue] & progress[status]
+        issue, status, hours = issue[keep], status[keep], _hours(length[keep])
+        if not len(issue):
+            return []
+        
+        starts = np.flatnonzero(np.r_[True, issue[1:] != issue[:-1]])
+        target = np.repeat(status[starts], np.diff(np.r_[starts, len(issue)]))
+        match = status == target
+        issue, hours = issue[match], hours[match]
+        # bincount складывает значения группы по порядку, как построчный подсчет (reduceat дает другое округление)
+        group = np.cumsum(np.r_[True, issue[1:] != issue[:-1]]) - 1
+        return np.bincount(group, weights=hours).tolist()
+
+
+def _hours(length: np.ndarray) -> np.ndarray:
+    # Как timedelta.total_seconds() / 3600: секунды из целых микросекунд, затем часы
+    return (length // 1000) / 10 ** 6 / 3600
+
+
+def _group_lists(resolve, codes: np.ndarray, values: np.ndarray) -> Dict[Optional[str], List[int]]:
+    # Группы по коду в порядке первого появления кода; внутри группы — исходный порядок значений
+    if not len(codes):
+        return {}
+    order = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    groups = np.split(values[order], bounds)
+    unique, first = np.unique(codes, return_index=True)
+    labels = resolve(unique)
+    return {labels[i]: groups[i].tolist() for i in np.argsort(first)}
+
+
+def _column(buffer: array, dtype) -> np.ndarray:
+    # Копия, а не представление: пока numpy держит буфер, array нельзя дополнить
+    return np.frombuffer(buffer, dtype=dtype).copy() if buffer else np.empty(0, dtype=dtype)
\ No newline at end of file
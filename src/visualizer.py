@@ -1,63 +1,122 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import pandas as pd
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Dict, Union
 import os
 
+try:
+    from .histogram import Histogram
+except ImportError:
+    from histogram import Histogram
+
+
+PERIOD_LABELS = {'day': 'по дням', 'week': 'по неделям', 'month': 'по месяцам'}
+
 
 class Visualizer:
     
+    # Анализ -> метод построения графика
+    PLOTTERS = {
+        'open_time': 'plot_open_time_histogram',
+        'status_durations': 'plot_status_durations',
+        'daily_stats': 'plot_daily_stats',
+        'user_stats': 'plot_user_stats',
+        'time_in_progress': 'plot_time_in_progress_histogram',
+        'priority_distribution': 'plot_priority_distribution',
+    }
+    
     def __init__(self, output_dir: str = 'output'):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
     
-    def plot_open_time_histogram(self, open_times: List[int]):
-        plt.figure(figsize=(12, 6))
-        plt.hist(open_times, bins=50, edgecolor='black', color='hotpink')
-        plt.xlabel('Время в открытом состоянии (дни)')
-        plt.ylabel('Количество задач')
-        plt.title('Распределение задач по времени в открытом состоянии')
-        plt.grid(True, alpha=0.3)
-        plt.savefig(f'{self.output_dir}/1_open_time_histogram.png', dpi=300, bbox_inches='tight')
-        plt.close()
+    def render_all(self, results: Dict[str, Any], workers: int = 1):
+        # Графики строятся через объектный API Figure без глобального состояния pyplot,
+        # поэтому их можно безопасно рисовать в отдельных процессах
+        if workers <= 1 or len(results) <= 1:
+            for name, result in results.items():
+                getattr(self, self.PLOTTERS[name])(result)
+            return
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(results))) as executor:
+            futures = [
+                executor.submit(_render, self.output_dir, self.PLOTTERS[name], result)
+                for name, result in results.items()
+            ]
+            for future in futures:
+                future.result()
+    
+    def _save(self, fig: Figure, filename: str):
+        fig.savefig(f'{self.output_dir}/{filename}', dpi=300, bbox_inches='tight')
+    
+    @staticmethod
+    def _hist(ax, values: Union[List[float], Histogram], bins: int, **style):
+        # Готовая гистограмма рисуется по своим корзинам (укрупненным до bins) без сырых значений
+        if isinstance(values, Histogram):
+            coarse = values.coarsen(bins)
+            edges, counts = coarse.bins()
+            if len(counts):
+                ax.hist(edges[:-1], bins=edges, weights=counts, **style)
+            if values.log:
+                ax.set_xscale('log')
+                if values.zeros:
+                    # Значения <= 0 (закрыто в тот же день) на лог-шкале не видны: отдельный столбец левее корзин
+                    step = 10 ** (1 / coarse.bins_per_decade)
+                    right = edges[0] if len(edges) else 1.0
+                    ax.bar(right / step, values.zeros, width=right - right / step, align='edge', hatch='//',
+                           label=f'≤ 0: {values.zeros}', **style)
+                    ax.legend()
+        else:
+            ax.hist(values, bins=bins, **style)
+    
+    def _save_placeholder(self, text: str, filename: str):
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        ax.text(0.5, 0.5, text, ha='center', va='center', fontsize=14)
+        ax.axis('off')
+        self._save(fig, filename)
     
-    def plot_status_durations(self, status_durations: Dict[str, List[int]]):
+    def plot_open_time_histogram(self, open_times: Union[List[int], Histogram]):
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        self._hist(ax, open_times, 50, edgecolor='black', color='hotpink')
+        ax.set_xlabel('Время в открытом состоянии (дни)')
+        ax.set_ylabel('Количество задач')
+        ax.set_title('Распределение задач по времени в открытом состоянии')
+        ax.grid(True, alpha=0.3)
+        self._save(fig, '1_open_time_histogram.png')
+    
+    def plot_status_durations(self, status_durations: Dict[str, Union[List[int], Histogram]]):
         if not status_durations:
             print("⚠️  Нет данных о статусах")
-            plt.figure(figsize=(12, 6))
-            plt.text(0.5, 0.5, 'Нет данных о длительности статусов\n(требуется changelog)', 
-                     ha='center', va='center', fontsize=14)
-            plt.axis('off')
-            plt.savefig(f'{self.output_dir}/2_status_durations.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            self._save_placeholder('Нет данных о длительности статусов\n(требуется changelog)', '2_status_durations.png')
             return
         
         num_statuses = len(status_durations)
-        fig, axes = plt.subplots(num_statuses, 1, figsize=(12, 4 * num_statuses))
+        fig = Figure(figsize=(12, 4 * num_statuses))
+        axes = fig.subplots(num_statuses, 1)
         if num_statuses == 1:
             axes = [axes]
         
         for ax, (status, durations) in zip(axes, status_durations.items()):
             if durations:
-                ax.hist(durations, bins=30, edgecolor='black', color='hotpink')
+                self._hist(ax, durations, 30, edgecolor='black', color='hotpink')
                 ax.set_xlabel('Время в статусе (дни)')
                 ax.set_ylabel('Количество задач')
                 ax.set_title(f'Распределение времени в статусе: {status}')
                 ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/2_status_durations.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._save(fig, '2_status_durations.png')
     
     def plot_daily_stats(self, df: pd.DataFrame):
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+        fig = Figure(figsize=(14, 10))
+        ax1, ax2 = fig.subplots(2, 1)
         
         ax1.plot(df['date'], df['created'], label='Созданные', marker='o', markersize=2, color='hotpink')
         ax1.plot(df['date'], df['closed'], label='Закрытые', marker='o', markersize=2, color='skyblue')
         ax1.set_xlabel('Дата')
         ax1.set_ylabel('Количество задач')
-        ax1.set_title('Созданные и закрытые задачи по дням')
+        ax1.set_title(f"Созданные и закрытые задачи {PERIOD_LABELS.get(df.attrs.get('period'), 'по дням')}")
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
@@ -69,76 +128,82 @@ class Visualizer:
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/3_daily_stats.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._save(fig, '3_daily_stats.png')
     
     def plot_user_stats(self, df: pd.DataFrame):
-        plt.figure(figsize=(12, 10))
-        plt.barh(df['user'], df['count'], color='hotpink', edgecolor='black')
-        plt.xlabel('Количество задач')
-        plt.ylabel('Пользователь')
-        plt.title('Топ-30 пользователей по количеству задач')
-        plt.gca().invert_yaxis()
-        plt.grid(True, alpha=0.3, axis='x')
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/4_user_stats.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig = Figure(figsize=(12, 10))
+        ax = fig.add_subplot()
+        ax.barh(df['user'], df['count'], color='hotpink', edgecolor='black')
+        ax.set_xlabel('Количество задач')
+        ax.set_ylabel('Пользователь')
+        ax.set_title('Топ-30 пользователей по количеству задач')
+        ax.invert_yaxis()
+        ax.grid(True, alpha=0.3, axis='x')
+        fig.tight_layout()
+        self._save(fig, '4_user_stats.png')
     
-    def plot_time_in_progress_histogram(self, time_in_progress: List[float]):
+    def plot_time_in_progress_histogram(self, time_in_progress: Union[List[float], Histogram]):
         if not time_in_progress:
             print("⚠️  Нет данных о времени в In Progress")
-            plt.figure(figsize=(12, 6))
-            plt.text(0.5, 0.5, 'Нет данных о времени в статусе In Progress\n(требуется changelog)', 
-                     ha='center', va='center', fontsize=14)
-            plt.axis('off')
-            plt.savefig(f'{self.output_dir}/5_time_in_progress_histogram.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            self._save_placeholder('Нет данных о времени в статусе In Progress\n(требуется changelog)',
+                                   '5_time_in_progress_histogram.png')
             return
         
-        print(f"📊 График In Progress: {len(time_in_progress)} задач")
+        total = len(time_in_progress)
+        if isinstance(time_in_progress, Histogram):
+            avg_time = time_in_progress.mean
+            median_time = time_in_progress.quantile(0.5)
+            min_time, max_time = time_in_progress.min, time_in_progress.max
+        else:
+            avg_time = sum(time_in_progress) / total
+            median_time = sorted(time_in_progress)[total // 2]
+            min_time, max_time = min(time_in_progress), max(time_in_progress)
         
-        plt.figure(figsize=(12, 6))
-        num_bins = min(50, max(10, len(time_in_progress) // 10))
-        plt.hist(time_in_progress, bins=num_bins, edgecolor='black', alpha=0.7, color='hotpink')
+        print(f"📊 График In Progress: {total} задач")
         
-        plt.xlabel('Время в статусе In Progress (часы)')
-        plt.ylabel('Количество задач')
-        plt.title(f'Распределение задач по времени в статусе In Progress\n(всего {len(time_in_progress)} задач)')
-        plt.grid(True, alpha=0.3)
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        num_bins = min(50, max(10, total // 10))
+        self._hist(ax, time_in_progress, num_bins, edgecolor='black', alpha=0.7, color='hotpink')
         
-        avg_time = sum(time_in_progress) / len(time_in_progress)
-        median_time = sorted(time_in_progress)[len(time_in_progress) // 2]
+        ax.set_xlabel('Время в статусе In Progress (часы)')
+        ax.set_ylabel('Количество задач')
+        ax.set_title(f'Распределение задач по времени в статусе In Progress\n(всего {total} задач)')
+        ax.grid(True, alpha=0.3)
         
-        plt.axvline(avg_time, color='red', linestyle='--', linewidth=2, 
+        ax.axvline(avg_time, color='red', linestyle='--', linewidth=2,
                    label=f'Среднее: {avg_time:.1f}ч ({avg_time/24:.1f} дней)')
-        plt.axvline(median_time, color='green', linestyle='--', linewidth=2, 
+        ax.axvline(median_time, color='green', linestyle='--', linewidth=2,
                    label=f'Медиана: {median_time:.1f}ч ({median_time/24:.1f} дней)')
-        plt.legend()
+        ax.legend()
         
-        stats_text = f'Min: {min(time_in_progress):.1f}ч\nMax: {max(time_in_progress):.1f}ч'
-        plt.text(0.98, 0.98, stats_text, transform=plt.gca().transAxes, 
-                 verticalalignment='top', horizontalalignment='right',
-                 bbox=dict(boxstyle='round', facecolor='pink', alpha=0.5))
+        stats_text = f'Min: {min_time:.1f}ч\nMax: {max_time:.1f}ч'
+        ax.text(0.98, 0.98, stats_text, transform=ax.transAxes,
+                verticalalignment='top', horizontalalignment='right',
+                bbox=dict(boxstyle='round', facecolor='pink', alpha=0.5))
         
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/5_time_in_progress_histogram.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        self._save(fig, '5_time_in_progress_histogram.png')
         
         print(f"   ✓ Среднее: {avg_time:.1f}ч ({avg_time/24:.1f} дней)")
         print(f"   ✓ Медиана: {median_time:.1f}ч ({median_time/24:.1f} дней)")
     
     def plot_priority_distribution(self, priority_counts: Dict[str, int]):
-        plt.figure(figsize=(10, 6))
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         priorities = list(priority_counts.keys())
         counts = list(priority_counts.values())
         
-        plt.bar(priorities, counts, edgecolor='black', color='hotpink')
-        plt.xlabel('Приоритет')
-        plt.ylabel('Количество задач')
-        plt.title('Распределение задач по приоритету')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3, axis='y')
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/6_priority_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        ax.bar(priorities, counts, edgecolor='black', color='hotpink')
+        ax.set_xlabel('Приоритет')
+        ax.set_ylabel('Количество задач')
+        ax.set_title('Распределение задач по приоритету')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3, axis='y')
+        fig.tight_layout()
+        self._save(fig, '6_priority_distribution.png')
+
+
+def _render(output_dir: str, method: str, data: Any):
+    getattr(Visualizer(output_dir), method)(data)
\ No newline at end of file
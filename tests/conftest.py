@@ -1,11 +1,28 @@
 import pytest
 import sys
 import os
+import json
+import hashlib
+import re
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
 # Добавляем src в path (абсолютный путь)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 
+from rate_limiter import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiters():
+    # Лимитеры общие на процесс: каждый тест начинает с пустого реестра
+    RateLimiter.reset_registry()
+    yield
+    RateLimiter.reset_registry()
+
 
 @pytest.fixture
 def sample_issue_resolved():
@@ -127,4 +144,181 @@ def sample_issues_list():
         }
     }
 
-    return [issue1, issue2]
\ No newline at end of file
+    return [issue1, issue2]
+
+
+def make_stub_issue(n):
+    return {
+        'id': str(10000 + n),
+        'key': f'STUB-{n}',
+        'fields': {
+            'created': '2024-01-01T00:00:00.000+0000',
+            'updated': f'2024-02-{n % 28 + 1:02d}T12:00:00.000+0000',
+            'resolutiondate': '2024-01-11T00:00:00.000+0000',
+            'status': {'name': 'Closed'},
+            'assignee': {'displayName': 'Alice'},
+            'reporter': {'displayName': 'Bob'},
+            'priority': {'name': 'Major'},
+        }
+    }
+
+
+class JiraStubHandler(BaseHTTPRequestHandler):
+    """Минимальная имитация JIRA REST API для интеграционных тестов клиента"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        self.server.requests_log.append((parsed.path, query, dict(self.headers)))
+
+        if parsed.path.endswith('/serverInfo'):
+            self._send_json({'version': '9.4.0', 'deploymentType': self.server.deployment_type})
+        elif parsed.path.endswith('/search') and self.server.throttle_responses:
+            status, headers = self.server.throttle_responses.pop(0)
+            self._send_json({'errorMessages': ['Rate limit exceeded']}, status=status, headers=headers)
+        elif parsed.path.endswith('/search/jql'):
+            # Jira Cloud: курсор nextPageToken вместо startAt, total не сообщается
+            start_at = int(query.get('nextPageToken', ['0'])[0])
+            max_results = min(int(query.get('maxResults', ['50'])[0]), self.server.page_cap)
+            issues = self.server.issues[start_at:start_at + max_results]
+            payload = {'issues': [self._with_changelog(issue, query) for issue in issues]}
+            if start_at + max_results < len(self.server.issues):
+                payload['nextPageToken'] = str(start_at + max_results)
+            else:
+                payload['isLast'] = True
+            self._send_json(payload)
+        elif parsed.path.endswith('/search'):
+            start_at = int(query.get('startAt', ['0'])[0])
+            max_results = min(int(query.get('maxResults', ['50'])[0]), self.server.page_cap)
+            jql = query.get('jql', [''])[0]
+            # Элемент fail_jql — часть JQL или пара (часть JQL, startAt) для сбоя на конкретной странице
+            failing = [
+                part for part in self.server.fail_jql
+                if (part[0] in jql and int(part[1]) == start_at if isinstance(part, tuple) else part in jql)
+            ]
+            if failing:
+                self.server.fail_jql.remove(failing[0])
+                self._send_json({'errorMessages': ['Internal error']}, status=500)
+                return
+            matched = self._match_jql(jql)
+            page = [self._with_changelog(issue, query) for issue in matched[start_at:start_at + max_results]]
+            payload = {
+                'startAt': start_at,
+                'maxResults': max_results,
+                'total': len(matched),
+                'issues': page
+            }
+            etag = '"%s"' % hashlib.md5(json.dumps(payload).encode('utf-8')).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+            else:
+                self._send_json(payload, headers={'ETag': etag})
+        elif parsed.path.endswith('/changelog') and parsed.path.split('/')[-2] in self.server.changelogs:
+            histories = self.server.changelogs[parsed.path.split('/')[-2]]
+            start_at = int(query.get('startAt', ['0'])[0])
+            max_results = min(int(query.get('maxResults', ['100'])[0]), self.server.changelog_page_cap)
+            values = histories[start_at:start_at + max_results]
+            self._send_json({
+                'startAt': start_at,
+                'maxResults': max_results,
+                'total': len(histories),
+                'isLast': start_at + len(values) >= len(histories),
+                'values': values
+            })
+        else:
+            self._send_json({'errorMessages': ['Not found']}, status=404)
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        self.server.requests_log.append((parsed.path, body, dict(self.headers)))
+
+        if parsed.path.endswith('/changelog/bulkfetch') and self.server.bulk_changelogs:
+            # Записи истории всех запрошенных задач подряд, страницы по bulk_page_cap записей
+            ids = {issue['key']: issue['id'] for issue in self.server.issues}
+            entries = [
+                (ids[key], history)
+                for key in body['issueIdsOrKeys']
+                for history in self.server.changelogs.get(key, [])
+            ]
+            start = int(body.get('nextPageToken') or 0)
+            end = start + self.server.bulk_page_cap
+            changelogs = []
+            for issue_id, history in entries[start:end]:
+                if not changelogs or changelogs[-1]['issueId'] != issue_id:
+                    changelogs.append({'issueId': issue_id, 'changeHistories': []})
+                changelogs[-1]['changeHistories'].append(history)
+            payload = {'issueChangeLogs': changelogs}
+            if end < len(entries):
+                payload['nextPageToken'] = str(end)
+            self._send_json(payload)
+        else:
+            self._send_json({'errorMessages': ['Not found']}, status=404)
+
+    def _match_jql(self, jql):
+        # Понимает только условия, которые строит клиент: id > N, окна по created и ORDER BY created
+        matched = self.server.issues
+        keyset = re.search(r'\bid > (\d+)', jql)
+        if keyset:
+            matched = [issue for issue in matched if int(issue['id']) > int(keyset.group(1))]
+        for op, value in re.findall(r'created (>=|<) "([^"]+)"', jql):
+            bound = datetime.strptime(value, '%Y/%m/%d %H:%M').strftime('%Y-%m-%dT%H:%M')
+            if op == '>=':
+                matched = [issue for issue in matched if issue['fields']['created'][:16] >= bound]
+            else:
+                matched = [issue for issue in matched if issue['fields']['created'][:16] < bound]
+        order = re.search(r'ORDER BY created (ASC|DESC)', jql)
+        if order:
+            matched = sorted(matched, key=lambda issue: issue['fields']['created'], reverse=order.group(1) == 'DESC')
+        return matched
+
+    def _with_changelog(self, issue, query):
+        # Как и JIRA, /search встраивает только первые записи истории, total сообщает полное число
+        histories = self.server.changelogs.get(issue['key'])
+        if histories is None or 'changelog' not in query.get('expand', [''])[0]:
+            return issue
+        limit = self.server.embedded_changelog_limit
+        return dict(issue, changelog={
+            'startAt': 0,
+            'maxResults': limit,
+            'total': len(histories),
+            'histories': histories[:limit]
+        })
+
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def jira_stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JiraStubHandler)
+    server.issues = [make_stub_issue(n) for n in range(1, 231)]
+    server.page_cap = 50
+    server.requests_log = []
+    server.throttle_responses = []
+    server.changelogs = {}
+    server.embedded_changelog_limit = 100
+    server.changelog_page_cap = 100
+    server.deployment_type = 'Server'
+    server.bulk_page_cap = 1000
+    server.bulk_changelogs = True
+    server.fail_jql = []
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
\ No newline at end of file
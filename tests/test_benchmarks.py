@@ -0,0 +1,175 @@
+"""Benchmarks - сравнение скорости оптимизированных путей с исходными"""
+import pytest
+import allure
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from data_processor import parse_jira_datetime, JiraDateParser, JIRA_DATETIME_FORMAT, MetricsEngine
+from dimensions import Dimension
+from transitions import NO_TIME, TransitionTable
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.fixture(scope='module')
+def jira_timestamps():
+    base = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+    unique = [
+        (base + timedelta(minutes=17 * n)).strftime('%Y-%m-%dT%H:%M:%S.') + f'{n % 1000:03d}+0300'
+        for n in range(10000)
+    ]
+    # Каждая метка встречается несколько раз, как created/resolutiondate/changelog в разных метриках
+    return unique * 4
+
+
+@allure.feature('Benchmarks')
+@allure.story('Timestamp Parsing')
+class TestTimestampParsingBenchmark:
+    
+    @allure.title("Test 69: Fast parser beats strptime")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    def test_parse_faster_than_strptime(self, jira_timestamps):
+        """fromisoformat-парсер и мемо заметно быстрее strptime"""
+        baseline = best_of(lambda: [datetime.strptime(v, JIRA_DATETIME_FORMAT) for v in jira_timestamps])
+        fast = best_of(lambda: [parse_jira_datetime(v) for v in jira_timestamps])
+        memo = best_of(lambda: [p.parse(v) for p in [JiraDateParser()] for v in jira_timestamps])
+        
+        allure.attach(
+            f'strptime: {baseline:.3f}s\nfromisoformat: {fast:.3f}s\nmemo: {memo:.3f}s',
+            name='Timings', attachment_type=allure.attachment_type.TEXT
+        )
+        assert fast * 3 < baseline
+        assert memo * 3 < baseline
+
+
+@pytest.fixture(scope='module')
+def million_transitions():
+    # 100 000 задач по 10 переходов, часть не закрыта
+    rng = np.random.default_rng(11)
+    issues, per_issue = 100000, 10
+    statuses = Dimension()
+    for name in ['Open', 'In Progress', 'In Review', 'Blocked', 'Reopened', 'Done']:
+        statuses.code(name)
+    created = rng.integers(0, 365 * 86400, issues) * 10 ** 9
+    steps = rng.integers(60, 20 * 86400, (issues, per_issue)) * 10 ** 9
+    time = (created[:, None] + np.cumsum(steps, axis=1)).ravel()
+    resolved = np.where(rng.random(issues) < 0.8, time[per_issue - 1::per_issue] + 3600 * 10 ** 9, NO_TIME)
+    columns = {
+        'status': rng.integers(0, len(statuses), issues * per_issue),
+        'time': time,
+        'offsets': np.arange(issues + 1) * per_issue,
+        'created': created,
+        'resolved': resolved,
+        'current': np.zeros(issues),
+        'initial': np.zeros(issues),
+        'initial_open': np.zeros(issues),
+        'has_histories': np.ones(issues),
+    }
+    return TransitionTable.from_columns(columns, statuses)
+
+
+def table_issues(table, count):
+    # Первые count задач таблицы в виде ответа JIRA — вход построчных аккумуляторов
+    def stamp(ns):
+        return datetime.fromtimestamp(int(ns) / 10 ** 9, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+    
+    names = table.names(table.status)
+    offsets, time, created, resolved = table.offsets, table.time, table.created, table.resolved
+    issues = []
+    for n in range(count):
+        start, end = offsets[n], offsets[n + 1]
+        histories = [{
+            'created': stamp(time[row]),
+            'items': [{'field': 'status', 'fromString': names[row - 1] if row > start else 'Open',
+                       'toString': names[row]}]
+        } for row in range(start, end)]
+        issues.append({
+            'key': f'TEST-{n}',
+            'fields': {
+                'created': stamp(created[n]),
+                'resolutiondate': stamp(resolved[n]) if resolved[n] != NO_TIME else None,
+                'status': {'name': names[end - 1]},
+            },
+            'changelog': {'histories': histories}
+        })
+    return issues
+
+
+@allure.feature('Benchmarks')
+@allure.story('Status Durations')
+class TestStatusDurationsBenchmark:
+    
+    @allure.title("Test 109: Vectorized durations far faster than row-by-row accumulators")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    def test_million_transitions(self, million_transitions):
+        """Векторный расчет по плоской таблице во много раз быстрее построчного на тех же задачах; 1M переходов считается"""
+        assert len(million_transitions) == 1000000
+        assert sum(map(len, million_transitions.status_durations().values())) > 1000000
+        
+        # Сравнение с исходным построчным расчетом в том же прогоне, а не с абсолютным временем
+        issues = table_issues(million_transitions, 10000)
+        table = TransitionTable.from_issues(issues)
+        baseline = best_of(
+            lambda: MetricsEngine.for_analyses(['status_durations', 'time_in_progress']).consume(issues).results(),
+            repeat=1
+        )
+        durations = best_of(table.status_durations)
+        in_progress = best_of(table.time_in_progress)
+        full = best_of(million_transitions.status_durations, repeat=1)
+        
+        allure.attach(
+            f'accumulators (100k transitions): {baseline:.3f}s\n'
+            f'status_durations: {durations:.3f}s\ntime_in_progress: {in_progress:.3f}s\n'
+            f'status_durations (1M transitions): {full:.3f}s',
+            name='Timings', attachment_type=allure.attachment_type.TEXT
+        )
+        assert (durations + in_progress) * 10 < baseline
+
+def available_cpus():
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+
+@allure.feature('Benchmarks')
+@allure.story('Parallel Processing')
+class TestParallelProcessingBenchmark:
+    
+    @allure.title("Test 130: Parallel streaming pass faster than serial")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    @pytest.mark.skipif(available_cpus() < 4, reason='нужно не меньше 4 процессоров')
+    def test_parallel_faster_than_serial(self, million_transitions):
+        """Расчет порциями в 4 процессах заметно быстрее одного прохода на тех же задачах и дает те же метрики"""
+        issues = table_issues(million_transitions, 50000)
+        analyses = ['open_time', 'status_durations', 'time_in_progress']
+        # Forkserver с numpy и pandas запускается один раз на процесс — прогреваем его до замера
+        MetricsEngine.for_analyses(analyses).consume(issues[:100], workers=2, chunk_size=50)
+        
+        engines = {}
+        
+        def run(workers):
+            engines[workers] = MetricsEngine.for_analyses(analyses).consume(iter(issues), workers=workers)
+        
+        serial = best_of(lambda: run(1), repeat=1)
+        parallel = best_of(lambda: run(4), repeat=1)
+        
+        allure.attach(
+            f'serial: {serial:.3f}s\nworkers=4: {parallel:.3f}s',
+            name='Timings', attachment_type=allure.attachment_type.TEXT
+        )
+        assert engines[4].results()['open_time'] == engines[1].results()['open_time']
+        assert parallel * 1.5 < serial
\ No newline at end of file
@@ -3,11 +3,14 @@ import pytest
 import allure
 import sys
 import os
+import random
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 
-from data_processor import DataProcessor
+from data_processor import DataProcessor, MetricsEngine, Accumulator, JiraDateParser, parse_jira_datetime
+from datetime import datetime, timedelta, timezone
+import pandas as pd
 
 
 @allure.feature('Data Processing')
@@ -177,4 +180,254 @@ class TestTimeInProgress:
         assert isinstance(result, list)
         if len(result) > 0:
             assert all(isinstance(x, (int, float)) for x in result)
-            assert all(x >= 0 for x in result)
\ No newline at end of file
+            assert all(x >= 0 for x in result)
+
+
+@allure.feature('Data Processing')
+@allure.story('Field Projection')
+class TestRequiredFields:
+    
+    @allure.title("Test 58: Fields for all analyses")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_required_fields_all(self):
+        """Минимальный набор полей для всех анализов"""
+        fields = DataProcessor.required_fields()
+        assert sorted(fields) == ['assignee', 'created', 'priority', 'reporter', 'resolutiondate', 'status']
+    
+    @allure.title("Test 59: Fields for selected analyses")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_required_fields_subset(self):
+        """Поля только для выбранных анализов"""
+        assert DataProcessor.required_fields(['priority_distribution']) == ['priority']
+        assert DataProcessor.required_fields(['user_stats', 'open_time']) == ['assignee', 'reporter', 'created', 'resolutiondate']
+    
+    @allure.title("Test 60: Unknown analysis rejected")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.unit
+    def test_required_fields_unknown(self):
+        """Неизвестный анализ вызывает ошибку"""
+        with pytest.raises(ValueError):
+            DataProcessor.required_fields(['velocity'])
+
+
+@allure.feature('Data Processing')
+@allure.story('Single-pass Engine')
+class TestMetricsEngine:
+    
+    @allure.title("Test 66: Engine matches individual methods")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_engine_matches_methods(self, sample_issues_list, sample_issue_no_changelog, sample_issue_open):
+        """Один проход дает те же результаты, что и отдельные методы"""
+        issues = sample_issues_list + [sample_issue_no_changelog, sample_issue_open]
+        results = DataProcessor.compute_all(iter(issues), top_users=3)
+        
+        assert results['open_time'] == DataProcessor.calculate_open_time(issues)
+        assert results['status_durations'] == DataProcessor.get_status_durations(issues)
+        assert results['daily_stats'].equals(DataProcessor.get_daily_stats(issues))
+        assert results['user_stats'].equals(DataProcessor.get_user_stats(issues, 3))
+        assert results['time_in_progress'] == DataProcessor.get_time_in_progress_distribution(issues)
+        assert results['priority_distribution'] == DataProcessor.get_priority_distribution(issues)
+    
+    @allure.title("Test 67: Engine with selected analyses")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_engine_selected_analyses(self, sample_issues_list):
+        """Движок считает только выбранные метрики"""
+        engine = MetricsEngine.for_analyses(['priority_distribution']).consume(sample_issues_list)
+        
+        assert engine.issue_count == 2
+        assert engine.results() == {'priority_distribution': {'High': 1, 'Medium': 1}}
+    
+    @allure.title("Test 68: Custom accumulator")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_engine_custom_accumulator(self, sample_issues_list):
+        """Подключение собственного аккумулятора"""
+        class ResolvedCounter(Accumulator):
+            def __init__(self):
+                self.count = 0
+            
+            def add(self, issue):
+                self.count += issue.resolved is not None
+            
+            def result(self):
+                return self.count
+        
+        engine = MetricsEngine({'resolved': ResolvedCounter()}).consume(sample_issues_list)
+        assert engine.results() == {'resolved': 2}
+    
+    @allure.title("Test 126: Incomplete accumulator rejected at construction")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_incomplete_accumulator(self):
+        """Аккумулятор без result не создается; без merge — понятная ошибка при слиянии"""
+        class AddOnly(Accumulator):
+            def add(self, issue):
+                pass
+        
+        class Counter(AddOnly):
+            def result(self):
+                return 0
+        
+        with pytest.raises(TypeError):
+            AddOnly()
+        with pytest.raises(NotImplementedError, match='Counter does not support merging'):
+            Counter().merge(Counter())
+
+
+@allure.feature('Data Processing')
+@allure.story('Timestamp Parsing')
+class TestJiraDateParsing:
+    
+    @allure.title("Test 70: Parser matches strptime")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_parse_matches_strptime(self):
+        """Быстрый парсер дает тот же результат, что и strptime"""
+        for value in ['2024-01-01T00:00:00.000+0000', '2024-03-05T14:27:31.123-0500',
+                      '2024-01-01T00:00:00.000000+0000', '2023-12-31T23:59:59.999+0530']:
+            assert parse_jira_datetime(value) == datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+            assert parse_jira_datetime(value).utcoffset() == datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').utcoffset()
+    
+    @allure.title("Test 71: Memo returns cached values")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_parser_memo(self):
+        """Повторная метка берется из кеша, размер кеша ограничен"""
+        parser = JiraDateParser(max_size=2)
+        first = parser.parse('2024-01-01T00:00:00.000+0000')
+        assert parser.parse('2024-01-01T00:00:00.000+0000') is first
+        
+        parser.parse('2024-01-02T00:00:00.000+0000')
+        parser.parse('2024-01-03T00:00:00.000+0000')
+        assert len(parser._cache) <= 2
+
+
+@allure.feature('Data Processing')
+@allure.story('Daily Statistics')
+class TestDailyStatsResampling:
+    
+    @allure.title("Test 75: Continuous date range")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_daily_stats_fills_gaps(self, sample_issue_resolved):
+        """Дни без активности присутствуют с нулями"""
+        result = DataProcessor.get_daily_stats([sample_issue_resolved])
+        
+        assert len(result) == 11
+        assert result['created'].tolist() == [1] + [0] * 10
+        assert result['closed'].tolist() == [0] * 10 + [1]
+        assert (result['date'].diff().dropna() == pd.Timedelta(days=1)).all()
+    
+    @allure.title("Test 76: Weekly and monthly resampling")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_daily_stats_periods(self, sample_issues_list):
+        """Агрегация по неделям и месяцам"""
+        weekly = DataProcessor.get_daily_stats(sample_issues_list, period='week')
+        monthly = DataProcessor.get_daily_stats(sample_issues_list, period='month')
+        
+        assert weekly['date'].tolist() == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-08')]
+        assert weekly['created'].tolist() == [2, 0]
+        assert weekly['closed'].tolist() == [1, 1]
+        assert monthly['date'].tolist() == [pd.Timestamp('2024-01-01')]
+        assert monthly.attrs['period'] == 'month'
+    
+    @allure.title("Test 77: Unknown period rejected")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.unit
+    def test_daily_stats_unknown_period(self, sample_issues_list):
+        """Неизвестная гранулярность вызывает ошибку"""
+        with pytest.raises(ValueError):
+            DataProcessor.get_daily_stats(sample_issues_list, period='year')
+
+def mixed_issues(count, seed=11):
+    # Повторяющиеся пользователи и приоритеты, разные статусы и даты — ничьи и новые ключи на границах порций
+    rng = random.Random(seed)
+    users = [{'accountId': f'u{n}', 'displayName': f'User {n % 5}'} for n in range(12)] + [None]
+    statuses = ['Open', 'In Progress', 'In Review', 'Done']
+    issues = []
+    for n in range(count):
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(200000))
+        histories, changed = [], created
+        for _ in range(rng.randrange(4)):
+            changed += timedelta(minutes=rng.randrange(1, 20000), milliseconds=rng.randrange(1000))
+            histories.append({'created': changed.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + '+0000',
+                              'items': [{'field': 'status', 'fromString': rng.choice(statuses),
+                                         'toString': rng.choice(statuses)}]})
+        resolved = changed + timedelta(hours=rng.randrange(1, 500)) if rng.random() < 0.6 else None
+        issues.append({
+            'key': f'TEST-{n}',
+            'fields': {
+                'created': created.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+                'resolutiondate': resolved.strftime('%Y-%m-%dT%H:%M:%S.000+0000') if resolved else None,
+                'assignee': rng.choice(users),
+                'reporter': rng.choice(users),
+                'priority': {'name': rng.choice(['Major', 'Minor', 'Critical'])} if rng.random() < 0.9 else None,
+                'status': {'name': rng.choice(statuses)},
+            },
+            'changelog': {'histories': histories}
+        })
+    return issues
+
+
+@allure.feature('Data Processing')
+@allure.story('Parallel Processing')
+class TestParallelProcessing:
+    
+    @allure.title("Test 110: Parallel results identical to serial pass")
+    @allure.severity(allure.severity_level.BLOCKER)
+    @pytest.mark.slow
+    def test_parallel_matches_serial(self):
+        """Все метрики и перцентили по многим порциям в процессах совпадают с последовательным расчетом, включая порядок"""
+        issues = mixed_issues(8000)
+        serial = MetricsEngine.for_analyses(top_users=5).consume(issues)
+        parallel = MetricsEngine.for_analyses(top_users=5).consume(iter(issues), workers=3, chunk_size=500)
+        expected, result = serial.results(), parallel.results()
+        
+        assert parallel.issue_count == serial.issue_count == 8000
+        for name in ('open_time', 'status_durations', 'time_in_progress', 'priority_distribution'):
+            assert result[name] == expected[name]
+        assert list(result['status_durations']) == list(expected['status_durations'])
+        assert list(result['priority_distribution']) == list(expected['priority_distribution'])
+        assert result['user_stats'].equals(expected['user_stats'])
+        assert result['daily_stats'].equals(expected['daily_stats'])
+        # Дайджесты пополняются значениями порций по порядку, а не сливаются: p50/p90/p99 те же до бита
+        assert len(expected['open_time']) > expected['open_time'].sketch.buffer_size
+        assert DataProcessor.duration_percentiles(result).equals(DataProcessor.duration_percentiles(expected))
+    
+    @allure.title("Test 111: Parallel histograms match serial bins, percentiles approximately")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.slow
+    def test_parallel_histograms(self):
+        """Корзины, count, min и max гистограмм после слияния порций те же; перцентили слитых дайджестов — приблизительно"""
+        issues = mixed_issues(8000)
+        analyses = ['open_time', 'status_durations', 'time_in_progress']
+        expected = MetricsEngine.for_analyses(analyses, histogram_bins='log').consume(issues).results()
+        result = MetricsEngine.for_analyses(analyses, histogram_bins='log').consume(
+            iter(issues), workers=3, chunk_size=500).results()
+        
+        pairs = [(result['open_time'], expected['open_time']), (result['time_in_progress'], expected['time_in_progress'])]
+        pairs += [(result['status_durations'][status], histogram)
+                  for status, histogram in expected['status_durations'].items()]
+        for merged, histogram in pairs:
+            assert merged.counts == histogram.counts
+            assert (merged.zeros, merged.count, merged.min, merged.max) == (
+                histogram.zeros, histogram.count, histogram.min, histogram.max)
+            assert merged.total == pytest.approx(histogram.total)
+            summary = histogram.summary()
+            for name, value in merged.summary().items():
+                # Центроиды слитых дайджестов группируются иначе: на ступенчатых данных p50 сдвигается на ~1%
+                assert value == pytest.approx(summary[name], rel=0.05)
+    
+    @allure.title("Test 112: Parallel mode requires engine built from analyses")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.unit
+    def test_parallel_requires_spec(self, sample_issues_list):
+        """Движок из произвольных аккумуляторов нельзя пересобрать в воркере — ошибка вместо тихого неверного результата"""
+        engine = MetricsEngine({'user_stats': MetricsEngine.for_analyses(['user_stats']).accumulators['user_stats']})
+        with pytest.raises(ValueError):
+            engine.consume(sample_issues_list, workers=2)
\ No newline at end of file
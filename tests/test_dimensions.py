@@ -0,0 +1,56 @@
+"""Tests for Dimensions module"""
+import pytest
+import allure
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from dimensions import NO_CODE, Dimension, Dimensions
+from data_processor import DataProcessor
+from issue_frame import IssueFrame
+
+
+@allure.feature('Columnar Processing')
+@allure.story('Dimensions')
+class TestDimensions:
+    
+    @allure.title("Test 105: Codes assigned in order of first appearance")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_codes_and_labels(self):
+        """Пользователь кодируется по accountId/key, подпись подставляется только при разрешении кодов"""
+        dimensions = Dimensions()
+        alice = dimensions.user({'accountId': 'a1', 'displayName': 'Alice'})
+        
+        assert dimensions.user({'accountId': 'a1', 'displayName': 'Alice Smith'}) == alice
+        assert dimensions.user({'key': 'bob', 'displayName': 'Bob'}) == 1
+        assert dimensions.user({'displayName': 'Carol'}) == 2
+        assert dimensions.user(None) == NO_CODE
+        assert dimensions.priority({'name': 'High'}) == 0
+        assert dimensions.users.resolve([2, alice, NO_CODE]).tolist() == ['Carol', 'Alice', None]
+        
+        merged = Dimension()
+        merged.code('x')
+        remap = merged.remap(dimensions.priorities)
+        assert remap.tolist() == [1, NO_CODE]
+        assert merged.keys == ['x', 'High']
+    
+    @allure.title("Test 106: Users with the same display name counted separately")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_user_stats_by_account(self):
+        """Два пользователя с одинаковым именем не сливаются ни в потоковом, ни в колоночном режиме"""
+        issues = [
+            {'fields': {'assignee': {'accountId': 'a1', 'displayName': 'Alex'},
+                        'reporter': {'accountId': 'a2', 'displayName': 'Alex'},
+                        'created': '2024-01-01T00:00:00.000+0000'}},
+            {'fields': {'assignee': {'accountId': 'a2', 'displayName': 'Alex'},
+                        'reporter': {'accountId': 'b1', 'displayName': 'Bea'},
+                        'created': '2024-01-01T00:00:00.000+0000'}},
+        ]
+        expected = DataProcessor.get_user_stats(issues)
+        
+        assert expected.values.tolist() == [['Alex', 2], ['Alex', 1], ['Bea', 1]]
+        assert IssueFrame.from_issues(issues).user_stats().equals(expected)
\ No newline at end of file
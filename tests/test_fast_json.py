@@ -0,0 +1,139 @@
+"""Tests for fast JSON decoding module"""
+import pytest
+import allure
+import sys
+import os
+import json
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+import fast_json
+from fast_json import CHANGELOG_DECODER, Decoder, fields_schema, search_page_decoder
+from data_processor import DataProcessor
+
+FIELDS = ('created', 'resolutiondate', 'status', 'priority', 'assignee', 'reporter', 'updated')
+
+
+def make_user(n):
+    return {
+        'self': f'https://jira/rest/api/2/user?accountId=u{n}',
+        'accountId': f'u{n}',
+        'displayName': f'User {n}',
+        'active': True,
+        'timeZone': 'UTC',
+        'avatarUrls': {size: f'https://avatar/u{n}/{size}' for size in ('48x48', '24x24', '16x16', '32x32')},
+    }
+
+
+def make_page(count=20):
+    # Ответ /search в том виде, как его отдает JIRA: ссылки self, аватары, statusCategory, лишние ключи истории
+    issues = []
+    for n in range(count):
+        histories = [{
+            'id': str(n * 10 + day),
+            'author': make_user(n % 3),
+            'created': f'2024-01-{day:02d}T10:00:00.000+0000',
+            'items': [
+                {'field': 'status', 'fieldtype': 'jira', 'fieldId': 'status', 'from': '1',
+                 'fromString': 'Open' if day % 2 else 'In Progress', 'to': '3',
+                 'toString': 'In Progress' if day % 2 else 'Open'},
+                {'field': 'assignee', 'fieldtype': 'jira', 'from': None, 'fromString': None,
+                 'to': f'u{n}', 'toString': f'User {n}', 'tmpToAccountId': f'u{n}'},
+            ]
+        } for day in range(2, 2 + n % 5)]
+        issues.append({
+            'expand': 'operations,changelog',
+            'id': str(10000 + n),
+            'self': f'https://jira/rest/api/2/issue/{10000 + n}',
+            'key': f'TEST-{n}',
+            'fields': {
+                'created': '2024-01-01T00:00:00.000+0000',
+                'updated': '2024-01-15T00:00:00.000+0000',
+                'resolutiondate': '2024-01-20T00:00:00.000+0000' if n % 2 else None,
+                'status': {'self': 'https://jira/status/1', 'iconUrl': 'https://jira/icon.png', 'name': 'Open',
+                           'id': '1', 'statusCategory': {'id': 2, 'key': 'new', 'name': 'To Do'}},
+                'priority': {'self': 'https://jira/priority/3', 'name': 'Major', 'id': '3'} if n % 4 else None,
+                'assignee': make_user(n % 4) if n % 3 else None,
+                'reporter': make_user(n % 5),
+            },
+            'changelog': {'startAt': 0, 'maxResults': 100, 'total': n % 5, 'histories': histories}
+        })
+    return {'expand': 'schema,names', 'startAt': 0, 'maxResults': 50, 'total': count, 'issues': issues}
+
+
+@allure.feature('JIRA Client')
+@allure.story('Fast JSON Decoding')
+class TestFastJson:
+    
+    @allure.title("Test 113: Decoded pages give the same metrics on any backend")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_search_page_metrics(self):
+        """Страница, разобранная декодером, дает те же метрики и служебные поля, что и stdlib json"""
+        page = make_page()
+        raw = json.dumps(page).encode('utf-8')
+        decoded = search_page_decoder(FIELDS).decode(raw)
+        
+        assert decoded['total'] == page['total']
+        assert [issue['id'] for issue in decoded['issues']] == [issue['id'] for issue in page['issues']]
+        assert [issue['fields']['updated'] for issue in decoded['issues']] == ['2024-01-15T00:00:00.000+0000'] * 20
+        assert [issue['changelog']['total'] for issue in decoded['issues']] == [n % 5 for n in range(20)]
+        
+        expected = DataProcessor.compute_all(page['issues'])
+        result = DataProcessor.compute_all(decoded['issues'])
+        for name in ('open_time', 'status_durations', 'time_in_progress', 'priority_distribution'):
+            assert result[name] == expected[name]
+        assert result['user_stats'].equals(expected['user_stats'])
+        assert result['daily_stats'].equals(expected['daily_stats'])
+    
+    @allure.title("Test 114: Unused fields skipped while decoding with msgspec")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_msgspec_skips_unused(self):
+        """msgspec собирает только ключи схемы; запрошенные поля без схемы и *all сохраняются целиком"""
+        pytest.importorskip('msgspec')
+        raw = json.dumps(make_page(5)).encode('utf-8')
+        issue = search_page_decoder(FIELDS).decode(raw)['issues'][4]
+        
+        assert set(issue) == {'id', 'key', 'fields', 'changelog'}
+        assert issue['fields']['status'] == {'name': 'Open'}
+        assert issue['fields']['reporter'] == {'accountId': 'u4', 'displayName': 'User 4'}
+        assert issue['fields']['priority'] is None
+        assert issue['changelog']['histories'][0]['items'][1] == {
+            'field': 'assignee', 'fromString': None, 'toString': 'User 4'
+        }
+        assert 'author' not in issue['changelog']['histories'][0]
+        assert search_page_decoder(('*all',)).decode(raw)['issues'][4]['fields']['status']['statusCategory']
+        # Неожиданный тип значения не роняет загрузку — ответ разбирается без схемы
+        assert CHANGELOG_DECODER.decode(b'{"values": "none"}') == {'values': 'none'}
+    
+    @allure.title("Test 115: Fallback to stdlib json without optional decoders")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_stdlib_fallback(self, monkeypatch):
+        """Без msgspec и orjson ответ разбирается stdlib json целиком"""
+        monkeypatch.setattr(fast_json, 'msgspec', None)
+        monkeypatch.setattr(fast_json, 'orjson', None)
+        page = make_page(3)
+        
+        assert Decoder(fast_json.search_page_schema(list(FIELDS))).decode(json.dumps(page)) == page
+        assert fields_schema(['created', '*navigable']) is None
+        assert fields_schema(None) is None
+        assert fields_schema(['status', 'created']) == {'status': {'name': None}, 'created': None}
+    
+    @allure.title("Test 124: orjson decodes pages without msgspec")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_orjson_backend(self, monkeypatch):
+        """Только с orjson ответ разбирается целиком, результат совпадает с stdlib json"""
+        pytest.importorskip('orjson')
+        monkeypatch.setattr(fast_json, 'msgspec', None)
+        page = make_page(5)
+        raw = json.dumps(page).encode('utf-8')
+        
+        decoder = Decoder(fast_json.search_page_schema(list(FIELDS)))
+        
+        assert fast_json.orjson is not None and decoder._decoder is None
+        assert decoder.decode(raw) == page
+        assert Decoder(fast_json.CHANGELOG_PAGE).decode(b'{"values": []}') == {'values': []}
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Tests for FetchJournal module"""
+import pytest
+import allure
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from fetch_journal import FetchJournal
+from jira_client import JiraClient, PAGE_RETRIES
+
+
+@allure.feature('JIRA Client')
+@allure.story('Fetch Checkpoints')
+class TestFetchJournal:
+    
+    @allure.title("Test 100: Journal keeps pages only for a resumed run")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_journal_lifecycle(self, tmp_path):
+        """Без resume журнал запроса очищается, с resume страницы возвращаются, finish удаляет их"""
+        path = str(tmp_path / 'journal.db')
+        run = FetchJournal.key('http://jira', 'project = A', None)
+        with FetchJournal(path) as journal:
+            assert journal.get('page-0') is None
+            journal.begin(run)
+            journal.put('page-0', {'issues': [{'key': 'A-1'}]})
+            journal.begin(FetchJournal.key('http://jira', 'project = B', None))
+            journal.put('page-0', {'issues': [{'key': 'B-1'}]})
+        
+        with FetchJournal(path, resume=True) as journal:
+            journal.begin(run)
+            assert journal.get('page-0') == {'issues': [{'key': 'A-1'}]}
+            assert journal.get('page-50') is None
+            assert journal.restored == 1
+            journal.finish()
+        
+        with FetchJournal(path, resume=True) as journal:
+            journal.begin(run)
+            assert journal.get('page-0') is None
+        
+        with FetchJournal(path) as journal:
+            journal.begin(FetchJournal.key('http://jira', 'project = B', None))
+            assert journal.units() == []
+    
+    @allure.title("Test 101: Interrupted fetch resumes without refetching pages")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_resume_interrupted_fetch(self, jira_stub_server, tmp_path):
+        """После обрыва загрузки --resume запрашивает только недостающие страницы"""
+        path = str(tmp_path / 'journal.db')
+        with JiraClient(jira_stub_server.url, max_workers=1, journal=FetchJournal(path)) as client:
+            pages = client.iter_pages('project = STUB')
+            next(pages)
+            next(pages)
+            pages.close()
+        first_run = {r[1]['startAt'][0] for r in jira_stub_server.requests_log if r[0].endswith('/search')}
+        assert len(first_run) < 5
+        
+        jira_stub_server.requests_log.clear()
+        with JiraClient(jira_stub_server.url, max_workers=1, journal=FetchJournal(path, resume=True)) as client:
+            issues = client.fetch_issues('project = STUB')
+            assert client.journal.restored == len(first_run)
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in jira_stub_server.issues]
+        second_run = {r[1]['startAt'][0] for r in jira_stub_server.requests_log if r[0].endswith('/search')}
+        assert not first_run & second_run
+        assert first_run | second_run == {'0', '50', '100', '150', '200'}
+        with FetchJournal(path, resume=True) as journal:
+            journal.begin(FetchJournal.key(jira_stub_server.url, 'project = STUB', None, None, None, 'offset', 1))
+            assert journal.units() == []
+    
+    @allure.title("Test 102: Failed page retried with backoff")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_page_retry(self, jira_stub_server):
+        """Ошибка 5xx повторяет только упавшую страницу, после PAGE_RETRIES повторов ошибка пробрасывается"""
+        jira_stub_server.fail_jql = ['project = STUB']
+        client = JiraClient(jira_stub_server.url, max_workers=2, rate_limit={'backoff_base': 0.01})
+        issues = client.fetch_issues('project = STUB')
+        
+        assert len(issues) == 230
+        searches = [r[1]['startAt'][0] for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert searches.count('0') == 2
+        assert len(searches) == 6
+        
+        jira_stub_server.fail_jql = ['project = STUB'] * (PAGE_RETRIES + 1)
+        with pytest.raises(Exception, match='JIRA API error 500'):
+            client.fetch_issues('project = STUB')
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Tests for Histogram module"""
+import pytest
+import allure
+import sys
+import os
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from histogram import Histogram
+from data_processor import DataProcessor
+from issue_frame import IssueFrame
+
+
+@allure.feature('Data Processing')
+@allure.story('Histograms')
+class TestHistogram:
+    
+    @allure.title("Test 79: Fixed bins count values and keep summary stats")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_fixed_bins(self):
+        """Корзины фиксированной ширины и сводная статистика без хранения значений"""
+        histogram = Histogram.fixed(width=2)
+        for value in [0, 1, 2, 5, 5, -1]:
+            histogram.add(value)
+        
+        edges, counts = histogram.bins()
+        assert edges.tolist() == [-2, 0, 2, 4, 6]
+        assert counts.tolist() == [1, 2, 1, 2]
+        assert len(histogram) == 6
+        assert histogram.min == -1 and histogram.max == 5
+        assert histogram.mean == pytest.approx(2.0)
+    
+    @allure.title("Test 80: Vectorized update and merge match per-value add")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_update_and_merge(self):
+        """update() по массиву и merge() частей дают те же счетчики, что и add() по одному"""
+        values = np.random.default_rng(7).exponential(30, 1000)
+        single = Histogram.log_spaced()
+        for value in values:
+            single.add(value)
+        merged = Histogram.log_spaced().update(values[:400]).merge(Histogram.log_spaced().update(values[400:]))
+        
+        assert merged.counts == single.counts
+        assert merged.count == single.count == 1000
+        assert merged.total == pytest.approx(single.total)
+        with pytest.raises(ValueError):
+            merged.merge(Histogram.fixed())
+    
+    @allure.title("Test 81: Coarsen and quantile estimates")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_coarsen_and_quantile(self):
+        """Укрупнение до лимита корзин сохраняет сумму счетчиков, медиана точна до ширины корзины"""
+        values = np.arange(1000)
+        histogram = Histogram.from_values(values)
+        coarse = histogram.coarsen(50)
+        
+        edges, counts = coarse.bins()
+        assert len(counts) <= 50
+        assert counts.sum() == 1000
+        assert edges[0] == 0 and edges[-1] >= 999
+        assert abs(histogram.quantile(0.5) - np.median(values)) <= 1
+        assert abs(coarse.quantile(0.9) - np.quantile(values, 0.9)) <= coarse.width
+    
+    @allure.title("Test 82: Engine and IssueFrame emit identical histograms")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_processors_emit_histograms(self, sample_issues_list, sample_issue_no_changelog):
+        """compute_all и IssueFrame.compute с histogram_bins отдают одинаковые гистограммы"""
+        issues = sample_issues_list + [sample_issue_no_changelog]
+        raw = DataProcessor.compute_all(issues)
+        binned = DataProcessor.compute_all(issues, histogram_bins='fixed')
+        columnar = IssueFrame.from_issues(issues).compute(histogram_bins='fixed')
+        
+        assert isinstance(binned['open_time'], Histogram)
+        assert binned['open_time'].count == len(raw['open_time'])
+        assert binned['open_time'].counts == Histogram.from_values(raw['open_time']).counts
+        assert binned['open_time'].counts == columnar['open_time'].counts
+        assert set(binned['status_durations']) == set(raw['status_durations'])
+        for status, histogram in binned['status_durations'].items():
+            assert histogram.counts == columnar['status_durations'][status].counts
+        assert binned['time_in_progress'].total == pytest.approx(sum(raw['time_in_progress']))
+        with pytest.raises(ValueError):
+            DataProcessor.compute_all(issues, histogram_bins='weird')
\ No newline at end of file
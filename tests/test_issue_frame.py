@@ -0,0 +1,92 @@
+"""Tests for IssueFrame module"""
+import pytest
+import allure
+import sys
+import os
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from issue_frame import IssueFrame
+from data_processor import DataProcessor
+
+
+@pytest.fixture
+def mixed_issues(sample_issues_list, sample_issue_no_changelog, sample_issue_open):
+    tricky = {
+        'key': 'TEST-9',
+        'fields': {
+            'created': '2024-01-01T23:30:00.000+0300',
+            'resolutiondate': '2024-01-09T08:00:00.000-0500',
+            'status': {'name': 'Closed'},
+            'assignee': {'displayName': 'Bob'},
+            'reporter': {'displayName': 'Alice'},
+            'priority': {'name': 'High'},
+        },
+        'changelog': {
+            'histories': [
+                {'created': '2024-01-02T10:00:00.000+0300', 'items': [{'field': 'assignee', 'toString': 'Bob'}]},
+                {'created': '2024-01-03T10:00:00.000+0300', 'items': [
+                    {'field': 'status', 'toString': 'In Progress'},
+                    {'field': 'status', 'fromString': 'In Progress', 'toString': 'In Review'},
+                ]},
+                {'created': '2024-01-05T10:00:00.000+0300', 'items': [
+                    {'field': 'status', 'fromString': 'In Review', 'toString': 'In Progress'}
+                ]},
+            ]
+        }
+    }
+    return sample_issues_list + [sample_issue_no_changelog, sample_issue_open, tricky]
+
+
+@allure.feature('Columnar Processing')
+@allure.story('Normalization')
+class TestIssueFrameNormalization:
+    
+    @allure.title("Test 72: Issue and transition tables")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_tables_structure(self, mixed_issues):
+        """Таблицы задач и переходов с типизированными колонками"""
+        frame = IssueFrame.from_issues(iter(mixed_issues))
+        
+        assert len(frame) == 5
+        assert str(frame.issues['created'].dt.tz) == 'UTC'
+        assert frame.issues['resolved'].isna().sum() == 1
+        assert frame.issues['status'].dtype == np.int32
+        assert frame.issues['assignee'].dtype == np.int32
+        assignees = [(issue['fields'].get('assignee') or {}).get('displayName') for issue in mixed_issues]
+        assert frame.dimensions.users.resolve(frame.issues['assignee']).tolist() == assignees
+        assert len(frame.transitions) == 7
+        assert frame.transitions.status.dtype == np.int32
+        assert frame.transitions.offsets.tolist() == [0, 2, 4, 4, 4, 7]
+
+
+@allure.feature('Columnar Processing')
+@allure.story('Vectorized Metrics')
+class TestIssueFrameMetrics:
+    
+    @allure.title("Test 73: Vectorized metrics match DataProcessor")
+    @allure.severity(allure.severity_level.BLOCKER)
+    @pytest.mark.unit
+    def test_metrics_match_data_processor(self, mixed_issues):
+        """Векторные метрики совпадают с построчной обработкой"""
+        expected = DataProcessor.compute_all(mixed_issues, top_users=4)
+        result = IssueFrame.from_issues(mixed_issues).compute(top_users=4)
+        
+        assert result['open_time'] == expected['open_time']
+        assert result['status_durations'] == expected['status_durations']
+        assert list(result['status_durations']) == list(expected['status_durations'])
+        assert result['daily_stats'].equals(expected['daily_stats'])
+        assert result['user_stats'].equals(expected['user_stats'])
+        assert result['time_in_progress'] == pytest.approx(expected['time_in_progress'])
+        assert result['priority_distribution'] == expected['priority_distribution']
+    
+    @allure.title("Test 74: Empty input")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.unit
+    def test_empty_frame(self):
+        """Пустой набор задач не ломает вычисления"""
+        result = IssueFrame.from_issues([]).compute(['open_time', 'status_durations', 'priority_distribution'])
+        assert result == {'open_time': [], 'status_durations': {}, 'priority_distribution': {}}
\ No newline at end of file
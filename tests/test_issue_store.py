@@ -0,0 +1,164 @@
+"""Tests for IssueStore module"""
+import pytest
+import allure
+import sys
+import os
+from unittest.mock import Mock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from issue_store import IssueStore, build_delta_jql
+from jira_client import JiraClient
+
+
+@allure.feature('Issue Store')
+@allure.story('Incremental Sync')
+class TestIncrementalSync:
+    
+    @allure.title("Test 54: Delta JQL built from watermark")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_build_delta_jql(self):
+        """JQL для догрузки изменений после watermark"""
+        assert build_delta_jql('project = KAFKA', None) == 'project = KAFKA ORDER BY updated ASC'
+        
+        jql = build_delta_jql('project = KAFKA order by created DESC', '2024-03-05T14:27:31.000+0300')
+        assert jql == '(project = KAFKA) AND updated >= "2024/03/05 14:27" ORDER BY updated ASC'
+    
+    @allure.title("Test 55: Upsert keeps latest version and watermark")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_upsert_and_watermark(self, tmp_path):
+        """Повторная запись задачи заменяет старую версию"""
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            key = IssueStore.query_key('https://jira.example.com', 'project = TEST')
+            store.upsert(key, [
+                {'id': '2', 'key': 'TEST-2', 'fields': {'updated': '2024-01-02T00:00:00.000+0000'}},
+                {'id': '1', 'key': 'TEST-1', 'fields': {'updated': '2024-01-05T00:00:00.000+0000'}},
+            ])
+            store.upsert(key, [
+                {'id': '2', 'key': 'TEST-2', 'fields': {'updated': '2024-01-03T00:00:00.000+0000', 'status': 'Done'}},
+            ])
+            
+            issues = store.load(key)
+            assert [i['key'] for i in issues] == ['TEST-1', 'TEST-2']
+            assert issues[1]['fields']['status'] == 'Done'
+            assert store.get_watermark(key) == '2024-01-05T00:00:00.000+0000'
+    
+    @allure.title("Test 56: Second sync fetches only changes")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_sync_uses_watermark(self, tmp_path):
+        """Повторная синхронизация запрашивает только обновленные задачи"""
+        client = Mock(base_url='https://jira.example.com')
+        client.iter_pages.side_effect = [
+            iter([[{'id': '1', 'key': 'TEST-1', 'fields': {'updated': '2024-01-05T10:00:00.000+0000'}}]]),
+            iter([[{'id': '1', 'key': 'TEST-1'}]]),
+            iter([[{'id': '2', 'key': 'TEST-2', 'fields': {'updated': '2024-01-06T10:00:00.000+0000'}}]]),
+            iter([[{'id': '1', 'key': 'TEST-1'}, {'id': '2', 'key': 'TEST-2'}]]),
+        ]
+        
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            store.sync(client, 'project = TEST', expand='changelog')
+            issues = store.sync(client, 'project = TEST', expand='changelog')
+        
+        second_jql = client.iter_pages.call_args_list[2][0][0]
+        assert 'updated >= "2024/01/05 10:00"' in second_jql
+        assert len(issues) == 2
+    
+    @allure.title("Test 57: Sync against stub server")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_sync_with_stub_server(self, tmp_path, jira_stub_server):
+        """Синхронизация с сервером сохраняет все задачи в хранилище"""
+        client = JiraClient(jira_stub_server.url)
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            issues = store.sync(client, 'project = STUB')
+            key = IssueStore.query_key(jira_stub_server.url, 'project = STUB')
+            
+            assert len(issues) == 230
+            assert store.get_watermark(key) == '2024-02-28T12:00:00.000+0000'
+    
+    @allure.title("Test 63: Sync adds updated to projected fields")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_sync_requests_updated_field(self, tmp_path):
+        """При проекции полей хранилище дозапрашивает updated"""
+        client = Mock(base_url='https://jira.example.com')
+        client.iter_pages.return_value = iter([])
+        
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            store.sync(client, 'project = TEST', fields=['created'])
+        
+        assert client.iter_pages.call_args_list[0][0][3] == ['created', 'updated']
+    
+    @allure.title("Test 117: Issues that left the query are pruned")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_sync_prunes_and_orders(self, tmp_path, jira_stub_server):
+        """Задача, выпавшая из окна запроса, удаляется; max_results и ORDER BY применяются к результату"""
+        client = JiraClient(jira_stub_server.url)
+        jql = 'project = STUB ORDER BY created DESC'
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            store.sync(client, jql)
+            
+            # Задача больше не подходит под запрос и в дельту не попадает (updated не менялся)
+            jira_stub_server.issues = [issue for issue in jira_stub_server.issues if issue['key'] != 'STUB-5']
+            jira_stub_server.issues[0]['fields']['created'] = '2023-12-31T00:00:00.000+0000'
+            issues = store.sync(client, jql, max_results=3)
+            
+            assert len(store.load(IssueStore.query_key(jira_stub_server.url, jql))) == 229
+            assert 'STUB-5' not in [i['key'] for i in store.load(IssueStore.query_key(jira_stub_server.url, jql))]
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in sorted(
+            jira_stub_server.issues, key=lambda i: i['fields']['created'], reverse=True)][:3]
+    
+    @allure.title("Test 125: Servers kept apart and missing issues fetched by id")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_sync_per_server_and_missing(self, tmp_path):
+        """Тот же JQL на другом сервере не берет чужой watermark; id из запроса, которых нет в хранилище, догружаются"""
+        def issue(n, updated='2024-01-05T10:00:00.000+0000'):
+            return {'id': str(n), 'key': f'TEST-{n}', 'fields': {'updated': updated}}
+        
+        server_a = Mock(base_url='https://a.example.com')
+        server_a.iter_pages.side_effect = [iter([[issue(1)]]), iter([[{'id': '1'}]])]
+        server_b = Mock(base_url='https://b.example.com')
+        server_b.iter_pages.side_effect = [
+            # Дельта без watermark сервера A; id 3 под запросом, но в дельту не попал
+            iter([[issue(1), issue(2)]]),
+            iter([[{'id': '3'}, {'id': '2'}, {'id': '1'}]]),
+            iter([[issue(3, '2023-06-01T00:00:00.000+0000')]]),
+        ]
+        
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            assert [i['key'] for i in store.sync(server_a, 'project = TEST')] == ['TEST-1']
+            issues = store.sync(server_b, 'project = TEST')
+        
+        assert 'updated >=' not in server_b.iter_pages.call_args_list[0][0][0]
+        assert server_b.iter_pages.call_args_list[2][0][0] == 'id in (3)'
+        assert [i['key'] for i in issues] == ['TEST-3', 'TEST-2', 'TEST-1']
+    
+    @allure.title("Test 129: Interrupted delta keeps the old watermark")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_interrupted_sync_keeps_watermark(self, tmp_path):
+        """Страницы шардов приходят не по порядку updated: при сбое watermark не сдвигается, следующая дельта полная"""
+        def pages():
+            yield [{'id': '9', 'key': 'TEST-9', 'fields': {'updated': '2024-03-01T00:00:00.000+0000'}}]
+            raise Exception("JIRA API error 500: shard 2")
+        
+        client = Mock(base_url='https://jira.example.com')
+        client.iter_pages.side_effect = [pages(), iter([[{'id': '1', 'fields': {'updated': None}}]]), iter([])]
+        
+        with IssueStore(str(tmp_path / 'issues.db')) as store:
+            with pytest.raises(Exception, match='shard 2'):
+                store.sync(client, 'project = TEST')
+            key = IssueStore.query_key('https://jira.example.com', 'project = TEST')
+            assert store.get_watermark(key) is None
+            assert [i['key'] for i in store.load(key)] == ['TEST-9']
+            
+            store.sync(client, 'project = TEST')
+        
+        assert 'updated >=' not in client.iter_pages.call_args_list[1][0][0]
\ No newline at end of file
@@ -3,12 +3,16 @@ import pytest
 import allure
 import sys
 import os
+import json
+import requests
+from itertools import islice
 from unittest.mock import Mock, patch
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 
-from jira_client import JiraClient
+from jira_client import PAGE_RETRIES, JiraClient, build_shard_jql
+from server_info import ServerInfoStore
 
 
 @allure.feature('JIRA Client')
@@ -53,7 +57,7 @@ class TestJiraClientFetch:
     @allure.title("Test 19: Fetch issues successfully")
     @allure.severity(allure.severity_level.BLOCKER)
     @pytest.mark.unit
-    @patch('jira_client.requests.get')
+    @patch('jira_client.requests.Session.get')
     def test_fetch_issues_success(self, mock_get):
         """Успешное получение задач"""
         # API version check
@@ -63,11 +67,11 @@ class TestJiraClientFetch:
         # Actual fetch
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'issues': [{'key': 'KAFKA-1', 'fields': {}}],
             'total': 1
-        }
-        mock_get.side_effect = [mock_version, mock_response]
+        }).encode('utf-8')
+        mock_get.side_effect = lambda url, **kwargs: mock_version if url.endswith('/serverInfo') else mock_response
         
         client = JiraClient('https://test.atlassian.net', 'user@test.com', 'token')
         issues = client.fetch_issues('project = TEST', max_results=10)
@@ -78,7 +82,7 @@ class TestJiraClientFetch:
     @allure.title("Test 20: Handle API errors")
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.unit
-    @patch('jira_client.requests.get')
+    @patch('jira_client.requests.Session.get')
     def test_fetch_issues_api_error(self, mock_get):
         """Обработка ошибок API"""
         # API version check
@@ -89,7 +93,7 @@ class TestJiraClientFetch:
         mock_response = Mock()
         mock_response.status_code = 401
         mock_response.text = 'Unauthorized'
-        mock_get.side_effect = [mock_version, mock_response]
+        mock_get.side_effect = lambda url, **kwargs: mock_version if url.endswith('/serverInfo') else mock_response
         
         client = JiraClient('https://test.atlassian.net', 'user@test.com', 'wrong_token')
         
@@ -101,7 +105,7 @@ class TestJiraClientFetch:
     @allure.title("Test 21: Empty results handling")
     @allure.severity(allure.severity_level.NORMAL)
     @pytest.mark.unit
-    @patch('jira_client.requests.get')
+    @patch('jira_client.requests.Session.get')
     def test_fetch_issues_empty(self, mock_get):
         """Обработка пустых результатов"""
         # API version check
@@ -111,11 +115,11 @@ class TestJiraClientFetch:
         # Empty result
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'issues': [],
             'total': 0
-        }
-        mock_get.side_effect = [mock_version, mock_response]
+        }).encode('utf-8')
+        mock_get.side_effect = lambda url, **kwargs: mock_version if url.endswith('/serverInfo') else mock_response
         
         client = JiraClient('https://test.atlassian.net')
         issues = client.fetch_issues('project = NONEXISTENT')
@@ -130,7 +134,7 @@ class TestJiraClientAPIVersion:
     @allure.title("Test 22: Detect API version")
     @allure.severity(allure.severity_level.NORMAL)
     @pytest.mark.unit
-    @patch('jira_client.requests.get')
+    @patch('jira_client.requests.Session.get')
     def test_api_version_detection(self, mock_get):
         """Определение версии JIRA API"""
         mock_response = Mock()
@@ -138,4 +142,495 @@ class TestJiraClientAPIVersion:
         mock_get.return_value = mock_response
         
         client = JiraClient('https://test.atlassian.net')
-        assert client.api_version in ['2', '3']
\ No newline at end of file
+        assert client.api_version in ['2', '3']
+    
+    @allure.title("Test 89: Pinned API version skips detection")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_pinned_api_version(self, jira_stub_server):
+        """Явно заданная версия API не требует запроса serverInfo"""
+        client = JiraClient(jira_stub_server.url, api_version='3')
+        client.fetch_issues('project = STUB', max_results=10)
+        
+        paths = [r[0] for r in jira_stub_server.requests_log]
+        assert paths == ['/rest/api/3/search']
+    
+    @allure.title("Test 90: Detected API version stored per base URL")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_api_version_cached(self, jira_stub_server, tmp_path):
+        """Версия определяется лениво и берется из хранилища serverInfo до истечения срока"""
+        path = str(tmp_path / 'server_info.db')
+        client = JiraClient(jira_stub_server.url, server_info=ServerInfoStore(path))
+        assert jira_stub_server.requests_log == []
+        assert client.api_version == '2'
+        client.close()
+        
+        jira_stub_server.requests_log.clear()
+        with JiraClient(jira_stub_server.url + '/', server_info=ServerInfoStore(path)) as client:
+            assert client.api_version == '2'
+        assert jira_stub_server.requests_log == []
+        
+        with ServerInfoStore(path) as store:
+            assert store.get(jira_stub_server.url, max_age=0) is None
+            assert store.get(jira_stub_server.url, max_age=60)['build'] == '9.4.0'
+    
+    @allure.title("Test 119: Deployment type known with stored or pinned version")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_cloud_detected_without_probe(self, jira_stub_server, tmp_path):
+        """Cloud на произвольном домене определяется по сохраненной записи и при заданной версии"""
+        jira_stub_server.deployment_type = 'Cloud'
+        path = str(tmp_path / 'server_info.db')
+        with JiraClient(jira_stub_server.url, server_info=ServerInfoStore(path)) as client:
+            assert client.is_cloud
+            assert client.api_version == '2'
+        
+        # Версия и тип развертывания из хранилища — без запросов serverInfo
+        jira_stub_server.requests_log.clear()
+        with JiraClient(jira_stub_server.url, server_info=ServerInfoStore(path)) as client:
+            assert client.api_version == '2'
+            assert client.is_cloud
+        with JiraClient(jira_stub_server.url, api_version='3', server_info=ServerInfoStore(path)) as client:
+            assert client.is_cloud
+        assert jira_stub_server.requests_log == []
+        
+        # Заданная версия без сохраненной записи: одна проверка только этой версии
+        path = str(tmp_path / 'empty.db')
+        with JiraClient(jira_stub_server.url, api_version='3', server_info=ServerInfoStore(path)) as client:
+            assert client.is_cloud
+            assert client.api_version == '3'
+        assert [r[0] for r in jira_stub_server.requests_log] == ['/rest/api/3/serverInfo']
+
+
+@allure.feature('JIRA Client')
+@allure.story('Concurrent Fetching')
+class TestJiraClientConcurrentFetch:
+    
+    @allure.title("Test 42: Concurrent fetch keeps issue order")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_concurrent_fetch_preserves_order(self, jira_stub_server):
+        """Параллельная загрузка страниц сохраняет порядок задач"""
+        client = JiraClient(jira_stub_server.url, max_workers=4)
+        issues = client.fetch_issues('project = STUB')
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in jira_stub_server.issues]
+    
+    @allure.title("Test 43: Concurrent fetch honors max_results")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_concurrent_fetch_max_results(self, jira_stub_server):
+        """Ограничение max_results при параллельной загрузке"""
+        client = JiraClient(jira_stub_server.url, max_workers=4)
+        issues = client.fetch_issues('project = STUB', max_results=120)
+        
+        assert len(issues) == 120
+        assert issues[-1]['key'] == 'STUB-120'
+        search_calls = [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert len(search_calls) == 3
+    
+    @allure.title("Test 44: Server-side page size cap")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_concurrent_fetch_server_page_cap(self, jira_stub_server):
+        """Сервер отдает страницы меньше запрошенного размера"""
+        jira_stub_server.page_cap = 20
+        client = JiraClient(jira_stub_server.url, max_workers=8)
+        issues = client.fetch_issues('project = STUB')
+        
+        assert len(issues) == 230
+        assert len({i['key'] for i in issues}) == 230
+
+
+@allure.feature('JIRA Client')
+@allure.story('Connection Pooling')
+class TestJiraClientSession:
+    
+    @allure.title("Test 45: Session headers and pool size")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_session_configuration(self, jira_stub_server):
+        """Клиент использует общую сессию с gzip и keep-alive"""
+        client = JiraClient(jira_stub_server.url, 'user@test.com', 'token', max_workers=6)
+        
+        assert client.session.auth == ('user@test.com', 'token')
+        assert 'gzip' in client.session.headers['Accept-Encoding']
+        assert client.session.get_adapter(jira_stub_server.url)._pool_maxsize == 8
+        
+        client.fetch_issues('project = STUB', max_results=10)
+        sent_headers = jira_stub_server.requests_log[-1][2]
+        assert 'gzip' in sent_headers['Accept-Encoding']
+    
+    @allure.title("Test 46: Context manager closes session")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    @patch('jira_client.requests.Session.close')
+    @patch('jira_client.requests.Session.get')
+    def test_context_manager_closes_session(self, mock_get, mock_close):
+        """Контекстный менеджер закрывает сессию"""
+        mock_get.return_value = Mock(status_code=200)
+        
+        with JiraClient('https://test.atlassian.net') as client:
+            assert client.api_version == '2'
+        
+        mock_close.assert_called_once()
+
+
+@allure.feature('JIRA Client')
+@allure.story('Rate Limiting')
+class TestJiraClientRateLimiting:
+    
+    @allure.title("Test 47: Retry after 429 with Retry-After")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_fetch_retries_throttled_pages(self, jira_stub_server):
+        """Повтор запроса после ответа 429"""
+        jira_stub_server.throttle_responses = [(429, {'Retry-After': '0'}), (503, {'Retry-After': '0'})]
+        client = JiraClient(jira_stub_server.url, max_workers=2)
+        issues = client.fetch_issues('project = STUB', max_results=100)
+        
+        assert len(issues) == 100
+        assert jira_stub_server.throttle_responses == []
+    
+    @allure.title("Test 48: Limiter shared per base URL")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_rate_limiter_shared_per_base_url(self, jira_stub_server):
+        """Клиенты одного сервера используют общий лимитер"""
+        first = JiraClient(jira_stub_server.url)
+        second = JiraClient(jira_stub_server.url + '/')
+        
+        assert first.rate_limiter is second.rate_limiter
+
+
+@allure.feature('JIRA Client')
+@allure.story('Field Projection')
+class TestJiraClientFields:
+    
+    @allure.title("Test 61: Requested fields sent to search")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_fetch_issues_with_fields(self, jira_stub_server):
+        """Клиент запрашивает только указанные поля"""
+        client = JiraClient(jira_stub_server.url)
+        client.fetch_issues('project = STUB', max_results=60, fields=['created', 'status'])
+        
+        search_calls = [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert all(call[1]['fields'] == ['created,status'] for call in search_calls)
+    
+    @allure.title("Test 62: All fields by default")
+    @allure.severity(allure.severity_level.MINOR)
+    @pytest.mark.integration
+    def test_fetch_issues_all_fields_by_default(self, jira_stub_server):
+        """Без списка полей запрашиваются все поля"""
+        client = JiraClient(jira_stub_server.url)
+        client.fetch_issues('project = STUB', max_results=10)
+        
+        assert jira_stub_server.requests_log[-1][1]['fields'] == ['*all']
+
+
+@allure.feature('JIRA Client')
+@allure.story('Streaming')
+class TestJiraClientStreaming:
+    
+    @allure.title("Test 64: Pages streamed in order")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_iter_pages_in_order(self, jira_stub_server):
+        """Страницы отдаются по мере загрузки в исходном порядке"""
+        client = JiraClient(jira_stub_server.url, max_workers=3)
+        pages = list(client.iter_pages('project = STUB'))
+        
+        assert [len(p) for p in pages] == [50, 50, 50, 50, 30]
+        assert [i['key'] for p in pages for i in p] == [i['key'] for i in jira_stub_server.issues]
+    
+    @allure.title("Test 65: Early stop limits requests")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_iter_issues_early_stop(self, jira_stub_server):
+        """Прерванная итерация не загружает все страницы"""
+        jira_stub_server.issues = jira_stub_server.issues * 10
+        client = JiraClient(jira_stub_server.url, max_workers=2)
+        
+        issues = client.iter_issues('project = STUB')
+        first = list(islice(issues, 60))
+        issues.close()
+        
+        assert len(first) == 60
+        search_calls = [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert len(search_calls) <= 1 + 2 * 2 + 1
+
+def make_history(n):
+    return {
+        'id': str(n),
+        'created': f'2024-02-01T{n % 24:02d}:00:00.000+0000',
+        'items': [{'field': 'status', 'fromString': f'S{n}', 'toString': f'S{n + 1}'}]
+    }
+
+
+@allure.feature('JIRA Client')
+@allure.story('Changelog Completion')
+class TestJiraClientChangelogs:
+    
+    @allure.title("Test 91: Truncated changelogs fetched in full")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_truncated_changelogs_completed(self, jira_stub_server):
+        """Полная история догружается только для задач с обрезанным changelog"""
+        jira_stub_server.changelogs = {
+            'STUB-3': [make_history(n) for n in range(7)],
+            'STUB-120': [make_history(n) for n in range(5)],
+            'STUB-7': [make_history(n) for n in range(2)],
+        }
+        jira_stub_server.embedded_changelog_limit = 2
+        jira_stub_server.changelog_page_cap = 3
+        
+        client = JiraClient(jira_stub_server.url, max_workers=3)
+        issues = {i['key']: i for i in client.fetch_issues('project = STUB', expand='changelog')}
+        
+        assert issues['STUB-3']['changelog']['histories'] == jira_stub_server.changelogs['STUB-3']
+        assert issues['STUB-120']['changelog']['total'] == 5
+        assert len(issues['STUB-120']['changelog']['histories']) == 5
+        assert len(issues['STUB-7']['changelog']['histories']) == 2
+        
+        changelog_calls = [r[0] for r in jira_stub_server.requests_log if r[0].endswith('/changelog')]
+        assert sorted(set(changelog_calls)) == ['/rest/api/2/issue/STUB-120/changelog', '/rest/api/2/issue/STUB-3/changelog']
+        assert len(changelog_calls) == 3 + 2
+    
+    @allure.title("Test 92: Missing changelog endpoint keeps embedded history")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    @patch('jira_client.requests.Session.get')
+    def test_changelog_endpoint_missing(self, mock_get):
+        """Без эндпоинта /changelog (JIRA Server) остается встроенная история"""
+        embedded = {'startAt': 0, 'maxResults': 1, 'total': 3, 'histories': [make_history(1)]}
+        mock_get.return_value = Mock(status_code=404, text='Not found')
+        
+        client = JiraClient('https://jira.example.com', api_version='2')
+        issues = client.complete_changelogs([{'key': 'TEST-1', 'fields': {}, 'changelog': dict(embedded)}])
+        
+        assert issues[0]['changelog'] == embedded
+        # Проверка serverInfo (тип развертывания при заданной версии) и один запрос /changelog
+        assert [c.args[0].rsplit('/', 1)[-1] for c in mock_get.call_args_list] == ['serverInfo', 'changelog']
+    
+    @allure.title("Test 120: Failed changelog page retried")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    @patch('jira_client.requests.Session.get')
+    def test_changelog_page_retry(self, mock_get):
+        """Ошибка 5xx на странице /changelog повторяется, история догружается полностью"""
+        embedded = {'startAt': 0, 'maxResults': 1, 'total': 2, 'histories': [make_history(1)]}
+        page = Mock(status_code=200, content=json.dumps({
+            'values': [make_history(1), make_history(2)], 'total': 2, 'isLast': True
+        }).encode('utf-8'))
+        changelog_responses = iter([Mock(status_code=503, text='Unavailable'), page])
+        mock_get.side_effect = lambda url, **kwargs: (
+            Mock(status_code=404) if url.endswith('/serverInfo') else next(changelog_responses)
+        )
+        
+        client = JiraClient('https://jira.example.com', api_version='2', rate_limit={'backoff_base': 0.01})
+        issues = client.complete_changelogs([{'key': 'TEST-1', 'fields': {}, 'changelog': dict(embedded)}])
+        
+        assert issues[0]['changelog']['histories'] == [make_history(1), make_history(2)]
+        assert [c.args[0].rsplit('/', 1)[-1] for c in mock_get.call_args_list].count('changelog') == 2
+    
+    @allure.title("Test 93: Jira Cloud changelogs fetched in bulk")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_cloud_bulk_changelogs(self, jira_stub_server):
+        """На Cloud история догружается через /changelog/bulkfetch с курсором"""
+        jira_stub_server.deployment_type = 'Cloud'
+        jira_stub_server.changelogs = {
+            'STUB-3': [make_history(n) for n in range(7)],
+            'STUB-4': [make_history(n) for n in range(4)],
+            'STUB-7': [make_history(n) for n in range(2)],
+        }
+        jira_stub_server.embedded_changelog_limit = 2
+        jira_stub_server.bulk_page_cap = 5
+        
+        client = JiraClient(jira_stub_server.url, max_workers=3)
+        issues = {i['key']: i for i in client.fetch_issues('project = STUB', expand='changelog')}
+        
+        assert client.is_cloud
+        assert issues['STUB-3']['changelog']['histories'] == jira_stub_server.changelogs['STUB-3']
+        assert issues['STUB-4']['changelog']['histories'] == jira_stub_server.changelogs['STUB-4']
+        assert len(issues['STUB-7']['changelog']['histories']) == 2
+        
+        bulk_calls = [r for r in jira_stub_server.requests_log if r[0].endswith('/bulkfetch')]
+        assert [call[0] for call in bulk_calls] == ['/rest/api/3/changelog/bulkfetch'] * 3
+        assert bulk_calls[0][1]['issueIdsOrKeys'] == ['STUB-3', 'STUB-4']
+        assert not [r for r in jira_stub_server.requests_log if r[0].endswith('/changelog')]
+    
+    @allure.title("Test 128: Failed bulkfetch page retried")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    @patch('jira_client.requests.Session.post')
+    @patch('jira_client.requests.Session.get')
+    def test_bulk_changelog_retry(self, mock_get, mock_post):
+        """Обрыв соединения и 502 на странице /changelog/bulkfetch повторяются, курсор не сбрасывается"""
+        mock_get.return_value = Mock(status_code=200, json=lambda: {'deploymentType': 'Cloud', 'version': '1001.0.0'})
+        pages = [
+            {'issueChangeLogs': [{'issueId': '1', 'changeHistories': [make_history(1)]}], 'nextPageToken': 'p2'},
+            {'issueChangeLogs': [{'issueId': '1', 'changeHistories': [make_history(2)]}]},
+        ]
+        responses = iter([
+            requests.exceptions.ConnectionError('reset'),
+            Mock(status_code=200, content=json.dumps(pages[0]).encode('utf-8')),
+            Mock(status_code=502, text='Bad gateway'),
+            Mock(status_code=200, content=json.dumps(pages[1]).encode('utf-8')),
+        ])
+        tokens = []
+        
+        def post(url, json=None, **kwargs):
+            tokens.append(json.get('nextPageToken'))
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        
+        mock_post.side_effect = post
+        embedded = {'startAt': 0, 'maxResults': 0, 'total': 2, 'histories': []}
+        
+        client = JiraClient('https://jira.example.com', rate_limit={'backoff_base': 0.01})
+        issues = client.complete_changelogs([{'id': '1', 'key': 'TEST-1', 'fields': {}, 'changelog': embedded}])
+        
+        assert issues[0]['changelog']['histories'] == [make_history(1), make_history(2)]
+        assert tokens == [None, None, 'p2', 'p2']
+    
+    @allure.title("Test 94: Fallback to per-issue changelogs without bulkfetch")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_bulk_changelogs_fallback(self, jira_stub_server):
+        """Если bulkfetch не поддерживается, история грузится по одной задаче"""
+        jira_stub_server.deployment_type = 'Cloud'
+        jira_stub_server.bulk_changelogs = False
+        jira_stub_server.changelogs = {'STUB-3': [make_history(n) for n in range(7)]}
+        jira_stub_server.embedded_changelog_limit = 2
+        
+        client = JiraClient(jira_stub_server.url)
+        issues = {i['key']: i for i in client.fetch_issues('project = STUB', max_results=10, expand='changelog')}
+        
+        assert len(issues['STUB-3']['changelog']['histories']) == 7
+        paths = [r[0] for r in jira_stub_server.requests_log]
+        assert paths.count('/rest/api/3/changelog/bulkfetch') == 1
+        assert '/rest/api/2/issue/STUB-3/changelog' in paths
+
+@allure.feature('JIRA Client')
+@allure.story('Cursor Pagination')
+class TestJiraClientCursorPagination:
+    
+    @allure.title("Test 95: Keyset pagination on JIRA Server")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_keyset_pagination(self, jira_stub_server):
+        """На Server страницы запрашиваются по id > последнего, без startAt"""
+        client = JiraClient(jira_stub_server.url, pagination='cursor')
+        issues = client.fetch_issues('project = STUB ORDER BY created DESC')
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in jira_stub_server.issues]
+        searches = [r[1] for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert len(searches) == 5
+        assert all(call['startAt'] == ['0'] for call in searches)
+        assert searches[0]['jql'] == ['project = STUB ORDER BY id ASC']
+        assert searches[1]['jql'] == ['(project = STUB) AND id > 10050 ORDER BY id ASC']
+    
+    @allure.title("Test 96: nextPageToken pagination on Jira Cloud")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_cloud_token_pagination(self, jira_stub_server):
+        """На Cloud используется /search/jql с курсором и ограничением max_results"""
+        jira_stub_server.deployment_type = 'Cloud'
+        client = JiraClient(jira_stub_server.url, pagination='cursor')
+        issues = client.fetch_issues('project = STUB', max_results=120, fields=['created'])
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in jira_stub_server.issues[:120]]
+        calls = [r[1] for r in jira_stub_server.requests_log if r[0].endswith('/search/jql')]
+        assert [call.get('nextPageToken') for call in calls] == [None, ['50'], ['100']]
+        assert calls[-1]['maxResults'] == ['20']
+        with pytest.raises(ValueError):
+            JiraClient(jira_stub_server.url, pagination='pages')
+
+
+@allure.feature('JIRA Client')
+@allure.story('Sharded Fetching')
+class TestJiraClientSharding:
+    
+    @pytest.fixture
+    def spread_server(self, jira_stub_server):
+        for n, issue in enumerate(jira_stub_server.issues):
+            issue['fields']['created'] = f'2024-01-{n // 24 + 1:02d}T{n % 24:02d}:00:00.000+0000'
+        return jira_stub_server
+    
+    @allure.title("Test 97: Shard JQL windows are disjoint")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_build_shard_jql(self):
+        """Окна по created не пересекаются, сортировка запроса сохраняется"""
+        queries = build_shard_jql('project = A ORDER BY key', ['2024/01/02 00:00', '2024/01/03 00:00'])
+        
+        assert queries == [
+            '(project = A) AND created < "2024/01/02 00:00" ORDER BY key',
+            '(project = A) AND created >= "2024/01/02 00:00" AND created < "2024/01/03 00:00" ORDER BY key',
+            '(project = A) AND created >= "2024/01/03 00:00" ORDER BY key',
+        ]
+        assert build_shard_jql('project = A', []) == ['project = A']
+    
+    @allure.title("Test 98: Shards fetched in parallel and deduplicated")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_sharded_fetch(self, spread_server):
+        """Все задачи загружаются по окнам, задача из двух окон попадает в результат один раз"""
+        moved = dict(spread_server.issues[0], fields=dict(spread_server.issues[0]['fields'], created='2024-01-09T00:00:00.000+0000'))
+        spread_server.issues.append(moved)
+        client = JiraClient(spread_server.url, max_workers=3, shards=4)
+        issues = client.fetch_issues('project = STUB')
+        
+        assert len(issues) == 230
+        assert {i['id'] for i in issues} == {i['id'] for i in spread_server.issues}
+        windows = {r[1]['jql'][0] for r in spread_server.requests_log if r[0].endswith('/search')}
+        assert sum('created' in jql and 'ORDER BY created' not in jql for jql in windows) == 4
+    
+    @allure.title("Test 99: Failed shard retried independently")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_failed_shard_retried(self, spread_server):
+        """Ошибка в одном шарде повторяет только его"""
+        spread_server.fail_jql = [') AND created <']
+        client = JiraClient(spread_server.url, max_workers=2, shards=3, rate_limit={'backoff_base': 0.01})
+        issues = client.fetch_issues('project = STUB', max_results=500)
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in spread_server.issues]
+        first_window = [r for r in spread_server.requests_log if ') AND created <' in r[1].get('jql', [''])[0]]
+        other_windows = [r for r in spread_server.requests_log if 'AND created >=' in r[1].get('jql', [''])[0]]
+        assert len(first_window) == 2 + 1
+        assert len(other_windows) == 2 * 2
+    
+    @allure.title("Test 121: Failed shard resumes from its last page")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_failed_shard_resumes(self, spread_server):
+        """После исчерпания повторов страницы шард продолжается с нее, а не с начала окна"""
+        spread_server.fail_jql = [(') AND created <', 50)] * (PAGE_RETRIES + 1)
+        client = JiraClient(spread_server.url, max_workers=3, shards=3, rate_limit={'backoff_base': 0.01})
+        issues = client.fetch_issues('project = STUB')
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in spread_server.issues]
+        first_window = [r[1]['startAt'][0] for r in spread_server.requests_log
+                        if ') AND created <' in r[1].get('jql', [''])[0]]
+        assert first_window.count('0') == 1
+        assert first_window.count('50') == PAGE_RETRIES + 2
+    
+    @allure.title("Test 122: max_results below total keeps the query order")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_sharded_max_results(self, spread_server):
+        """Лимит меньше числа задач: те же задачи, что без шардов, окна не запрашиваются"""
+        spread_server.issues.reverse()
+        client = JiraClient(spread_server.url, max_workers=3, shards=4)
+        issues = client.fetch_issues('project = STUB', max_results=100)
+        
+        assert [i['key'] for i in issues] == [i['key'] for i in spread_server.issues[:100]]
+        searches = [r[1]['jql'][0] for r in spread_server.requests_log if r[0].endswith('/search')]
+        assert not any('AND created' in jql for jql in searches)
+        assert len(searches) == 1 + 2
\ No newline at end of file
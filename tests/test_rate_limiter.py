@@ -0,0 +1,111 @@
+"""Tests for RateLimiter module"""
+import pytest
+import allure
+import sys
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from rate_limiter import RateLimiter, parse_retry_after
+from jira_client import JiraClient
+
+
+@allure.feature('Rate Limiting')
+@allure.story('Token Bucket')
+class TestTokenBucket:
+    
+    @allure.title("Test 49: Burst is served without waiting")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_burst_without_wait(self):
+        """Запросы в пределах burst не ждут"""
+        limiter = RateLimiter(requests_per_second=1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.1
+    
+    @allure.title("Test 50: Requests paced after burst")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_pacing_after_burst(self):
+        """После исчерпания burst запросы идут со скоростью rate"""
+        limiter = RateLimiter(requests_per_second=20, burst=1)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.14
+    
+    @allure.title("Test 51: Throttling halves the rate")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_throttled_reduces_rate(self):
+        """Ответ 429 снижает скорость, успешные ответы восстанавливают ее"""
+        limiter = RateLimiter(requests_per_second=10, burst=10)
+        delay = limiter.on_throttled(0, '0')
+        assert delay == 0
+        assert limiter.rate == 5
+        
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.rate == 10
+
+
+@allure.feature('Rate Limiting')
+@allure.story('Server Headers')
+class TestRateLimitHeaders:
+    
+    @allure.title("Test 52: Parse Retry-After")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_parse_retry_after(self):
+        """Retry-After в секундах и в формате HTTP-date"""
+        assert parse_retry_after('3') == 3.0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('garbage') is None
+    
+    @allure.title("Test 53: X-RateLimit headers adjust the limiter")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_rate_limit_headers(self):
+        """Заголовки X-RateLimit-* задают скорость и паузу"""
+        limiter = RateLimiter(requests_per_second=10, burst=10)
+        limiter.update_from_headers({
+            'X-RateLimit-FillRate': '10',
+            'X-RateLimit-Interval-Seconds': '5',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': '2'
+        })
+        
+        assert limiter.max_rate == 2
+        assert limiter._blocked_until > time.monotonic() + 1
+
+@allure.feature('Rate Limiting')
+@allure.story('Shared Limiter')
+class TestSharedLimiter:
+    
+    @allure.title("Test 116: Clients on one host share a reconfigured limiter")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_same_host_different_settings(self, capsys):
+        """Второй клиент к тому же хосту с другими настройками не теряет их: общий лимитер перенастраивается"""
+        first = JiraClient('https://jira.example.com', rate_limit={'requests_per_second': 10, 'burst': 10},
+                           api_version='2')
+        second = JiraClient('https://jira.example.com/', rate_limit={'requests_per_second': 2, 'burst': 3},
+                            api_version='2')
+        
+        assert first.rate_limiter is second.rate_limiter
+        assert second.rate_limiter.max_rate == 2
+        assert second.rate_limiter.capacity == 3
+        assert second.rate_limiter._tokens <= 3
+        assert 'jira.example.com' in capsys.readouterr().out
+        
+        # Те же настройки — без перенастройки и предупреждения
+        JiraClient('https://jira.example.com', rate_limit={'requests_per_second': 2, 'burst': 3}, api_version='2')
+        assert capsys.readouterr().out == ''
+        
+        RateLimiter.reset_registry()
+        assert RateLimiter.for_url('https://jira.example.com') is not first.rate_limiter
\ No newline at end of file
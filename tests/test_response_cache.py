@@ -0,0 +1,78 @@
+"""Tests for ResponseCache module"""
+import pytest
+import allure
+import sys
+import os
+import json
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from response_cache import ResponseCache
+from jira_client import JiraClient
+
+
+@allure.feature('JIRA Client')
+@allure.story('Response Cache')
+class TestResponseCache:
+    
+    @allure.title("Test 86: Cached page roundtrip and key parts")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_roundtrip(self, tmp_path):
+        """Страница хранится сжатой и возвращается вместе с валидаторами"""
+        with ResponseCache(str(tmp_path / 'responses.db'), ttl=60) as cache:
+            key = ResponseCache.key('http://jira/', '2', 'project = A', 0, 50, ['created'], 'changelog')
+            content = json.dumps({'issues': [{'key': 'A-1', 'fields': {'summary': 'x' * 1000}}]}).encode('utf-8')
+            cache.put(key, content, etag='"v1"')
+            
+            payload, validators, fresh = cache.get(key)
+            assert payload['issues'][0]['key'] == 'A-1'
+            assert validators == {'If-None-Match': '"v1"'}
+            assert fresh
+            assert cache.size() < len(content)
+            
+            assert cache.get(ResponseCache.key('http://jira', '2', 'project = A', 50, 50, ['created'], 'changelog')) is None
+            assert key == ResponseCache.key('http://jira', '2', 'project = A', 0, 50, ['created'], 'changelog')
+            assert key != ResponseCache.key('http://jira', '3', 'project = A', 0, 50, ['created'], 'changelog')
+            assert key != ResponseCache.key('http://jira', '2', 'project = A', 0, 50, ['created'], None)
+    
+    @allure.title("Test 87: Size cap evicts least recently used pages")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_lru_eviction(self, tmp_path):
+        """При превышении лимита удаляются давно не читавшиеся записи"""
+        def page():
+            return json.dumps({'issues': os.urandom(1500).hex()}).encode('utf-8')
+        
+        with ResponseCache(str(tmp_path / 'responses.db'), max_bytes=4000) as cache:
+            for name in ('a', 'b'):
+                cache.put(name, page())
+            cache.get('a')
+            cache.put('c', page())
+            
+            assert cache.conn.execute('SELECT key FROM responses ORDER BY key').fetchall() == [('a',), ('c',)]
+            assert cache.size() <= 4000
+    
+    @allure.title("Test 88: Client serves fresh pages from cache and revalidates stale ones")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.integration
+    def test_client_uses_cache(self, jira_stub_server, tmp_path):
+        """Повторная загрузка не ходит в /search, а устаревшие страницы подтверждаются через 304"""
+        path = str(tmp_path / 'responses.db')
+        with JiraClient(jira_stub_server.url, max_workers=3, response_cache=ResponseCache(path)) as client:
+            first = client.fetch_issues('project = TEST')
+        searches = [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert len(searches) == 5
+        
+        jira_stub_server.requests_log.clear()
+        with JiraClient(jira_stub_server.url, max_workers=3, response_cache=ResponseCache(path)) as client:
+            assert client.fetch_issues('project = TEST') == first
+        assert not [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        
+        jira_stub_server.requests_log.clear()
+        with JiraClient(jira_stub_server.url, max_workers=3, response_cache=ResponseCache(path, ttl=0)) as client:
+            assert client.fetch_issues('project = TEST') == first
+        searches = [r for r in jira_stub_server.requests_log if r[0].endswith('/search')]
+        assert len(searches) == 5
+        assert all(headers.get('If-None-Match') for _, _, headers in searches)
\ No newline at end of file
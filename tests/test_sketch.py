@@ -0,0 +1,86 @@
+"""Tests for quantile sketch module"""
+import pytest
+import allure
+import sys
+import os
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+import pickle
+from sketch import TDigest
+from histogram import Durations
+from data_processor import DataProcessor
+
+
+@allure.feature('Data Processing')
+@allure.story('Quantile Sketches')
+class TestTDigest:
+    
+    @allure.title("Test 83: Percentiles within 1% of exact values")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_accuracy(self):
+        """p50/p90/p99 по дайджесту близки к точным при ограниченном числе центроидов"""
+        values = np.random.default_rng(3).lognormal(3, 1, 100000)
+        digest = TDigest()
+        for value in values[:20000]:
+            digest.add(value)
+        digest.update(values[20000:])
+        
+        assert len(digest.means) <= digest.compression
+        for q in (0.5, 0.9, 0.99):
+            assert digest.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.01)
+        assert digest.quantile(0) == values.min()
+        assert digest.quantile(1) == values.max()
+    
+    @allure.title("Test 84: Merged and restored digests agree with a single digest")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_merge_and_roundtrip(self):
+        """Дайджесты шардов складываются, а to_dict/from_dict переносят состояние между прогонами"""
+        values = np.random.default_rng(5).exponential(40, 50000)
+        shards = [TDigest().update(chunk) for chunk in np.array_split(values, 5)]
+        merged = TDigest.from_dict(shards[0].to_dict())
+        for shard in shards[1:]:
+            merged.merge(shard)
+        
+        assert merged.count == 50000
+        for q in (0.5, 0.9, 0.99):
+            assert merged.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+        assert TDigest().percentiles() == {'p50': None, 'p90': None, 'p99': None}
+    
+    @allure.title("Test 85: Duration percentiles table")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_duration_percentiles(self, sample_issues_list):
+        """Таблица перцентилей одинакова для сырых списков и гистограмм"""
+        raw = DataProcessor.duration_percentiles(DataProcessor.compute_all(sample_issues_list))
+        binned = DataProcessor.duration_percentiles(
+            DataProcessor.compute_all(sample_issues_list, histogram_bins='fixed')
+        )
+        
+        assert list(raw.columns) == ['metric', 'status', 'count', 'p50', 'p90', 'p99']
+        assert 'open_time' in set(raw['metric'])
+        assert 'time_in_progress' in set(raw['metric'])
+        assert raw.equals(binned)
+    
+    @allure.title("Test 118: Streaming digest keeps tail percentiles on skewed data")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_skewed_tail_accuracy(self):
+        """Дайджест, пополняемый по одному значению, дает p50..p99.9 в пределах 1% от numpy.percentile"""
+        rng = np.random.default_rng(11)
+        for values in (rng.lognormal(3, 1.5, 200000), rng.pareto(1.5, 200000)):
+            durations = Durations(values.tolist())
+            sketch = durations.sketch
+            
+            assert sketch.count == len(values)
+            assert len(sketch.means) <= sketch.compression
+            for q in (50, 90, 99, 99.9):
+                assert sketch.quantile(q / 100) == pytest.approx(np.percentile(values, q), rel=0.01)
+        
+        restored = pickle.loads(pickle.dumps(durations))
+        assert restored == durations
+        assert restored.sketch.count == len(values)
\ No newline at end of file
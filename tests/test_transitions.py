@@ -0,0 +1,143 @@
+"""Tests for TransitionTable module"""
+import pytest
+import allure
+import sys
+import os
+import json
+import random
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from transitions import NO_STATUS, NO_TIME, TransitionTable
+from data_processor import MetricsEngine
+
+
+def make_issue(n, moves):
+    histories = [{
+        'author': {'accountId': f'user-{n}', 'displayName': f'User {n}', 'avatarUrls': {'48x48': 'x' * 80}},
+        'created': f'2024-01-{day:02d}T10:00:00.000+0000',
+        'items': [
+            {'field': 'assignee', 'fromString': None, 'toString': f'User {n}'},
+            {'field': 'status', 'fromString': src, 'toString': dst},
+        ]
+    } for day, src, dst in moves]
+    return {
+        'key': f'TEST-{n}',
+        'fields': {
+            'created': '2024-01-01T00:00:00.000+0000',
+            'resolutiondate': '2024-01-20T00:00:00.000+0000' if n % 2 else None,
+            'status': {'name': moves[-1][2] if moves else 'Open'},
+        },
+        'changelog': {'histories': histories}
+    }
+
+
+@allure.feature('Columnar Processing')
+@allure.story('Transition Table')
+class TestTransitionTable:
+    
+    @allure.title("Test 103: Only status transitions kept as interned codes")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.unit
+    def test_compact_transitions(self):
+        """Из changelog остаются коды статусов и время в нс, переходы задачи адресуются через offsets"""
+        issues = [
+            make_issue(1, [(2, 'Open', 'In Progress'), (5, 'In Progress', 'Closed')]),
+            make_issue(2, []),
+            make_issue(3, [(3, None, 'In Progress')]),
+        ]
+        table = TransitionTable.from_issues(issues)
+        
+        assert len(table) == 3
+        assert table.issue_count == 3
+        assert table.offsets.tolist() == [0, 2, 2, 3]
+        assert table.issue.tolist() == [0, 0, 2]
+        assert table.statuses.labels == ['Closed', 'Open', 'In Progress']
+        assert table.names(table.status).tolist() == ['In Progress', 'Closed', 'In Progress']
+        assert table.time[0] == np.datetime64('2024-01-02T10:00:00', 'ns').astype(np.int64)
+        assert table.resolved[1] == NO_TIME
+        assert table.has_histories.tolist() == [True, False, True]
+        assert table.initial.tolist() == [table.code('Open'), NO_STATUS, NO_STATUS]
+        assert table.names(table.current).tolist() == ['Closed', 'Open', 'In Progress']
+    
+    @allure.title("Test 104: Compact table is far smaller than raw changelog")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_memory_footprint(self):
+        """Буферы таблицы занимают на порядки меньше сырого JSON истории"""
+        moves = [(day, 'Open' if day % 2 else 'In Progress', 'In Progress' if day % 2 else 'Open') for day in range(2, 20)]
+        issues = [make_issue(n, moves) for n in range(200)]
+        table = TransitionTable.from_issues(issues)
+        
+        assert len(table) == 200 * 18
+        assert table.nbytes * 20 < len(json.dumps(issues))
+
+def random_issues(count, seed=7):
+    # Перемешанные и пустые переходы, задачи без changelog и незакрытые — все ветки построчного расчета
+    rng = random.Random(seed)
+    statuses = ['Open', 'In Progress', 'In Review', 'Blocked', 'Done', None, '']
+    issues = []
+    for n in range(count):
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(100000))
+        histories = []
+        for _ in range(rng.randrange(6)):
+            item = {'field': 'status', 'toString': rng.choice(statuses)}
+            if rng.random() < 0.8:
+                item['fromString'] = rng.choice(statuses)
+            changed = created + timedelta(minutes=rng.randrange(-500, 30000), milliseconds=rng.randrange(1000))
+            histories.append({'created': changed.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + '+0000',
+                              'items': [{'field': 'assignee', 'toString': 'x'}, item][rng.randrange(2):]})
+        resolved = created + timedelta(minutes=rng.randrange(-100, 60000)) if rng.random() < 0.7 else None
+        issues.append({
+            'key': f'TEST-{n}',
+            'fields': {
+                'created': created.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+                'resolutiondate': resolved.strftime('%Y-%m-%dT%H:%M:%S.000+0000') if resolved else None,
+                'status': {'name': rng.choice(statuses[:5])},
+            },
+            'changelog': {'histories': histories} if histories or rng.random() < 0.5 else {}
+        })
+    return issues
+
+
+@allure.feature('Columnar Processing')
+@allure.story('Transition Table')
+class TestTransitionTableMetrics:
+    
+    @allure.title("Test 107: Vectorized durations identical to row-by-row accumulators")
+    @allure.severity(allure.severity_level.BLOCKER)
+    @pytest.mark.unit
+    def test_matches_accumulators(self):
+        """Длительности по статусам и время в In Progress совпадают с потоковым расчетом вплоть до порядка"""
+        issues = random_issues(500)
+        expected = MetricsEngine.for_analyses(['status_durations', 'time_in_progress']).consume(issues).results()
+        table = TransitionTable.from_issues(issues)
+        
+        durations = table.status_durations()
+        assert durations == expected['status_durations']
+        assert list(durations) == list(expected['status_durations'])
+        assert table.time_in_progress() == expected['time_in_progress']
+        assert TransitionTable.from_issues([]).status_durations() == {}
+        assert TransitionTable.from_issues([]).time_in_progress() == []
+    
+    @allure.title("Test 108: Hours matrix and column roundtrip")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_status_hours(self):
+        """Матрица часов согласована с днями, таблица восстанавливается из своих колонок"""
+        issue = make_issue(1, [(2, 'Open', 'In Progress'), (5, 'In Progress', 'Closed')])
+        table = TransitionTable.from_issues([issue, make_issue(2, [])])
+        hours = table.status_hours()
+        
+        assert hours.shape == (2, len(table.statuses))
+        assert hours[0, table.code('Open')] == 34
+        assert hours[0, table.code('In Progress')] == 72
+        assert hours[0, table.code('Closed')] == 14 * 24 + 14
+        assert hours[1].sum() == 0
+        
+        copy = TransitionTable.from_columns(table.columns(), table.statuses)
+        assert copy.status_durations() == table.status_durations()
+        assert (copy.status_hours() == hours).all()
\ No newline at end of file
@@ -9,7 +9,9 @@ import pandas as pd
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 
+from matplotlib.figure import Figure
 from visualizer import Visualizer
+from histogram import Histogram
 from data_processor import DataProcessor
 
 
@@ -98,6 +100,26 @@ class TestVisualizerCharts:
         output_file = os.path.join(self.test_dir, '5_time_in_progress_histogram.png')
         assert os.path.exists(output_file)
     
+    @allure.title("Test 127: Zero durations shown on log-scale histogram")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.unit
+    def test_log_histogram_zero_bucket(self):
+        """Нулевые длительности лог-гистограммы рисуются отдельным столбцом, а не пропадают"""
+        histogram = Histogram.from_values([0, 0, 0, 1, 2, 5, 40], scale='log')
+        fig = Figure()
+        ax = fig.add_subplot()
+        Visualizer._hist(ax, histogram, 50, edgecolor='black', color='hotpink')
+        
+        assert sum(patch.get_height() for patch in ax.patches) == 7
+        assert [text.get_text() for text in ax.get_legend().get_texts()] == ['≤ 0: 3']
+        assert ax.patches[-1].get_x() + ax.patches[-1].get_width() == pytest.approx(1.0)
+        
+        only_zeros = Figure().add_subplot()
+        Visualizer._hist(only_zeros, Histogram.from_values([0, 0], scale='log'), 50)
+        assert [patch.get_height() for patch in only_zeros.patches] == [2]
+        self.visualizer.plot_open_time_histogram(histogram)
+        assert os.path.exists(os.path.join(self.test_dir, '1_open_time_histogram.png'))
+    
     @allure.title("Test 29: All 6 charts generated")
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.unit
@@ -263,4 +285,26 @@ class TestVisualizerCharts:
             for filename in expected_files:
                 filepath = os.path.join(self.test_dir, filename)
                 assert os.path.exists(filepath), f"{filename} should exist"
-                allure.attach(filename, name="Generated chart", attachment_type=allure.attachment_type.TEXT)
\ No newline at end of file
+                allure.attach(filename, name="Generated chart", attachment_type=allure.attachment_type.TEXT)
+    
+    @allure.title("Test 78: Parallel rendering produces identical PNGs")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.integration
+    def test_parallel_render_matches_serial(self, sample_issues_list):
+        """Параллельная отрисовка в процессах дает побайтно те же PNG, что и последовательная"""
+        results = DataProcessor.compute_all(sample_issues_list)
+        parallel_dir = self.test_dir + '_parallel'
+        
+        try:
+            with allure.step("Render serially and with 3 worker processes"):
+                self.visualizer.render_all(results)
+                Visualizer(output_dir=parallel_dir).render_all(results, workers=3)
+            
+            with allure.step("Compare files byte by byte"):
+                for filename in sorted(os.listdir(self.test_dir)):
+                    with open(os.path.join(self.test_dir, filename), 'rb') as serial, \
+                            open(os.path.join(parallel_dir, filename), 'rb') as parallel:
+                        assert serial.read() == parallel.read(), f"{filename} differs"
+                assert len(os.listdir(self.test_dir)) == 6
+        finally:
+            shutil.rmtree(parallel_dir, ignore_errors=True)
\ No newline at end of file